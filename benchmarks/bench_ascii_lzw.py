@@ -0,0 +1,49 @@
+"""
+Time the LZWDecode, ASCIIHexDecode and ASCII85Decode filters on
+multi-megabyte inputs.
+
+    python benchmarks/bench_ascii_lzw.py [megabytes]
+"""
+import base64
+import os
+import random
+import sys
+import time
+import warnings
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "lambda", "process_pdf"))
+sys.path.insert(0, ROOT)
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2.filters import ASCII85Decode, ASCIIHexDecode, LZWDecode
+
+from tests.unit.pdf_samples import lzw_encode
+
+
+def sample(size):
+    rnd = random.Random(0)
+    words = [b"BT", b"/F1 12 Tf", b"72 720 Td", b"(Hello world) Tj", b"ET", b"q Q"]
+    data = b"\n".join(rnd.choice(words) for _ in range(size // 6))
+    return data[:size]
+
+
+def timed(name, fn, data, size):
+    start = time.perf_counter()
+    out = fn(data)
+    elapsed = time.perf_counter() - start
+    assert len(out) == size
+    print(f"{name:<16} {len(data) / 1e6:6.1f} MB in  {elapsed:7.3f}s")
+
+
+def main():
+    size = int(float(sys.argv[1]) * 1e6) if len(sys.argv) > 1 else 4_000_000
+    data = sample(size)
+    timed("LZWDecode", LZWDecode.decode, lzw_encode(data), size)
+    timed("ASCIIHexDecode", ASCIIHexDecode.decode, data.hex(" ", 32).encode() + b">", size)
+    timed("ASCII85Decode", ASCII85Decode.decode, base64.a85encode(data, wrapcol=72) + b"~>", size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Time extracting the text of every page of a report whose pages share a
+font with a large /ToUnicode CMap, with the reader's char map cache and
+without it (each page parsing the CMap again).
+
+    python benchmarks/bench_char_maps.py [pages]
+"""
+import io
+import os
+import sys
+import time
+import warnings
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "lambda", "process_pdf"))
+sys.path.insert(0, ROOT)
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2 import PdfReader
+
+from tests.unit.pdf_samples import font_pdf
+
+GLYPHS = 3000
+
+TYPE0 = b"<< /Type /Font /Subtype /Type0 /BaseFont /Report /Encoding /Identity-H >>"
+HELVETICA = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+
+
+def to_unicode(glyphs):
+    # one bfchar per glyph, as subsetting tools write them
+    lines = [b"begincmap", b"1 begincodespacerange", b"<0000> <FFFF>", b"endcodespacerange"]
+    for start in range(0, glyphs, 100):
+        chunk = range(start + 1, min(start + 101, glyphs + 1))
+        lines.append(b"%d beginbfchar" % len(chunk))
+        lines += [b"<%04X> <%04X>" % (g, 0x4E00 + g) for g in chunk]
+        lines.append(b"endbfchar")
+    lines.append(b"endcmap")
+    return b"\n".join(lines)
+
+
+def report(pages):
+    contents = [
+        b"BT /F1 10 Tf 72 720 Td <%s> Tj /F2 10 Tf 0 -12 Td (page %d) Tj ET"
+        % (b"".join(b"%04X" % (1 + (i * 7 + j) % GLYPHS) for j in range(40)), i)
+        for i in range(pages)
+    ]
+    return font_pdf(contents, {"F1": TYPE0, "F2": HELVETICA}, {"F1": to_unicode(GLYPHS)})
+
+
+def timed(name, data, **kwargs):
+    start = time.perf_counter()
+    reader = PdfReader(io.BytesIO(data), **kwargs)
+    chars = sum(len(page.extract_text()) for page in reader.pages)
+    elapsed = time.perf_counter() - start
+    cache = reader.char_map_cache
+    print(
+        f"{name:<10} {elapsed * 1000:9.2f} ms   {chars} chars, "
+        f"{cache.hits} hits / {cache.misses} misses ({cache.hit_rate:.0%})"
+    )
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    data = report(pages)
+    timed("uncached", data, char_map_cache_size=0)
+    timed("cached", data)
+
+
+if __name__ == "__main__":
+    main()
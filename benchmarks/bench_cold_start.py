@@ -0,0 +1,59 @@
+"""
+Local cold start of the process_pdf handler: in a fresh interpreter, the
+time to import the handler module and then to answer its first (and a
+second) S3 event, with in-memory stand-ins for the AWS clients.
+
+    python benchmarks/bench_cold_start.py [runs] [pages]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+LAMBDA_DIR = os.path.join(ROOT, "lambda", "process_pdf")
+sys.path.insert(0, LAMBDA_DIR)
+sys.path.insert(0, ROOT)
+
+from tests.unit.aws_fakes import ENV
+
+CHILD = """
+import sys, time
+start = time.perf_counter()
+import handler
+imported = time.perf_counter()
+
+sys.path.insert(0, {root!r})
+from tests.unit.pdf_samples import text_pdf
+from tests.unit.aws_fakes import install_clients, s3_event
+
+data = text_pdf(["page %d " % i * 40 for i in range({pages})])
+install_clients(handler, data)
+event = s3_event(data)
+ready = time.perf_counter()
+handler.main(event, None)
+first = time.perf_counter()
+handler.main(event, None)
+second = time.perf_counter()
+print(imported - start, first - ready, second - first)
+"""
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    env = dict(os.environ, PYTHONPATH=LAMBDA_DIR, **ENV)
+    code = CHILD.format(root=os.path.abspath(ROOT), pages=pages)
+    times = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", code], env=env, cwd=LAMBDA_DIR,
+            capture_output=True, text=True, check=True,
+        )
+        times.append([float(t) for t in result.stdout.split()])
+    for i, name in enumerate(("import handler", "first response", "second response")):
+        best = min(t[i] for t in times)
+        print(f"{name:<16} {best * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
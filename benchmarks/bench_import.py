@@ -0,0 +1,76 @@
+"""
+Time the imports a cold start of the process_pdf lambda pays for:
+``import PyPDF2`` and the handler module, each in a fresh interpreter,
+less the start-up time of the interpreter itself. The modules with the
+largest own import time (``python -X importtime``) are listed after.
+
+    python benchmarks/bench_import.py [runs]
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+LAMBDA_DIR = os.path.join(ROOT, "lambda", "process_pdf")
+
+# the handler reads its configuration at import time
+ENV = dict(
+    os.environ,
+    PYTHONPATH=LAMBDA_DIR,
+    AWS_DEFAULT_REGION=os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
+    TOPIC_ARN="arn:aws:sns:us-east-1:000000000000:bench",
+    METADATA_TABLE="bench-metadata",
+    OCR_USAGE_TABLE="bench-usage",
+    OCR_PAGE_LIMIT="1000",
+)
+
+
+def run(code, *options):
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        env=ENV,
+        cwd=LAMBDA_DIR,
+        capture_output=True,
+        text=True,
+    )
+
+
+def timed(code, runs):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = run(code)
+        best = min(best, time.perf_counter() - start)
+        if result.returncode:
+            return None, result.stderr.strip().splitlines()[-1]
+    return best, None
+
+
+def slowest_modules(code, count=8):
+    stderr = run(code, "-X", "importtime").stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        rows.append((int(own), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    run("import PyPDF2, handler")  # write the .pyc files first
+    base, _ = timed("pass", runs)
+    for name, code in (("PyPDF2", "import PyPDF2"), ("handler", "import handler")):
+        elapsed, error = timed(code, runs)
+        if elapsed is None:
+            print(f"{name:<10} skipped: {error}")
+            continue
+        print(f"import {name:<10} {(elapsed - base) * 1000:8.1f} ms")
+        for own, module in slowest_modules(code):
+            print(f"    {own / 1000:8.2f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
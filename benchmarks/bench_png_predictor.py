@@ -0,0 +1,60 @@
+"""
+Time FlateDecode's PNG predictor decoding, with and without NumPy.
+
+    python benchmarks/bench_png_predictor.py
+"""
+import os
+import random
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda", "process_pdf"))
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2 import filters
+    from PyPDF2.filters import FlateDecode
+
+
+def predicted(rows, rowlength, filter_types):
+    rnd = random.Random(0)
+    row = bytes(rnd.randrange(256) for _ in range(rowlength - 1))
+    return b"".join(bytes([rnd.choice(filter_types)]) + row for _ in range(rows))
+
+
+CASES = {
+    # cross-reference stream: /W [1 4 1], /Predictor 12 (Up on every row)
+    "xref stream, 200k rows": (predicted(200_000, 7, [2]), 7, 1),
+    # 1000x1000 RGB image, rows filtered with None/Sub/Up
+    "RGB image, Sub/Up": (predicted(1000, 3001, [0, 1, 2]), 3001, 3),
+    # 1000x1000 RGB image, every filter type
+    "RGB image, all filters": (predicted(1000, 3001, [0, 1, 2, 3, 4]), 3001, 3),
+}
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    numpy = filters._numpy()
+    for name, (data, rowlength, bpp) in CASES.items():
+        run = lambda: FlateDecode._decode_png_prediction(data, 0, rowlength, bpp)
+        filters._np = False
+        pure = best_of(run)
+        filters._np = numpy if numpy is not None else None
+        line = f"{name:<26} {len(data) / 1e6:6.1f} MB  python {pure:7.3f}s"
+        if numpy is not None:
+            filters.PNG_NUMPY_THRESHOLD = 0
+            line += f"  numpy {best_of(run):7.3f}s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Time getting the text preview of a dense page: the whole page extracted
+then cut, as the handler used to, against extraction with a character
+budget, which stops decoding and parsing the content stream early.
+
+    python benchmarks/bench_text_preview.py [lines]
+"""
+import io
+import os
+import sys
+import time
+import warnings
+import zlib
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "lambda", "process_pdf"))
+sys.path.insert(0, ROOT)
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2 import PdfReader
+
+from tests.unit.pdf_samples import build_pdf
+
+PREVIEW_CHARS = 200
+
+
+def dense_page(lines):
+    content = b"BT /F1 8 Tf 36 780 Td\n" + b"".join(
+        b"(%d Lorem ipsum dolor sit amet, consectetur adipiscing elit) Tj 0 -9 Td\n" % i
+        for i in range(lines)
+    ) + b"ET"
+    stream = zlib.compress(content)
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        3: b"<< /Type /Page /Parent 2 0 R /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> /MediaBox [0 0 612 792] >>",
+        4: b"<< /Filter /FlateDecode /Length %d >>\nstream\n%s\nendstream"
+        % (len(stream), stream),
+        5: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    return build_pdf(objects, root=1)
+
+
+def timed(name, data, extract, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        text = extract(PdfReader(io.BytesIO(data)))
+    elapsed = (time.perf_counter() - start) / repeat
+    preview = text.replace("\n", " ").strip()[:PREVIEW_CHARS]
+    print(f"{name:<16} {elapsed * 1000:9.2f} ms   {preview[:40]!r}")
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    data = dense_page(lines)
+    timed("whole page", data, lambda r: r.pages[0].extract_text())
+    timed("max_chars", data, lambda r: r.pages[0].extract_text(max_chars=PREVIEW_CHARS))
+    timed("text prefix", data, lambda r: r.extract_text_prefix(PREVIEW_CHARS, max_pages=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Time and peak memory of parsing the /ToUnicode CMap of a CJK font, whose
+bfrange entries cover tens of thousands of codes.
+
+    python benchmarks/bench_to_unicode.py [ranges]
+"""
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "lambda", "process_pdf"))
+sys.path.insert(0, ROOT)
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2._cmap import parse_to_unicode
+    from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+
+def cjk_cmap(ranges):
+    # CID ranges of 256 codes onto the CJK unified ideographs block
+    lines = [b"begincmap", b"1 begincodespacerange", b"<0000> <FFFF>", b"endcodespacerange"]
+    for start in range(0, ranges, 100):
+        chunk = range(start, min(start + 100, ranges))
+        lines.append(b"%d beginbfrange" % len(chunk))
+        lines += [
+            b"<%04X> <%04X> <%04X>" % (256 + 256 * r, 511 + 256 * r, 0x4E00 + 256 * (r % 80))
+            for r in chunk
+        ]
+        lines.append(b"endbfrange")
+    lines.append(b"endcmap")
+    return b"\n".join(lines)
+
+
+def main():
+    ranges = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    stream = DecodedStreamObject()
+    stream.set_data(cjk_cmap(ranges))
+    font = DictionaryObject({NameObject("/ToUnicode"): stream})
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    map_dict, _, _ = parse_to_unicode(font, 32)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"{ranges} ranges, {len(map_dict) - 1} codes: "
+        f"{elapsed * 1000:.2f} ms, peak {peak / 1024 / 1024:.2f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
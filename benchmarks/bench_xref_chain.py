@@ -0,0 +1,60 @@
+"""
+Time opening a form saved with many incremental updates, reading all the
+xref sections at open (default) or only the newest one (lazy_xref=True),
+against the same document saved in one go.
+
+    python benchmarks/bench_xref_chain.py [revisions]
+"""
+import io
+import os
+import sys
+import time
+import warnings
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "lambda", "process_pdf"))
+sys.path.insert(0, ROOT)
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2 import PdfReader
+
+from tests.unit.pdf_samples import incremental_update, text_pdf
+
+PAGES = 200
+
+
+def edited(revisions):
+    data = text_pdf(["page %d" % i for i in range(PAGES)])
+    for rev in range(revisions):
+        # each save rewrites the /Info and a page, as a form filler does
+        page = 5 + 2 * (rev % PAGES)
+        data = incremental_update(
+            data,
+            {
+                3: b"<< /Title (Rev %d) /Author (AutoPDF) >>" % rev,
+                page: b"<< /Type /Page /Parent 2 0 R /Contents %d 0 R >>" % (page + 1),
+            },
+        )
+    return data
+
+
+def timed(name, data, repeat=20, **kwargs):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        reader = PdfReader(io.BytesIO(data), **kwargs)
+        title = reader.metadata["/Title"]
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{name:<22} {elapsed * 1000:8.2f} ms   {title}")
+
+
+def main():
+    revisions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    data = edited(revisions)
+    timed("fresh file", text_pdf(["page %d" % i for i in range(PAGES)]))
+    timed(f"{revisions} revisions", data)
+    timed(f"{revisions} revisions, lazy", data, lazy_xref=True)
+
+
+if __name__ == "__main__":
+    main()
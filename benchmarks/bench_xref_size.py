@@ -0,0 +1,71 @@
+"""
+Time opening files with a million xref entries (a cross-reference stream,
+half of them compressed, or a classic table), and the memory the reader
+keeps for them.
+
+    python benchmarks/bench_xref_size.py [entries]
+"""
+import io
+import os
+import re
+import sys
+import time
+import tracemalloc
+import warnings
+import zlib
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "lambda", "process_pdf"))
+sys.path.insert(0, ROOT)
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2 import PdfReader
+
+from tests.unit.pdf_samples import text_pdf
+
+
+def with_entries(n, stream):
+    """A one page PDF whose xref lists `n` objects, most of them fake."""
+    base = text_pdf(["page"])
+    body = base[: base.index(b"xref\n")]
+    offsets = {int(m.group(1)): m.start() + 1 for m in re.finditer(rb"\n(\d+) 0 obj", base)}
+    trailer = b"/Size %d /Root 1 0 R /Info 3 0 R" % n
+    if not stream:
+        rows = [b"xref\n0 %d\n0000000000 65535 f \n" % n]
+        rows += [b"%010d 00000 n \n" % offsets.get(i, i * 7) for i in range(1, n)]
+        table = b"".join(rows) + b"trailer\n<< %s >>\n" % trailer
+        return body + table + b"startxref\n%d\n%%%%EOF\n" % len(body)
+    rows = [b"\x00\x00\x00\x00\xff\xff"]
+    for i in range(1, n):
+        if i in offsets or i % 2:
+            rows.append(b"\x01" + offsets.get(i, i * 7).to_bytes(4, "big") + b"\x00")
+        else:
+            rows.append(b"\x02\x00\x00\x00\x05" + bytes((i % 200,)))
+    data = zlib.compress(b"".join(rows))
+    xref = b"%d 0 obj\n<< /Type /XRef /W [1 4 1] %s /Filter /FlateDecode /Length %d >>\n" % (
+        n, trailer, len(data)
+    )
+    xref += b"stream\n" + data + b"\nendstream\nendobj\n"
+    return body + xref + b"startxref\n%d\n%%%%EOF\n" % len(body)
+
+
+def timed(name, data):
+    start = time.perf_counter()
+    PdfReader(io.BytesIO(data))
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    reader = PdfReader(io.BytesIO(data))
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<14} open {elapsed:6.2f}s   xref {held / 1e6:6.1f} MB", len(reader.xref[0]))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    timed("xref stream", with_entries(n, stream=True))
+    timed("classic table", with_entries(n, stream=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,8 +11,9 @@ import warnings
 
 from ._encryption import PasswordType
 from ._merger import PdfFileMerger, PdfMerger
+from ._object_cache import ObjectCache
 from ._page import PageObject, Transformation
-from ._reader import DocumentInformation, PdfFileReader, PdfReader
+from ._reader import DocumentInformation, DocumentSummary, PdfFileReader, PdfReader
 from ._version import __version__
 from ._writer import PdfFileWriter, PdfWriter
 from .pagerange import PageRange, parse_filename_page_ranges
@@ -28,6 +29,8 @@ __all__ = [
     "PageRange",
     "PaperSize",
     "DocumentInformation",
+    "DocumentSummary",
+    "ObjectCache",
     "parse_filename_page_ranges",
     "PdfFileMerger",  # will be removed in PyPDF2 3.0.0; use PdfMerger instead
     "PdfFileReader",  # will be removed in PyPDF2 3.0.0; use PdfReader instead
@@ -0,0 +1,94 @@
+"""Read-only file object over an in-memory or memory-mapped buffer."""
+
+import io
+import mmap
+from pathlib import Path
+from typing import Any, Optional, Union
+
+BufferType = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class BufferStream(io.BufferedIOBase):
+    """
+    Seekable, read-only stream over a buffer, used by :class:`PdfReader` for
+    ``bytes``, ``bytearray``, ``memoryview`` and ``mmap`` input and for files
+    opened by path (memory-mapped).
+
+    Unlike ``BytesIO(buffer)``, the buffer is never copied: each read returns
+    a slice of it, so the pages of a mapped file are only loaded when read,
+    and :meth:`getbuffer` exposes the whole file without a copy.
+
+    :param buffer: the file contents
+    :param bool owned: close the buffer (an ``mmap``) when the stream is closed
+    """
+
+    def __init__(self, buffer: BufferType, owned: bool = False) -> None:
+        super().__init__()
+        if not isinstance(buffer, (bytes, mmap.mmap)):
+            # slices of a memoryview are views: bytes() then copies once
+            buffer = memoryview(buffer).cast("B")
+        #: bytes or mmap, whose slices are bytes, or a memoryview
+        self.buffer = buffer
+        self._owned = owned
+        self._pos = 0
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "BufferStream":
+        """Memory-map the file at `path`, or read it when it can't be mapped."""
+        with open(path, "rb") as fh:
+            try:
+                buffer: BufferType = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):  # empty files, pipes, ...
+                return cls(fh.read())
+        return cls(buffer, owned=True)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self.buffer)
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"invalid whence ({whence!r})")
+        if offset < 0:
+            raise ValueError(f"negative seek value {offset}")
+        self._pos = offset
+        return offset
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        start = self._pos
+        end = len(self.buffer)
+        if size is not None and size >= 0:
+            end = min(start + size, end)
+        if end <= start:
+            return b""
+        self._pos = end
+        # bytes() does not copy a bytes slice (bytes, mmap input)
+        return bytes(self.buffer[start:end])
+
+    read1 = read
+
+    def readinto(self, b: Any) -> int:
+        data = self.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def getbuffer(self) -> memoryview:
+        """The whole buffer, without copying (as ``BytesIO.getbuffer``)."""
+        return memoryview(self.buffer)
+
+    def close(self) -> None:
+        if self._owned and not self.closed:
+            try:
+                self.buffer.close()  # type: ignore[union-attr]
+            except BufferError:
+                pass  # still exported (getbuffer); unmapped once released
+        super().close()
@@ -1,12 +1,30 @@
+import re
 import warnings
 from binascii import unhexlify
+from bisect import bisect_right
+from collections import OrderedDict
 from math import ceil
-from typing import Any, Dict, List, Tuple, Union, cast
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
-from ._codecs import adobe_glyphs, charset_encoding
+from ._codecs import CharmapEncoding, adobe_glyphs, charset_encoding
 from ._utils import logger_warning
 from .errors import PdfReadWarning
-from .generic import DecodedStreamObject, DictionaryObject, StreamObject
+from .generic import (
+    DecodedStreamObject,
+    DictionaryObject,
+    IndirectObject,
+    StreamObject,
+)
 
 
 # code freely inspired from @twiggy ; see #711
@@ -68,11 +86,222 @@ def build_char_map(
     )
 
 
+CharMap = Tuple[str, float, Union[str, Dict[int, str]], Dict, DictionaryObject]
+
+
+class CharMapCache:
+    """
+    Char maps built by :func:`build_char_map`, shared by the pages of a
+    :class:`PdfReader<PyPDF2.PdfReader>` (``reader.char_map_cache``): a font
+    is usually used on many pages, and its /ToUnicode CMap and /Encoding
+    would otherwise be parsed again for each of them.
+
+    Entries are keyed by the indirect reference of the font dictionary and
+    the space width; fonts that are not indirect objects are not cached.
+    Past `max_size` entries, the least recently used one is evicted.
+
+    The char maps returned are shared: they must not be modified.
+
+    :param int max_size: Maximum number of char maps kept. Defaults to ``256``
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        self.max_size = max_size
+        self._maps: "OrderedDict[Tuple[int, int, float], CharMap]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the lookups answered from the cache, 0.0 before any."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        self._maps.clear()
+
+    def char_map(
+        self, font_name: str, space_width: float, obj: DictionaryObject
+    ) -> CharMap:
+        """:func:`build_char_map`, built once per font and space width."""
+        fonts = cast(DictionaryObject, obj["/Resources"]["/Font"])  # type: ignore
+        ref = fonts.raw_get(font_name)
+        if not isinstance(ref, IndirectObject):
+            return build_char_map(font_name, space_width, obj)
+        key = (ref.idnum, ref.generation, space_width)
+        char_map = self._maps.get(key)
+        if char_map is not None:
+            self.hits += 1
+            self._maps.move_to_end(key)
+            return char_map
+        self.misses += 1
+        char_map = self._maps[key] = build_char_map(font_name, space_width, obj)
+        while len(self._maps) > max(self.max_size, 0):
+            self._maps.popitem(last=False)
+            self.evictions += 1
+        return char_map
+
+
+class ToUnicodeMap(MutableMapping[Any, Any]):
+    """
+    The ``map_dict`` built from a /ToUnicode CMap: the character codes, as
+    decoded by the font encoding, to their text, plus ``map_dict[-1]``, the
+    number of bytes of a code.
+
+    ``beginbfrange`` ranges mapping one-char codes to consecutive one-char
+    values are kept as intervals (first code, last code, first value) in
+    sorted lists searched with ``bisect``, rather than one entry per code.
+    Every other entry is kept in a dict, which never shares a code with
+    the intervals: entries set later take precedence.
+
+    The order in which the codes were first set is kept too (per interval
+    and per dict key), for :meth:`space_key`.
+    """
+
+    def __init__(self) -> None:
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._bases: List[int] = []
+        self._range_len = 0
+        self._dict: Dict[Any, Any] = {}
+        self._sets = 0  # codes set so far
+        self._first: Dict[Any, int] = {}  # dict key -> when first set
+        self._range_sets: List[Tuple[int, int, int]] = []  # start, end, when start set
+        self._spaces: Dict[Any, None] = {}  # codes once set to " "
+
+    def add_range(self, start: int, end: int, base: int) -> None:
+        """Map the codes `start` to `end` to ``chr(base)`` onwards."""
+        if end < start:
+            return
+        self._cut(start, end)
+        dict_ = self._dict
+        if dict_:
+            if end - start < len(dict_):
+                for code in range(start, end + 1):
+                    dict_.pop(chr(code), None)
+            else:
+                for key in [k for k in dict_ if isinstance(k, str) and len(k) == 1]:
+                    if start <= ord(key) <= end:
+                        del dict_[key]
+        self._range_sets.append((start, end, self._sets))
+        self._sets += end - start + 1
+        if base <= 0x20 <= base + end - start:
+            self._spaces[chr(start + 0x20 - base)] = None
+        i = bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._bases.insert(i, base)
+        self._range_len += end - start + 1
+
+    def _cut(self, start: int, end: int) -> None:
+        """Remove the codes `start` to `end` from the intervals."""
+        starts, ends, bases = self._starts, self._ends, self._bases
+        i = bisect_right(starts, end) - 1
+        while i >= 0 and ends[i] >= start:
+            s, e, b = starts[i], ends[i], bases[i]
+            del starts[i], ends[i], bases[i]
+            self._range_len -= e - s + 1
+            if e > end:  # keep the part after the cut
+                starts.insert(i, end + 1)
+                ends.insert(i, e)
+                bases.insert(i, b + end + 1 - s)
+                self._range_len += e - end
+            if s < start:  # and the part before it
+                starts.insert(i, s)
+                ends.insert(i, start - 1)
+                bases.insert(i, b)
+                self._range_len += start - s
+            i -= 1
+
+    def _range_value(self, key: Any) -> Optional[str]:
+        if isinstance(key, str) and len(key) == 1:
+            code = ord(key)
+            i = bisect_right(self._starts, code) - 1
+            if i >= 0 and code <= self._ends[i]:
+                return chr(self._bases[i] + code - self._starts[i])
+        return None
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            return self._dict[key]
+        except KeyError:
+            value = self._range_value(key)
+            if value is None:
+                raise
+            return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            return self._dict[key]
+        except KeyError:
+            value = self._range_value(key)
+            return default if value is None else value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._dict or self._range_value(key) is not None
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if isinstance(key, str) and len(key) == 1 and self._starts:
+            self._cut(ord(key), ord(key))
+        self._dict[key] = value
+        self._first.setdefault(key, self._sets)
+        self._sets += 1
+        if value == " ":
+            self._spaces[key] = None
+
+    def __delitem__(self, key: Any) -> None:
+        if key in self._dict:
+            del self._dict[key]
+        elif self._range_value(key) is not None:
+            self._cut(ord(key), ord(key))
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from list(self._dict)
+        for start, end in zip(list(self._starts), list(self._ends)):
+            for code in range(start, end + 1):
+                yield chr(code)
+
+    def __len__(self) -> int:
+        return len(self._dict) + self._range_len
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
+
+    def space_key(self) -> Any:
+        """
+        Of the codes that map to a space, the one first set last, or None:
+        the last one in a plain dict built code by code in the order the
+        entries and ranges were read.
+        """
+        found, when = None, -1
+        for key in self._spaces:
+            if self.get(key) != " ":
+                continue
+            set_at = [self._first[key]] if key in self._first else []
+            if isinstance(key, str) and len(key) == 1:
+                code = ord(key)
+                set_at.extend(
+                    at + code - start
+                    for start, end, at in self._range_sets
+                    if start <= code <= end
+                )
+            if min(set_at) > when:
+                found, when = key, min(set_at)
+        return found
+
+
 # used when missing data, e.g. font def missing
 unknown_char_map: Tuple[str, float, Union[str, Dict[int, str]], Dict[Any, Any]] = (
     "Unknown",
     9999,
-    dict(zip(range(256), ["�"] * 256)),
+    CharmapEncoding(zip(range(256), ["�"] * 256)),
     {},
 )
 
@@ -117,7 +346,7 @@ def parse_encoding(
     if "/Encoding" not in ft:
         try:
             if "/BaseFont" in ft and cast(str, ft["/BaseFont"]) in charset_encoding:
-                encoding = dict(
+                encoding = CharmapEncoding(
                     zip(range(256), charset_encoding[cast(str, ft["/BaseFont"])])
                 )
             else:
@@ -170,7 +399,7 @@ def parse_encoding(
                         space_code = x
                 x += 1
     if isinstance(encoding, list):
-        encoding = dict(zip(range(256), encoding))
+        encoding = CharmapEncoding(zip(range(256), encoding))
     return encoding, space_code
 
 
@@ -179,112 +408,104 @@ def parse_to_unicode(
 ) -> Tuple[Dict[Any, Any], int, List[int]]:
     # will store all translation code
     # and map_dict[-1] we will have the number of bytes to convert
-    map_dict: Dict[Any, Any] = {}
+    map_dict = ToUnicodeMap()
 
     # will provide the list of cmap keys as int to correct encoding
+    # (the codes above 255 of a bfrange interval are left out)
     int_entry: List[int] = []
 
     if "/ToUnicode" not in ft:
         return {}, space_code, []
-    process_rg: bool = False
-    process_char: bool = False
-    multiline_rg: Union[
-        None, Tuple[int, int]
-    ] = None  # tuple = (current_char, remaining size) ; cf #1285 for example of file
-    cm = prepare_cm(ft)
-    for l in cm.split(b"\n"):
-        process_rg, process_char, multiline_rg = process_cm_line(
-            l.strip(b" "), process_rg, process_char, multiline_rg, map_dict, int_entry
-        )
+    for record in cmap_records(read_cm(ft)):
+        if len(record) == 2:
+            parse_bfchar(record[0], record[1], map_dict, int_entry)
+        else:
+            parse_bfrange(record[0], record[1], record[2], map_dict, int_entry)
 
-    for a, value in map_dict.items():
-        if value == " ":
-            space_code = a
+    space = map_dict.space_key()
+    if space is not None:
+        space_code = space
     return map_dict, space_code, int_entry
 
 
-def prepare_cm(ft: DictionaryObject) -> bytes:
+def read_cm(ft: DictionaryObject) -> bytes:
+    """The /ToUnicode CMap of the font `ft`."""
     tu = ft["/ToUnicode"]
-    cm: bytes
+    cm: Union[str, bytes] = b""
     if isinstance(tu, StreamObject):
         cm = cast(DecodedStreamObject, ft["/ToUnicode"]).get_data()
     elif isinstance(tu, str) and tu.startswith("/Identity"):
         cm = b"beginbfrange\n<0000> <0001> <0000>\nendbfrange"  # the full range 0000-FFFF will be processed
     if isinstance(cm, str):
         cm = cm.encode()
-    # we need to prepare cm before due to missing return line in pdf printed to pdf from word
-    cm = (
-        cm.strip()
-        .replace(b"beginbfchar", b"\nbeginbfchar\n")
-        .replace(b"endbfchar", b"\nendbfchar\n")
-        .replace(b"beginbfrange", b"\nbeginbfrange\n")
-        .replace(b"endbfrange", b"\nendbfrange\n")
-        .replace(b"<<", b"\n{\n")  # text between << and >> not used but
-        .replace(b">>", b"\n}\n")  # some solution to find it back
-    )
-    ll = cm.split(b"<")
-    for i in range(len(ll)):
-        j = ll[i].find(b">")
-        if j >= 0:
-            if j == 0:
-                # string is empty: stash a placeholder here (see below)
-                # see https://github.com/py-pdf/PyPDF2/issues/1111
-                content = b"."
-            else:
-                content = ll[i][:j].replace(b" ", b"")
-            ll[i] = content + b" " + ll[i][j + 1 :]
-    cm = (
-        (b" ".join(ll))
-        .replace(b"[", b" [ ")
-        .replace(b"]", b" ]\n ")
-        .replace(b"\r", b"\n")
-    )
     return cm
 
 
-def process_cm_line(
-    l: bytes,
-    process_rg: bool,
-    process_char: bool,
-    multiline_rg: Union[None, Tuple[int, int]],
-    map_dict: Dict[Any, Any],
-    int_entry: List[int],
-) -> Tuple[bool, bool, Union[None, Tuple[int, int]]]:
-    if l in (b"", b" ") or l[0] == 37:  # 37 = %
-        return process_rg, process_char, multiline_rg
-    if b"beginbfrange" in l:
-        process_rg = True
-    elif b"endbfrange" in l:
-        process_rg = False
-    elif b"beginbfchar" in l:
-        process_char = True
-    elif b"endbfchar" in l:
-        process_char = False
-    elif process_rg:
-        multiline_rg = parse_bfrange(l, map_dict, int_entry, multiline_rg)
-    elif process_char:
-        parse_bfchar(l, map_dict, int_entry)
-    return process_rg, process_char, multiline_rg
+# The tokens of a CMap that matter: a comment, a dictionary delimiter (the
+# dictionaries are not used), a hex string, an array delimiter, or a run of
+# anything else, which may hold a bf keyword: in PDF printed from Word the
+# keywords are not always separated from their neighbours.
+CMAP_TOKEN_RE = re.compile(rb"%[^\r\n]*|<<|>>|<([^<>]*)>|\[|\]|[^\s<>\[\]%]+")
+CMAP_KEYWORD_RE = re.compile(rb"(begin|end)bf(char|range)")
+
+
+def cmap_records(cm: bytes) -> Iterator[Tuple[Any, ...]]:
+    """
+    Read the ``bfchar`` and ``bfrange`` entries of the CMap `cm` in one pass.
+
+    Yields the hex digits of each entry: (code, value) for a bfchar and
+    (first code, last code, first value or list of values) for a bfrange.
+    Spaces inside hex strings are ignored, and an empty hex string stands
+    for an empty value (see https://github.com/py-pdf/PyPDF2/issues/1111).
+    """
+    section = b""  # b"char", b"range" or b"" outside of both
+    operands: List[bytes] = []
+    values: Optional[List[bytes]] = None  # inside a bfrange [array]
+    for m in CMAP_TOKEN_RE.finditer(cm):
+        hex_ = m.group(1)
+        if hex_ is not None:
+            if not section:
+                continue
+            hex_ = hex_.translate(None, b" \t\r\n\f\x00")
+            if values is not None:
+                values.append(hex_)
+                continue
+            operands.append(hex_)
+            if section == b"char" and len(operands) == 2:
+                yield operands[0], operands[1]
+                operands = []
+            elif section == b"range" and len(operands) == 3:
+                yield operands[0], operands[1], operands[2]
+                operands = []
+            continue
+        token = m.group()
+        if token == b"[":
+            if section == b"range" and len(operands) == 2:
+                values = []
+        elif token == b"]":
+            if values is not None:
+                yield operands[0], operands[1], values
+                operands, values = [], None
+        elif b"bf" in token and token[:1] != b"%":
+            for keyword in CMAP_KEYWORD_RE.finditer(token):
+                section = keyword.group(2) if keyword.group(1) == b"begin" else b""
+                operands, values = [], None
 
 
 def parse_bfrange(
-    l: bytes,
+    first: bytes,
+    last: bytes,
+    dest: Union[bytes, List[bytes]],
     map_dict: Dict[Any, Any],
     int_entry: List[int],
-    multiline_rg: Union[None, Tuple[int, int]],
-) -> Union[None, Tuple[int, int]]:
-    lst = [x for x in l.split(b" ") if x]
-    closure_found = False
-    nbi = max(len(lst[0]), len(lst[1]))
+) -> None:
+    nbi = max(len(first), len(last))
     map_dict[-1] = ceil(nbi / 2)
     fmt = b"%%0%dX" % (map_dict[-1] * 2)
-    if multiline_rg is not None:
-        a = multiline_rg[0]  # a, b not in the current line
-        b = multiline_rg[1]
-        for sq in lst[1:]:
-            if sq == b"]":
-                closure_found = True
-                break
+    a = int(first, 16)
+    b = int(last, 16)
+    if isinstance(dest, list):
+        for sq in dest:
             map_dict[
                 unhexlify(fmt % a).decode(
                     "charmap" if map_dict[-1] == 1 else "utf-16-be",
@@ -293,56 +514,57 @@ def parse_bfrange(
             ] = unhexlify(sq).decode("utf-16-be", "surrogatepass")
             int_entry.append(a)
             a += 1
-    else:
-        a = int(lst[0], 16)
-        b = int(lst[1], 16)
-        if lst[2] == b"[":
-            for sq in lst[3:]:
-                if sq == b"]":
-                    closure_found = True
-                    break
-                map_dict[
-                    unhexlify(fmt % a).decode(
-                        "charmap" if map_dict[-1] == 1 else "utf-16-be",
-                        "surrogatepass",
-                    )
-                ] = unhexlify(sq).decode("utf-16-be", "surrogatepass")
-                int_entry.append(a)
-                a += 1
-        else:  # case without list
-            c = int(lst[2], 16)
-            fmt2 = b"%%0%dX" % max(4, len(lst[2]))
-            closure_found = True
-            while a <= b:
-                map_dict[
-                    unhexlify(fmt % a).decode(
-                        "charmap" if map_dict[-1] == 1 else "utf-16-be",
-                        "surrogatepass",
-                    )
-                ] = unhexlify(fmt2 % c).decode("utf-16-be", "surrogatepass")
-                int_entry.append(a)
-                a += 1
-                c += 1
-    return None if closure_found else (a, b)
-
-
-def parse_bfchar(l: bytes, map_dict: Dict[Any, Any], int_entry: List[int]) -> None:
-    lst = [x for x in l.split(b" ") if x]
-    map_dict[-1] = len(lst[0]) // 2
-    while len(lst) > 1:
-        map_to = ""
-        # placeholder (see above) means empty string
-        if lst[1] != b".":
-            map_to = unhexlify(lst[1]).decode(
-                "charmap" if len(lst[1]) < 4 else "utf-16-be", "surrogatepass"
-            )  # join is here as some cases where the code was split
+        return
+    c = int(dest, 16)
+    fmt2 = b"%%0%dX" % max(4, len(dest))
+    if (
+        isinstance(map_dict, ToUnicodeMap)
+        and map_dict[-1] <= 2
+        and len(dest) <= 4
+        and b < 256 ** map_dict[-1]
+        and c + b - a <= 0xFFFF
+    ):
+        # one-char codes (one or two bytes, decoded as by charmap or
+        # utf-16-be) to one-char values: kept as an interval. Only the
+        # one-byte codes of int_entry are used (by build_char_map)
+        map_dict.add_range(a, b, c)
+        int_entry.extend(range(a, min(b, 255) + 1))
+        return
+    while a <= b:
         map_dict[
-            unhexlify(lst[0]).decode(
-                "charmap" if map_dict[-1] == 1 else "utf-16-be", "surrogatepass"
+            unhexlify(fmt % a).decode(
+                "charmap" if map_dict[-1] == 1 else "utf-16-be",
+                "surrogatepass",
             )
+        ] = unhexlify(fmt2 % c).decode("utf-16-be", "surrogatepass")
+        int_entry.append(a)
+        a += 1
+        c += 1
+
+
+def parse_bfchar(
+    code: bytes, value: bytes, map_dict: Dict[Any, Any], int_entry: List[int]
+) -> None:
+    nb = len(code) // 2
+    if map_dict.get(-1) != nb:
+        map_dict[-1] = nb
+    a = int(code, 16)
+    map_to = ""
+    # an empty hex string means an empty string
+    if len(value) == 4:
+        map_to = chr(int(value, 16))  # as decoded from utf-16-be
+    elif value:
+        map_to = unhexlify(value).decode(
+            "charmap" if len(value) < 4 else "utf-16-be", "surrogatepass"
+        )
+    if len(code) in (2, 4):
+        # as decoded from charmap or utf-16-be
+        map_dict[chr(a)] = map_to
+    else:
+        map_dict[
+            unhexlify(code).decode("charmap" if nb == 1 else "utf-16-be", "surrogatepass")
         ] = map_to
-        int_entry.append(int(lst[0], 16))
-        lst = lst[2:]
+    int_entry.append(a)
 
 
 def compute_space_width(
@@ -1,4 +1,5 @@
-from typing import Dict, List
+import codecs
+from typing import Any, Dict, Iterable, List, Optional, Union, cast
 
 from .adobe_glyphs import adobe_glyphs
 from .pdfdoc import _pdfdoc_encoding
@@ -41,6 +42,86 @@ _zapfding_encoding_rev: Dict[str, int] = rev_encoding(_zapfding_encoding)
 _pdfdoc_encoding_rev: Dict[str, int] = rev_encoding(_pdfdoc_encoding)
 
 
+def decoding_table(
+    chars: Iterable[str], undefined: Optional[str] = None
+) -> Union[str, Dict[int, Optional[str]]]:
+    """
+    The ``codecs.charmap_decode`` table of a single-byte encoding given as
+    the text of the 256 codes: a str, or a dict when some codes map to
+    more or less than one char (glyph names, empty strings).
+
+    Codes mapped to `undefined` are rejected by the decoder.
+    """
+    values: List[Optional[str]] = [None if c == undefined else c for c in chars]
+    if all(v is None or len(v) == 1 for v in values):
+        return "".join("\ufffe" if v is None else v for v in values)  # type: ignore
+    return dict(enumerate(values))
+
+
+class CharmapEncoding(Dict[int, str]):
+    """
+    A single-byte font encoding, the {code: text} dict built by
+    ``_cmap.parse_encoding`` (/Differences included), which :meth:`decode`
+    decodes in C with ``codecs.charmap_decode``.
+
+    The table is built on the first decode after the dict was changed
+    (by any of its methods).
+    Codes that are not in the dict decode to the same ASCII char, and
+    non-ASCII ones are rejected.
+    """
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self._table: Union[None, str, Dict[int, Optional[str]]] = None
+
+    def __setitem__(self, key: int, value: str) -> None:
+        self._table = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: int) -> None:
+        self._table = None
+        super().__delitem__(key)
+
+    # the other methods changing the dict drop the table as well
+
+    def update(self, *args: Any, **kwargs: Any) -> None:  # type: ignore
+        self._table = None
+        super().update(*args, **kwargs)
+
+    def __ior__(self, other: Any) -> "CharmapEncoding":  # type: ignore
+        self._table = None
+        return super().__ior__(other)
+
+    def pop(self, *args: Any) -> Any:
+        self._table = None
+        return super().pop(*args)
+
+    def popitem(self) -> Any:
+        self._table = None
+        return super().popitem()
+
+    def setdefault(self, key: int, default: Any = None) -> Any:
+        self._table = None
+        return super().setdefault(key, default)
+
+    def clear(self) -> None:
+        self._table = None
+        super().clear()
+
+    def decode(self, data: bytes, errors: str = "strict") -> str:
+        if self._table is None:
+            self._table = decoding_table(
+                (self.get(i, chr(i) if i < 128 else "\ufffe") for i in range(256)),
+                undefined="\ufffe",
+            )
+        return codecs.charmap_decode(data, errors, self._table)[0]
+
+
+# PDFDocEncoding, "\u0000" marking the codes that are not defined
+_pdfdoc_decoding_table = cast(str, decoding_table(_pdfdoc_encoding, undefined="\u0000"))
+_pdfdoc_encoding_map = codecs.charmap_build(_pdfdoc_decoding_table)
+
+
 charset_encoding: Dict[str, List[str]] = {
     "/StandardCoding": _std_encoding,
     "/WinAnsiEncoding": _win_encoding,
@@ -60,4 +141,6 @@ __all__ = [
     "_win_encoding",
     "_mac_encoding",
     "charset_encoding",
+    "CharmapEncoding",
+    "decoding_table",
 ]
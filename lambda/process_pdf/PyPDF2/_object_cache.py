@@ -0,0 +1,154 @@
+"""Cache of the indirect objects a PdfReader has resolved."""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, MutableMapping, Optional, Tuple
+
+from .generic import ArrayObject, DictionaryObject, PdfObject, StreamObject
+
+CacheKey = Tuple[Any, Any]  # (generation, idnum)
+
+#: objects with one of these /Type are never evicted: they are small, and
+#: reloading them would break the page tree and font lookups that hold them
+PINNED_TYPES = frozenset(
+    (
+        "/Catalog",
+        "/Pages",
+        "/Page",
+        "/Font",
+        "/FontDescriptor",
+        "/Encoding",
+        "/ObjStm",
+        "/XRef",
+    )
+)
+
+# rough per-object overhead used by the byte estimate of non-stream objects
+_OBJECT_OVERHEAD = 64
+
+
+def approximate_size(obj: Optional[PdfObject]) -> int:
+    """Approximate memory held by a cached object, dominated by stream data."""
+    if isinstance(obj, StreamObject):
+        size = _OBJECT_OVERHEAD * (len(obj) + 1)
+        if obj._source is None:  # else the data is still in the file
+            size += len(obj._data or b"")
+        if obj.decoded_self is not None:
+            size += len(obj.decoded_self._data or b"")
+        return size
+    if isinstance(obj, (DictionaryObject, ArrayObject)):
+        return _OBJECT_OVERHEAD * (len(obj) + 1)
+    return _OBJECT_OVERHEAD
+
+
+class ObjectCache(MutableMapping[CacheKey, Optional[PdfObject]]):
+    """
+    Mapping used for :attr:`PdfReader.resolved_objects`.
+
+    Without limits it behaves like the plain dict it replaces. With
+    `max_objects` and/or `max_bytes` it becomes an LRU: stream objects are
+    evicted first, then other objects; catalog, page tree, font and object
+    stream objects are pinned and never evicted (nor counted in the limits).
+
+    An evicted object is parsed again from the file on its next lookup, so
+    changes made to it are lost unless the caller keeps a reference.
+
+    :param int max_objects: Maximum number of unpinned objects kept.
+        Defaults to ``None`` (no limit)
+    :param int max_bytes: Maximum approximate size of the unpinned objects
+        kept, see :func:`approximate_size`. Defaults to ``None`` (no limit)
+    """
+
+    def __init__(
+        self, max_objects: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> None:
+        self.max_objects = max_objects
+        self.max_bytes = max_bytes
+        self._pinned: Dict[CacheKey, Optional[PdfObject]] = {}
+        self._streams: "OrderedDict[CacheKey, Optional[PdfObject]]" = OrderedDict()
+        self._others: "OrderedDict[CacheKey, Optional[PdfObject]]" = OrderedDict()
+        self._sizes: Dict[CacheKey, int] = {}
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def bounded(self) -> bool:
+        return self.max_objects is not None or self.max_bytes is not None
+
+    def _section(self, key: CacheKey) -> Optional[Dict[CacheKey, Any]]:
+        for section in (self._pinned, self._streams, self._others):
+            if key in section:
+                return section
+        return None
+
+    def __contains__(self, key: object) -> bool:
+        return self._section(key) is not None  # type: ignore[arg-type]
+
+    def __getitem__(self, key: CacheKey) -> Optional[PdfObject]:
+        section = self._section(key)
+        if section is None:
+            raise KeyError(key)
+        obj = section[key]
+        if section is not self._pinned and self.bounded:
+            section.move_to_end(key)  # type: ignore[attr-defined]
+            if section is self._streams:
+                # decoded data is attached after the object was cached
+                self._resize(key, approximate_size(obj))
+                self._evict()
+        return obj
+
+    def get(self, key: CacheKey, default: Any = None) -> Any:  # type: ignore[override]
+        try:
+            obj = self[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return obj
+
+    def __setitem__(self, key: CacheKey, obj: Optional[PdfObject]) -> None:
+        if key in self:
+            del self[key]
+        if isinstance(obj, DictionaryObject) and obj.get("/Type") in PINNED_TYPES:
+            self._pinned[key] = obj
+            return
+        section = self._streams if isinstance(obj, StreamObject) else self._others
+        section[key] = obj
+        self._resize(key, approximate_size(obj) if self.bounded else 0)
+        self._evict()
+
+    def __delitem__(self, key: CacheKey) -> None:
+        section = self._section(key)
+        if section is None:
+            raise KeyError(key)
+        del section[key]
+        self.size -= self._sizes.pop(key, 0)
+
+    def __iter__(self) -> Iterator[CacheKey]:
+        yield from list(self._pinned)
+        yield from list(self._others)
+        yield from list(self._streams)
+
+    def __len__(self) -> int:
+        return len(self._pinned) + len(self._streams) + len(self._others)
+
+    def _resize(self, key: CacheKey, size: int) -> None:
+        self.size += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+
+    def _over_limit(self) -> bool:
+        if self.max_objects is not None:
+            if len(self._streams) + len(self._others) > self.max_objects:
+                return True
+        return self.max_bytes is not None and self.size > self.max_bytes
+
+    def _evict(self) -> None:
+        while self._over_limit():
+            section = self._streams or self._others
+            if not section:
+                return
+            key, _ = section.popitem(last=False)
+            self.size -= self._sizes.pop(key, 0)
+            self.evictions += 1
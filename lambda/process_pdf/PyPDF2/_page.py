@@ -46,6 +46,7 @@ from typing import (
 )
 
 from ._cmap import build_char_map, unknown_char_map
+from ._codecs import CharmapEncoding
 from ._protocols import PdfReaderProtocol
 from ._utils import (
     CompressedTransformationMatrix,
@@ -1310,6 +1311,7 @@ class PageObject(DictionaryObject):
         visitor_operand_before: Optional[Callable[[Any, Any, Any, Any], None]] = None,
         visitor_operand_after: Optional[Callable[[Any, Any, Any, Any], None]] = None,
         visitor_text: Optional[Callable[[Any, Any, Any, Any, Any], None]] = None,
+        max_chars: Optional[int] = None,
     ) -> str:
         """
         See extract_text for most arguments.
@@ -1318,6 +1320,9 @@ class PageObject(DictionaryObject):
             content_key: indicate the default key where to extract data
                 None = the object; this allow to reuse the function on XObject
                 default = "/Content"
+
+            max_chars: stop reading the content stream once that many
+                characters are extracted (default: None, no limit)
         """
         text: str = ""
         output: str = ""
@@ -1338,8 +1343,12 @@ class PageObject(DictionaryObject):
         except Exception:
             return ""  # no resources means no text is possible (no font) we consider the file as not damaged, no need to check for TJ or Tj
         if "/Font" in resources_dict:
+            char_map_cache = getattr(pdf, "char_map_cache", None)
             for f in cast(DictionaryObject, resources_dict["/Font"]):
-                cmaps[f] = build_char_map(f, space_width, obj)
+                if char_map_cache is not None:
+                    cmaps[f] = char_map_cache.char_map(f, space_width, obj)
+                else:
+                    cmaps[f] = build_char_map(f, space_width, obj)
         cmap: Tuple[
             Union[str, Dict[int, str]], Dict[str, str], str, Optional[DictionaryObject]
         ] = (
@@ -1554,6 +1563,8 @@ class PageObject(DictionaryObject):
                                     "utf-16-be" if cmap[0] == "charmap" else "charmap",
                                     "surrogatepass",
                                 )  # apply str encoding
+                        elif isinstance(cmap[0], CharmapEncoding):
+                            t = cmap[0].decode(tt)  # apply dict encoding
                         else:  # apply dict encoding
                             t = "".join(
                                 [
@@ -1563,7 +1574,7 @@ class PageObject(DictionaryObject):
                             )
                         # "\u0590 - \u08FF \uFB50 - \uFDFF"
                         for x in "".join(
-                            [cmap[1][x] if x in cmap[1] else x for x in t]
+                            [cmap[1].get(x, x) for x in t]
                         ):
                             xx = ord(x)
                             # fmt: off
@@ -1693,7 +1704,7 @@ class PageObject(DictionaryObject):
                 except Exception:
                     pass
 
-        for operands, operator in content.operations:
+        for operands, operator in content.iter_operations():
             if visitor_operand_before is not None:
                 visitor_operand_before(operator, operands, cm_matrix, tm_matrix)
             # multiple operators are defined in here ####
@@ -1741,6 +1752,7 @@ class PageObject(DictionaryObject):
                             visitor_operand_before,
                             visitor_operand_after,
                             visitor_text,
+                            None if max_chars is None else max(max_chars - len(output), 0),
                         )
                         output += text
                         if visitor_text is not None:
@@ -1756,9 +1768,17 @@ class PageObject(DictionaryObject):
                 process_operation(operator, operands)
             if visitor_operand_after is not None:
                 visitor_operand_after(operator, operands, cm_matrix, tm_matrix)
+            # right-to-left text is prepended to `text`: only the output is final
+            if max_chars is not None and (
+                len(output) >= max_chars
+                or (not rtl_dir and len(output) + len(text) >= max_chars)
+            ):
+                break
         output += text  # just in case of
         if text != "" and visitor_text is not None:
             visitor_text(text, cm_matrix, tm_matrix, cmap[3], font_size)
+        if max_chars is not None:
+            return output[:max_chars]
         return output
 
     def extract_text(
@@ -1771,6 +1791,7 @@ class PageObject(DictionaryObject):
         visitor_operand_before: Optional[Callable[[Any, Any, Any, Any], None]] = None,
         visitor_operand_after: Optional[Callable[[Any, Any, Any, Any], None]] = None,
         visitor_text: Optional[Callable[[Any, Any, Any, Any, Any], None]] = None,
+        max_chars: Optional[int] = None,
     ) -> str:
         """
         Locate all text drawing commands, in the order they are provided in the
@@ -1808,6 +1829,9 @@ class PageObject(DictionaryObject):
                 text matrix, font-dictionary and font-size.
                 The font-dictionary may be None in case of unknown fonts.
                 If not None it may e.g. contain key "/BaseFont" with value "/Arial,Bold".
+            max_chars: return at most that many characters, the start of
+                the text: the content stream is only read (and decoded) up
+                to the operator that completes them (default: None, all)
 
         Returns:
             The extracted text
@@ -1857,6 +1881,7 @@ class PageObject(DictionaryObject):
             visitor_operand_before,
             visitor_operand_after,
             visitor_text,
+            max_chars,
         )
 
     def extract_xform_text(
@@ -1867,12 +1892,14 @@ class PageObject(DictionaryObject):
         visitor_operand_before: Optional[Callable[[Any, Any, Any, Any], None]] = None,
         visitor_operand_after: Optional[Callable[[Any, Any, Any, Any], None]] = None,
         visitor_text: Optional[Callable[[Any, Any, Any, Any, Any], None]] = None,
+        max_chars: Optional[int] = None,
     ) -> str:
         """
         Extract text from an XObject.
 
         Args:
             space_width:  force default space width (if not extracted from font (default 200)
+            max_chars: return at most that many characters (default: None, all)
 
         Returns:
             The extracted text
@@ -1886,6 +1913,7 @@ class PageObject(DictionaryObject):
             visitor_operand_before,
             visitor_operand_after,
             visitor_text,
+            max_chars,
         )
 
     def extractText(
@@ -2078,8 +2106,18 @@ class _VirtualList:
         return self.get_function(index)
 
     def __iter__(self) -> Iterator[PageObject]:
-        for i in range(len(self)):
-            yield self[i]
+        # the length is checked again at each step: a reader may find its
+        # page tree /Count too high while iterating, and flatten the tree
+        i = 0
+        while i < len(self):
+            try:
+                page = self[i]
+            except IndexError:
+                if i < len(self):
+                    raise
+                return
+            yield page
+            i += 1
 
 
 def _get_fonts_walk(
@@ -27,26 +27,41 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import mmap
 import os
 import re
 import struct
 import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
 from typing import (
     Any,
-    Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
+    MutableMapping,
     Optional,
     Tuple,
     Union,
     cast,
 )
 
+from ._buffer_stream import BufferStream, BufferType
+from ._cmap import CharMapCache
+from ._xref import (
+    XrefObjectStreams,
+    XrefOffsets,
+    add_stream_rows,
+    add_table_entries,
+    new_generation,
+)
 from ._encryption import Encryption, PasswordType
+from ._object_cache import ObjectCache
 from ._page import PageObject, _VirtualList
 from ._utils import (
     StrByteType,
@@ -78,6 +93,7 @@ from .errors import (
     PdfStreamError,
     WrongPasswordError,
 )
+from .filters import decode_stream_data
 from .generic import (
     ArrayObject,
     ContentStream,
@@ -93,6 +109,7 @@ from .generic import (
     NullObject,
     NumberObject,
     PdfObject,
+    StreamObject,
     TextStringObject,
     TreeObject,
     read_object,
@@ -116,6 +133,80 @@ def convertToInt(
     return convert_to_int(d, size)
 
 
+#: one entry of a classic xref table: offset, generation and type, with any
+#: stray CR/LF before it and up to two EOL characters after it
+XREF_ENTRY_RE = re.compile(rb"[\r\n]*(\d{1,10}) (\d{1,5}) ([fn])(?:[ \r\n]{0,2})")
+#: a well-formed 20-byte entry
+XREF_FIXED_ENTRY_RE = re.compile(rb"(\d{10}) (\d{5}) ([fn])(?: \r| \n|\r\n)")
+
+_STRUCT_CODES = {1: "B", 2: "H", 4: "I", 8: "q"}
+
+
+def _xref_stream_rows(
+    data: bytes, widths: List[int]
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    Decode the fixed-width rows of a cross-reference stream.
+
+    Full rows are unpacked in bulk with one struct format built from the /W
+    widths; widths without a struct code (3, 5, 6, 7) are unpacked as bytes
+    and converted with int.from_bytes. A zero width yields the default value
+    (PDF spec table 17: 1 for the type, 0 otherwise). Only the first three
+    fields are returned, but rows are /W wide.
+
+    Once the data runs out, rows are decoded field by field like
+    convert_to_int did for short reads, and then as all-zero fields.
+    """
+    for w in widths:
+        if w < 0 or w > 8:
+            raise PdfReadError("invalid size in convert_to_int")
+    stride = sum(widths)
+    fields = widths[:3]
+    fmt = ">"
+    for w in widths:
+        fmt += _STRUCT_CODES.get(w, f"{w}s") if w else ""
+    defaults = (1, 0, 0)
+    n_full = len(data) // stride if stride else 0
+
+    if n_full:
+        view = memoryview(data)[: n_full * stride]
+        if fields == [1, 4, 1] and stride == 6:
+            # by far the most common layout, avoid the generic per-row fixups
+            yield from struct.iter_unpack(">BIB", view)  # type: ignore
+        else:
+            # position of each of the three fields in the unpacked tuple
+            slots = []
+            pos = 0
+            for w in fields:
+                slots.append(pos if w else None)
+                pos += 1 if w else 0
+            odd = [w not in _STRUCT_CODES for w in fields]
+            for values in struct.iter_unpack(fmt, view):
+                row = []
+                for i in range(3):
+                    slot = slots[i]
+                    if slot is None:
+                        row.append(defaults[i])
+                    elif odd[i]:
+                        row.append(int.from_bytes(values[slot], "big"))
+                    else:
+                        row.append(values[slot])
+                yield row[0], row[1], row[2]
+
+    # truncated stream: a partial row, then nothing but defaults and zeros
+    pos = n_full * stride
+    while True:
+        row = []
+        for i, w in enumerate(fields):
+            if w:
+                row.append(convert_to_int(data[pos : pos + w], w))  # type: ignore
+                pos += w
+            else:
+                row.append(defaults[i])
+        pos += stride - sum(fields)
+        yield row[0], row[1], row[2]
+
+
 class DocumentInformation(DictionaryObject):
     """
     A class representing the basic document metadata provided in a PDF File.
@@ -276,6 +367,82 @@ class DocumentInformation(DictionaryObject):
         return self.get(DI.MOD_DATE)
 
 
+# upper bound on the decoded object stream data kept by a reader
+OBJ_STM_CACHE_BYTES = 32 * 1024 * 1024
+# default upper bound on the decoded size of a single stream
+MAX_DECODED_STREAM_SIZE = 512 * 1024 * 1024
+
+# an object header with single separators, and the white-space after it
+OBJECT_HEADER_RE = re.compile(rb"(\d+)[ \t\n\r](\d+)[ \t\n\r]obj[ \t\n\r\x00]*")
+OBJECT_HEADER_WINDOW = 64
+# any "<idnum> <generation> obj" in the file, indexed to repair bad offsets
+OBJECT_SCAN_RE = re.compile(rb"(?<![^\s])(\d+)\s+(\d+)\s+obj")
+
+INHERITABLE_PAGE_ATTRIBUTES = (
+    NameObject(PG.RESOURCES),
+    NameObject(PG.MEDIABOX),
+    NameObject(PG.CROPBOX),
+    NameObject(PG.ROTATE),
+)
+
+
+class _PageTreeNode:
+    """
+    Index over the /Kids of one /Pages node, built on first use.
+
+    ``ends[i]`` is the number of pages in kids ``0..i``; it only covers the
+    kids scanned so far, so locating page 0 resolves the first kid only.
+    The /Count of the node is trusted until its last page (by that count)
+    is located, when the remaining kids are scanned and it is checked
+    against them: walking the pages in order then finds every inconsistent
+    /Count before going past it.
+    """
+
+    __slots__ = ("node", "kids", "objects", "ends")
+
+    def __init__(self, node: DictionaryObject) -> None:
+        self.node = node  # keeps id(node) stable while the index is alive
+        self.kids = cast(ArrayObject, node[PA.KIDS])
+        self.objects: List[DictionaryObject] = []
+        self.ends: List[int] = []
+
+    def locate(
+        self, reader: "PdfReader", index: int
+    ) -> Optional[Tuple[Any, DictionaryObject, int]]:
+        """Return (kid entry, kid object, pages before kid) holding page `index`."""
+        ends = self.ends
+        count = self.node.get(PA.COUNT)
+        if not isinstance(count, int) or count < 0:
+            count = None
+        last = count is None or index >= count - 1
+        while len(ends) < len(self.kids) and (last or not ends or ends[-1] <= index):
+            kid = self.kids[len(ends)].get_object()
+            self.objects.append(kid)
+            ends.append((ends[-1] if ends else 0) + reader._count_pages_in(kid))
+        if not ends or index >= ends[-1]:
+            return None
+        if len(ends) == len(self.kids) and count is not None and count != ends[-1]:
+            return None  # a kid's /Count disagrees with this node's
+        i = bisect_right(ends, index)
+        return self.kids[i], self.objects[i], ends[i - 1] if i else 0
+
+
+@dataclass
+class DocumentSummary:
+    """
+    Document-level facts that can be read without touching the page tree.
+
+    Returned by :meth:`PdfReader.get_summary()<PyPDF2.PdfReader.get_summary>`.
+    ``metadata`` is ``None`` if the file has no /Info dictionary, or if it is
+    encrypted and has not been decrypted.
+    """
+
+    page_count: int
+    metadata: Optional[DocumentInformation]
+    pdf_version: str
+    is_encrypted: bool
+
+
 class PdfReader:
     """
     Initialize a PdfReader object.
@@ -285,25 +452,71 @@ class PdfReader:
 
     :param stream: A File object or an object that supports the standard read
         and seek methods similar to a File object. Could also be a
-        string representing a path to a PDF file.
+        string representing a path to a PDF file, which is memory-mapped, or
+        the file contents as ``bytes``, ``bytearray``, ``memoryview`` or
+        ``mmap``, which are read in place.
     :param bool strict: Determines whether user should be warned of all
         problems and also causes some correctable problems to be fatal.
         Defaults to ``False``.
     :param None/str/bytes password: Decrypt PDF file at initialization. If the
         password is None, the file will not be decrypted.
         Defaults to ``None``
+    :param int page_cache_size: Maximum number of :class:`PageObject` kept by
+        ``reader.pages``. Pages are built on demand by walking the page tree;
+        an evicted page is rebuilt from the file on next access, so changes
+        made to it are lost unless a reference is kept. Defaults to ``1024``
+    :param ObjectCache object_cache: Cache for the resolved indirect objects,
+        e.g. ``ObjectCache(max_bytes=64 * 1024 * 1024)`` to bound the memory
+        held by decoded streams. Defaults to ``None`` (unbounded cache)
+    :param int max_decoded_stream_size: Decoding a stream of the file to more
+        than this many bytes raises :class:`LimitReachedError`, to stop
+        runaway ("zip bomb") streams. ``None`` removes the limit.
+        Defaults to 512 MiB
+    :param bool lazy_xref: Only read the newest cross-reference section (and
+        trailer) of an incrementally updated file when opening it; the
+        sections of older revisions are read when an object is not found in
+        the newer ones. ``reader.xref`` then only holds the sections read so
+        far. When the newest trailers lack /Info, the older ones are read
+        for it on the first access to ``metadata``. Defaults to ``False``
+    :param int char_map_cache_size: Maximum number of font char maps kept
+        for text extraction by ``reader.char_map_cache``, see
+        :class:`CharMapCache<PyPDF2._cmap.CharMapCache>`. Defaults to ``256``
     """
 
     def __init__(
         self,
-        stream: Union[StrByteType, Path],
+        stream: Union[StrByteType, Path, BufferType],
         strict: bool = False,
         password: Union[None, str, bytes] = None,
+        page_cache_size: int = 1024,
+        object_cache: Optional[ObjectCache] = None,
+        max_decoded_stream_size: Optional[int] = MAX_DECODED_STREAM_SIZE,
+        lazy_xref: bool = False,
+        char_map_cache_size: int = 256,
     ) -> None:
         self.strict = strict
+        self.lazy_xref = lazy_xref
+        # (offset, xref_issue_nr) of the next older xref section not read yet
+        self._xref_prev: Optional[Tuple[int, int]] = None
+        # offset of the next older trailer to look for /Info in, see metadata
+        self._trailer_prev: Optional[int] = None
+        self.max_decoded_stream_size = max_decoded_stream_size
         self.flattened_pages: Optional[List[PageObject]] = None
-        self.resolved_objects: Dict[Tuple[Any, Any], Optional[PdfObject]] = {}
+        self.page_cache_size = page_cache_size
+        self._page_cache: "OrderedDict[int, PageObject]" = OrderedDict()
+        self._page_tree_nodes: Dict[int, _PageTreeNode] = {}
+        # decoded /ObjStm data and header index, see _load_object_stream
+        self.obj_stm_cache_bytes = OBJ_STM_CACHE_BYTES
+        self._obj_stm_cache: "OrderedDict[int, Tuple[bytes, int, Dict[int, Tuple[int, int]]]]" = OrderedDict()
+        self._obj_stm_cache_size = 0
+        self.resolved_objects = object_cache if object_cache is not None else ObjectCache()
+        #: char maps of the fonts, shared by the pages for text extraction
+        self.char_map_cache = CharMapCache(char_map_cache_size)
         self.xref_index = 0
+        # {generation: {idnum: offset}} of every object header, see _object_offsets
+        self._object_index: Optional[Dict[int, Dict[int, int]]] = None
+        #: number of offsets, xref entries and xref tables repaired so far
+        self.repair_count = 0
         self._page_id2num: Optional[
             Dict[Any, Any]
         ] = None  # map page indirect_reference number to Page Number
@@ -314,8 +527,9 @@ class PdfReader:
                 __name__,
             )
         if isinstance(stream, (str, Path)):
-            with open(stream, "rb") as fh:
-                stream = BytesIO(fh.read())
+            stream = BufferStream.open(stream)
+        elif isinstance(stream, (bytes, bytearray, memoryview, mmap.mmap)):
+            stream = BufferStream(stream)
         self.read(stream)
         self.stream = stream
 
@@ -366,6 +580,8 @@ class PdfReader:
 
         :return: the document information of this PDF file
         """
+        if TK.INFO not in self.trailer and self._trailer_prev is not None:
+            self._read_older_info()
         if TK.INFO not in self.trailer:
             return None
         obj = self.trailer[TK.INFO]
@@ -377,6 +593,104 @@ class PdfReader:
         retval.update(obj)  # type: ignore
         return retval
 
+    def get_summary(self) -> DocumentSummary:
+        """
+        Retrieve the page count, document information, PDF version and
+        encryption flag, reading only the trailer and the catalog.
+
+        Unlike ``len(reader.pages)`` this never flattens the page tree: the
+        page count is the ``/Count`` of the root ``/Pages`` node. The tree is
+        only walked if that entry is missing or invalid.
+
+        :return: a :class:`DocumentSummary<PyPDF2.DocumentSummary>`
+        """
+        locked = self._encryption is not None and not self._encryption.is_decrypted()
+        try:
+            # /Count and /Version are numbers and names, never encrypted
+            self._override_encryption = locked
+            catalog = cast(DictionaryObject, self.trailer[TK.ROOT])
+            pages = catalog[CD.PAGES] if CD.PAGES in catalog else None
+            count = (
+                pages[PA.COUNT]
+                if isinstance(pages, DictionaryObject) and PA.COUNT in pages
+                else None
+            )
+            catalog_version = catalog[CD.VERSION] if CD.VERSION in catalog else None
+        finally:
+            self._override_encryption = False
+        if not isinstance(count, int) or count < 0:
+            logger_warning("Invalid /Pages /Count, walking the page tree", __name__)
+            count = self._get_num_pages()
+
+        return DocumentSummary(
+            page_count=int(count),
+            metadata=None if locked else self.metadata,
+            pdf_version=self._get_pdf_version(catalog_version),
+            is_encrypted=self.is_encrypted,
+        )
+
+    def extract_text_prefix(
+        self, min_chars: int, max_pages: Optional[int] = None, **kwargs: Any
+    ) -> str:
+        """
+        Extract the text at the start of the document: pages are read one
+        at a time, and each only as far as needed, until `min_chars`
+        non-whitespace characters are collected.
+
+        Page texts are joined with newlines. Pages after the ones needed are
+        never loaded, and content streams are never decoded past the
+        operator that completes the text.
+
+        :param int min_chars: number of non-whitespace characters wanted
+        :param int max_pages: read at most that many pages (default: all)
+        :param kwargs: passed on to
+            :meth:`PageObject.extract_text<PyPDF2._page.PageObject.extract_text>`
+        :return: the text of the pages read, possibly with more than
+            `min_chars` characters, or fewer when the document is shorter
+        """
+        texts: List[str] = []
+        found = 0
+        num_pages = len(self.pages)
+        if max_pages is not None:
+            num_pages = min(num_pages, max_pages)
+        for page_number in range(num_pages):
+            if found >= min_chars:
+                break
+            page = self._get_page(page_number)
+            # whitespace does not count: ask for more until the page is done
+            limit = max(2 * (min_chars - found), 256)
+            while True:
+                text = page.extract_text(max_chars=limit, **kwargs)
+                page_found = len("".join(text.split()))
+                if len(text) < limit or found + page_found >= min_chars:
+                    break
+                limit *= 4
+            texts.append(text)
+            found += page_found
+        return "\n".join(texts)
+
+    def _get_pdf_version(self, catalog_version: Any = None) -> str:
+        """
+        The document's version: the header version, unless the catalog
+        /Version entry (PDF 1.4+) declares a later one.
+        """
+
+        def as_tuple(version: str) -> Tuple[int, ...]:
+            try:
+                return tuple(int(x) for x in version.split("."))
+            except ValueError:
+                return ()
+
+        try:
+            version = self.pdf_header[5:].strip()
+        except UnicodeDecodeError:
+            version = ""
+        if isinstance(catalog_version, str):
+            declared = catalog_version.lstrip("/")
+            if as_tuple(declared) > as_tuple(version):
+                version = declared
+        return version
+
     def getDocumentInfo(self) -> Optional[DocumentInformation]:  # pragma: no cover
         """
         .. deprecated:: 1.28.0
@@ -440,13 +754,19 @@ class PdfReader:
         """
         # Flattened pages will not work on an Encrypted PDF;
         # the PDF file's page count is used in this case. Otherwise,
-        # the original method (flattened page count) is used.
+        # the /Count of the page tree root is used, and the tree is only
+        # flattened if that count is unusable. A page lookup that finds the
+        # counts inconsistent (see _PageTreeNode) flattens the tree too,
+        # and the flattened tree is the page count from then on.
         if self.is_encrypted:
             return self.trailer[TK.ROOT]["/Pages"]["/Count"]  # type: ignore
-        else:
-            if self.flattened_pages is None:
-                self._flatten()
-            return len(self.flattened_pages)  # type: ignore
+        if self.flattened_pages is None:
+            root = cast(DictionaryObject, self.trailer[TK.ROOT])["/Pages"]
+            count = cast(DictionaryObject, root).get(PA.COUNT)
+            if isinstance(count, int) and count >= 0:
+                return int(count)
+            self._flatten()
+        return len(self.flattened_pages)  # type: ignore
 
     def getNumPages(self) -> int:  # pragma: no cover
         """
@@ -488,10 +808,96 @@ class PdfReader:
         """
         # ensure that we're not trying to access an encrypted PDF
         # assert not self.trailer.has_key(TK.ENCRYPT)
-        if self.flattened_pages is None:
+        if self.flattened_pages is not None:
+            return self.flattened_pages[page_number]
+        page = self._page_cache.get(page_number)
+        if page is not None:
+            self._page_cache.move_to_end(page_number)
+            return page
+        page = self._find_page(page_number)
+        if page is None:
+            # the /Count entries do not match the tree: walk all of it
+            logger_warning("Inconsistent page tree /Count, flattening it", __name__)
             self._flatten()
-        assert self.flattened_pages is not None, "hint for mypy"
-        return self.flattened_pages[page_number]
+            assert self.flattened_pages is not None, "hint for mypy"
+            return self.flattened_pages[page_number]
+        self._page_cache[page_number] = page
+        while len(self._page_cache) > max(self.page_cache_size, 1):
+            self._page_cache.popitem(last=False)
+        return page
+
+    def _find_page(self, page_number: int) -> Optional[PageObject]:
+        """
+        Descend from the page tree root straight to `page_number`, using the
+        /Count of intermediate /Pages nodes to pick a kid at each level.
+        Inheritable attributes are only collected along that path.
+
+        :return: the page, or ``None`` if the tree counts are inconsistent.
+        """
+        node = cast(DictionaryObject, self.trailer[TK.ROOT]["/Pages"].get_object())  # type: ignore
+        inherit: Dict[str, Any] = {}
+        remaining = page_number
+        indirect_reference: Optional[IndirectObject] = None
+        path = set()
+        while node.get(PA.TYPE, "/Pages") == "/Pages":
+            if id(node) in path:
+                return None  # cycle in the page tree
+            path.add(id(node))
+            for attr in INHERITABLE_PAGE_ATTRIBUTES:
+                if attr in node:
+                    inherit[attr] = node[attr]
+            entry = self._page_tree_nodes.get(id(node))
+            if entry is None:
+                entry = self._page_tree_nodes[id(node)] = _PageTreeNode(node)
+            found = entry.locate(self, remaining)
+            if found is None:
+                return None
+            kid, node, before = found
+            remaining -= before
+            indirect_reference = kid if isinstance(kid, IndirectObject) else None
+        if node.get(PA.TYPE) != "/Page" or remaining != 0:
+            return None
+        return self._build_page(node, inherit, indirect_reference)
+
+    def _build_page(
+        self,
+        page: DictionaryObject,
+        inherit: Dict[str, Any],
+        indirect_reference: Optional[IndirectObject],
+    ) -> PageObject:
+        for attr_in, value in inherit.items():
+            # if the page has it's own value, it does not inherit the
+            # parent's value:
+            if attr_in not in page:
+                page[attr_in] = value
+        page_obj = PageObject(self, indirect_reference)
+        page_obj.update(page)
+        return page_obj
+
+    def _count_pages_in(self, node: DictionaryObject) -> int:
+        """Number of pages below a page tree node, trusting a valid /Count."""
+        t = node.get(PA.TYPE, "/Pages")
+        if t == "/Page":
+            return 1
+        if t != "/Pages":
+            return 0
+        count = node.get(PA.COUNT)
+        if isinstance(count, int) and count >= 0:
+            return int(count)
+        # no usable /Count: count the leaves
+        total = 0
+        stack, seen = [node], set()
+        while stack:
+            current = stack.pop()
+            if id(current) in seen:
+                continue
+            seen.add(id(current))
+            t = current.get(PA.TYPE, "/Pages")
+            if t == "/Page":
+                total += 1
+            elif t == "/Pages":
+                stack.extend(k.get_object() for k in current.get(PA.KIDS, ()))
+        return total
 
     @property
     def namedDestinations(self) -> Dict[str, Any]:  # pragma: no cover
@@ -1087,12 +1493,6 @@ class PdfReader:
         inherit: Optional[Dict[str, Any]] = None,
         indirect_reference: Optional[IndirectObject] = None,
     ) -> None:
-        inheritable_page_attributes = (
-            NameObject(PG.RESOURCES),
-            NameObject(PG.MEDIABOX),
-            NameObject(PG.CROPBOX),
-            NameObject(PG.ROTATE),
-        )
         if inherit is None:
             inherit = {}
         if pages is None:
@@ -1102,43 +1502,100 @@ class PdfReader:
             pages = catalog["/Pages"].get_object()  # type: ignore
             self.flattened_pages = []
 
-        t = "/Pages"
-        if PA.TYPE in pages:
-            t = pages[PA.TYPE]  # type: ignore
-
-        if t == "/Pages":
-            for attr in inheritable_page_attributes:
-                if attr in pages:
-                    inherit[attr] = pages[attr]
-            for page in pages[PA.KIDS]:  # type: ignore
-                addt = {}
-                if isinstance(page, IndirectObject):
-                    addt["indirect_reference"] = page
-                self._flatten(page.get_object(), inherit, **addt)
-        elif t == "/Page":
-            for attr_in, value in list(inherit.items()):
-                # if the page has it's own value, it does not inherit the
-                # parent's value:
-                if attr_in not in pages:
-                    pages[attr_in] = value
-            page_obj = PageObject(self, indirect_reference)
-            page_obj.update(pages)
-
-            # TODO: Could flattened_pages be None at this point?
-            self.flattened_pages.append(page_obj)  # type: ignore
+        # Depth-first walk with an explicit stack (kids pushed in reverse to
+        # keep document order), so deep trees cannot hit the recursion limit.
+        stack: List[Tuple[Any, Dict[str, Any], Optional[IndirectObject]]] = [
+            (pages, inherit, indirect_reference)
+        ]
+        visited = set()
+        while stack:
+            node, inherited, reference = stack.pop()
+            t = "/Pages"
+            if PA.TYPE in node:
+                t = node[PA.TYPE]
+
+            if t == "/Pages":
+                if id(node) in visited:
+                    continue  # cycle in the page tree
+                visited.add(id(node))
+                inherited = dict(inherited)
+                for attr in INHERITABLE_PAGE_ATTRIBUTES:
+                    if attr in node:
+                        inherited[attr] = node[attr]
+                for page in reversed(node[PA.KIDS]):  # type: ignore
+                    ref = page if isinstance(page, IndirectObject) else None
+                    stack.append((page.get_object(), inherited, ref))
+            elif t == "/Page":
+                page_obj = self._build_page(node, inherited, reference)
+                # TODO: Could flattened_pages be None at this point?
+                self.flattened_pages.append(page_obj)  # type: ignore
 
     def _get_object_from_stream(
         self, indirect_reference: IndirectObject
     ) -> Union[int, PdfObject, str]:
         # indirect reference to object in object stream
-        # read the entire object stream into memory
         stmnum, idx = self.xref_objStm[indirect_reference.idnum]
-        obj_stm: EncodedStreamObject = IndirectObject(stmnum, 0, self).get_object()  # type: ignore
+        data, first, offsets = self._load_object_stream(stmnum, idx)
+        if indirect_reference.idnum not in offsets:
+            if self.strict:
+                raise PdfReadError("This is a fatal error in strict mode.")
+            return NullObject()
+        i, offset = offsets[indirect_reference.idnum]
+        if self.strict and idx != i:
+            raise PdfReadError("Object is in wrong index.")
+        # BytesIO shares the immutable buffer until written to: no copy
+        stream_data = BytesIO(data)
+        stream_data.seek(first + offset, 0)
+
+        # to cope with some case where the 'pointer' is on a white space
+        read_non_whitespace(stream_data)
+        stream_data.seek(-1, 1)
+
+        try:
+            obj = read_object(stream_data, self)
+        except PdfStreamError as exc:
+            # Stream object cannot be read. Normally, a critical error, but
+            # Adobe Reader doesn't complain, so continue (in strict mode?)
+            logger_warning(
+                f"Invalid stream (index {i}) within object "
+                f"{indirect_reference.idnum} {indirect_reference.generation}: "
+                f"{exc}",
+                __name__,
+            )
+
+            if self.strict:
+                raise PdfReadError(f"Can't read object stream: {exc}")
+            # Replace with null. Hopefully it's nothing important.
+            obj = NullObject()
+        return obj
+
+    def _load_object_stream(
+        self, stmnum: int, idx: int
+    ) -> Tuple[bytes, int, Dict[int, Tuple[int, int]]]:
+        """
+        Decode an /ObjStm and parse its header once.
+
+        The result is kept in a LRU bounded by ``obj_stm_cache_bytes`` of
+        decoded data. The decoded bytes are deliberately not stored on the
+        stream object itself, so evicted object streams really are released.
+
+        :return: (decoded data, /First, {objnum: (index, offset)})
+        """
+        cached = self._obj_stm_cache.get(stmnum)
+        if cached is not None:
+            self._obj_stm_cache.move_to_end(stmnum)
+            return cached
+        obj_stm: StreamObject = IndirectObject(stmnum, 0, self).get_object()  # type: ignore
         # This is an xref to a stream, so its type better be a stream
         assert cast(str, obj_stm["/Type"]) == "/ObjStm"
         # /N is the number of indirect objects in the stream
         assert idx < obj_stm["/N"]
-        stream_data = BytesIO(b_(obj_stm.get_data()))  # type: ignore
+        if isinstance(obj_stm, EncodedStreamObject) and obj_stm.decoded_self is None:
+            data = b_(decode_stream_data(obj_stm))
+        else:
+            data = b_(obj_stm.get_data())
+        stream_data = BytesIO(data)
+        offsets: Dict[int, Tuple[int, int]] = {}
         for i in range(obj_stm["/N"]):  # type: ignore
             read_non_whitespace(stream_data)
             stream_data.seek(-1, 1)
@@ -1148,38 +1605,19 @@ class PdfReader:
             offset = NumberObject.read_from_stream(stream_data)
             read_non_whitespace(stream_data)
             stream_data.seek(-1, 1)
-            if objnum != indirect_reference.idnum:
-                # We're only interested in one object
-                continue
-            if self.strict and idx != i:
-                raise PdfReadError("Object is in wrong index.")
-            stream_data.seek(int(obj_stm["/First"] + offset), 0)  # type: ignore
-
-            # to cope with some case where the 'pointer' is on a white space
-            read_non_whitespace(stream_data)
-            stream_data.seek(-1, 1)
-
-            try:
-                obj = read_object(stream_data, self)
-            except PdfStreamError as exc:
-                # Stream object cannot be read. Normally, a critical error, but
-                # Adobe Reader doesn't complain, so continue (in strict mode?)
-                logger_warning(
-                    f"Invalid stream (index {i}) within object "
-                    f"{indirect_reference.idnum} {indirect_reference.generation}: "
-                    f"{exc}",
-                    __name__,
-                )
-
-                if self.strict:
-                    raise PdfReadError(f"Can't read object stream: {exc}")
-                # Replace with null. Hopefully it's nothing important.
-                obj = NullObject()
-            return obj
-
-        if self.strict:
-            raise PdfReadError("This is a fatal error in strict mode.")
-        return NullObject()
+            # the first entry wins, as when the header was scanned per lookup
+            offsets.setdefault(int(objnum), (i, int(offset)))
+        entry = (data, int(obj_stm["/First"]), offsets)  # type: ignore
+
+        self._obj_stm_cache[stmnum] = entry
+        self._obj_stm_cache_size += len(data)
+        while (
+            self._obj_stm_cache_size > self.obj_stm_cache_bytes
+            and len(self._obj_stm_cache) > 1
+        ):
+            _, (old, _, _) = self._obj_stm_cache.popitem(last=False)
+            self._obj_stm_cache_size -= len(old)
+        return entry
 
     def _get_indirect_object(self, num: int, gen: int) -> Optional[PdfObject]:
         """
@@ -1198,6 +1636,8 @@ class PdfReader:
         )
         if retval is not None:
             return retval
+        if self._xref_prev is not None:
+            self._load_xref_for(indirect_reference)
         if (
             indirect_reference.generation == 0
             and indirect_reference.idnum in self.xref_objStm
@@ -1216,26 +1656,17 @@ class PdfReader:
             try:
                 idnum, generation = self.read_object_header(self.stream)
             except Exception:
-                if hasattr(self.stream, "getbuffer"):
-                    buf = bytes(self.stream.getbuffer())  # type: ignore
-                else:
-                    p = self.stream.tell()
-                    self.stream.seek(0, 0)
-                    buf = self.stream.read(-1)
-                    self.stream.seek(p, 0)
-                m = re.search(
-                    rf"\s{indirect_reference.idnum}\s+{indirect_reference.generation}\s+obj".encode(),
-                    buf,
-                )
-                if m is not None:
+                offset = self._find_object(self.stream, indirect_reference)
+                if offset is not None:
                     logger_warning(
                         f"Object ID {indirect_reference.idnum},{indirect_reference.generation} ref repaired",
                         __name__,
                     )
+                    self.repair_count += 1
                     self.xref[indirect_reference.generation][
                         indirect_reference.idnum
-                    ] = (m.start(0) + 1)
-                    self.stream.seek(m.start(0) + 1)
+                    ] = offset
+                    self.stream.seek(offset)
                     idnum, generation = self.read_object_header(self.stream)
                 else:
                     idnum = -1  # exception will be raised below
@@ -1270,30 +1701,20 @@ class PdfReader:
                     retval, indirect_reference.idnum, indirect_reference.generation
                 )
         else:
-            if hasattr(self.stream, "getbuffer"):
-                buf = bytes(self.stream.getbuffer())  # type: ignore
-            else:
-                p = self.stream.tell()
-                self.stream.seek(0, 0)
-                buf = self.stream.read(-1)
-                self.stream.seek(p, 0)
-            m = re.search(
-                rf"\s{indirect_reference.idnum}\s+{indirect_reference.generation}\s+obj".encode(),
-                buf,
-            )
-            if m is not None:
+            offset = self._find_object(self.stream, indirect_reference)
+            if offset is not None:
                 logger_warning(
                     f"Object {indirect_reference.idnum} {indirect_reference.generation} found",
                     __name__,
                 )
+                self.repair_count += 1
                 if indirect_reference.generation not in self.xref:
-                    self.xref[indirect_reference.generation] = {}
-                self.xref[indirect_reference.generation][indirect_reference.idnum] = (
-                    m.start(0) + 1
-                )
-                self.stream.seek(m.end(0) + 1)
-                skip_over_whitespace(self.stream)
-                self.stream.seek(-1, 1)
+                    self.xref[indirect_reference.generation] = new_generation(
+                        indirect_reference.generation
+                    )
+                self.xref[indirect_reference.generation][indirect_reference.idnum] = offset
+                self.stream.seek(offset)
+                self.read_object_header(self.stream)
                 retval = read_object(self.stream, self)  # type: ignore
 
                 # override encryption is used for the /Encrypt dictionary
@@ -1334,6 +1755,15 @@ class PdfReader:
         # cross-reference table should put us in the right spot to read the
         # object header.  In reality... some files have stupid cross reference
         # tables that are off by whitespace bytes.
+        # the common case "<idnum> <generation> obj", in one read
+        start = stream.tell()
+        head = stream.read(OBJECT_HEADER_WINDOW)
+        m = OBJECT_HEADER_RE.match(head)
+        if m is not None and (m.end() < len(head) or len(head) < OBJECT_HEADER_WINDOW):
+            stream.seek(start + m.end(), 0)
+            return int(m.group(1)), int(m.group(2))
+        stream.seek(start, 0)
+
         extra = False
         skip_over_comment(stream)
         extra |= skip_over_whitespace(stream)
@@ -1427,26 +1857,30 @@ class PdfReader:
 
         # if not zero-indexed, verify that the table is correct; change it if necessary
         if self.xref_index and not self.strict:
-            loc = stream.tell()
-            for gen, xref_entry in self.xref.items():
-                if gen == 65535:
-                    continue
-                xref_k = sorted(
-                    xref_entry.keys()
-                )  # must ensure ascendant to prevent damange
-                for id in xref_k:
-                    stream.seek(xref_entry[id], 0)
-                    try:
-                        pid, _pgen = self.read_object_header(stream)
-                    except ValueError:
-                        break
-                    if pid == id - self.xref_index:
-                        # fixing index item per item is required for revised PDF.
-                        self.xref[gen][pid] = self.xref[gen][id]
-                        del self.xref[gen][id]
-                    # if not, then either it's just plain wrong, or the
-                    # non-zero-index is actually correct
-            stream.seek(loc, 0)  # return to where it was
+            self._fix_xref_index(stream)
+
+    def _fix_xref_index(self, stream: StreamType) -> None:
+        """Renumber entries of an xref table that is not zero-indexed."""
+        loc = stream.tell()
+        for gen, xref_entry in self.xref.items():
+            if gen == 65535:
+                continue
+            xref_k = sorted(
+                xref_entry.keys()
+            )  # must ensure ascendant to prevent damange
+            for id in xref_k:
+                stream.seek(xref_entry[id], 0)
+                try:
+                    pid, _pgen = self.read_object_header(stream)
+                except ValueError:
+                    break
+                if pid == id - self.xref_index:
+                    # fixing index item per item is required for revised PDF.
+                    self.xref[gen][pid] = self.xref[gen][id]
+                    del self.xref[gen][id]
+                # if not, then either it's just plain wrong, or the
+                # non-zero-index is actually correct
+        stream.seek(loc, 0)  # return to where it was
 
     def _basic_validation(self, stream: StreamType) -> None:
         # start at the end:
@@ -1513,81 +1947,47 @@ class PdfReader:
             size = cast(int, read_object(stream, self))
             read_non_whitespace(stream)
             stream.seek(-1, 1)
-            cnt = 0
-            while cnt < size:
-                line = stream.read(20)
-
-                # It's very clear in section 3.4.3 of the PDF spec
-                # that all cross-reference table lines are a fixed
-                # 20 bytes (as of PDF 1.7). However, some files have
-                # 21-byte entries (or more) due to the use of \r\n
-                # (CRLF) EOL's. Detect that case, and adjust the line
-                # until it does not begin with a \r (CR) or \n (LF).
-                while line[0] in b"\x0D\x0A":
-                    stream.seek(-20 + 1, 1)
-                    line = stream.read(20)
-
-                # On the other hand, some malformed PDF files
-                # use a single character EOL without a preceding
-                # space.  Detect that case, and seek the stream
-                # back one character.  (0-9 means we've bled into
-                # the next xref entry, t means we've bled into the
-                # text "trailer"):
-                if line[-1] in b"0123456789t":
-                    stream.seek(-1, 1)
-
-                try:
-                    offset_b, generation_b = line[:16].split(b" ")
-                    entry_type_b = line[17:18]
-
-                    offset, generation = int(offset_b), int(generation_b)
-                except Exception:
-                    # if something wrong occured
-                    if hasattr(stream, "getbuffer"):
-                        buf = bytes(stream.getbuffer())  # type: ignore
-                    else:
-                        p = stream.tell()
-                        stream.seek(0, 0)
-                        buf = stream.read(-1)
-                        stream.seek(p)
-
-                    f = re.search(f"{num}\\s+(\\d+)\\s+obj".encode(), buf)
-                    if f is None:
-                        logger_warning(
-                            f"entry {num} in Xref table invalid; object not found",
-                            __name__,
-                        )
-                        generation = 65535
-                        offset = -1
-                    else:
-                        logger_warning(
-                            f"entry {num} in Xref table invalid but object found",
-                            __name__,
-                        )
-                        generation = int(f.group(1))
-                        offset = f.start()
-
-                if generation not in self.xref:
-                    self.xref[generation] = {}
-                    self.xref_free_entry[generation] = {}
-                if num in self.xref[generation]:
-                    # It really seems like we should allow the last
-                    # xref table in the file to override previous
-                    # ones. Since we read the file backwards, assume
-                    # any existing key is already set correctly.
-                    pass
-                else:
-                    self.xref[generation][num] = offset
-                    try:
-                        self.xref_free_entry[generation][num] = entry_type_b == b"f"
-                    except Exception:
-                        pass
-                    try:
-                        self.xref_free_entry[65535][num] = entry_type_b == b"f"
-                    except Exception:
-                        pass
-                cnt += 1
-                num += 1
+            # Read the whole subsection in one go. It's very clear in section
+            # 3.4.3 of the PDF spec that all cross-reference table lines are
+            # a fixed 20 bytes (as of PDF 1.7): when they are, the block is
+            # split with one findall. However, some files have 21-byte
+            # entries (or more) due to the use of \r\n (CRLF) EOL's, and
+            # some malformed files use a single character EOL without a
+            # preceding space: those are matched entry by entry.
+            start = stream.tell()
+            block = stream.read(size * 20 + 32)
+            # size non-overlapping 20-byte matches in size * 20 bytes can
+            # only be the whole block
+            entries: List[Tuple[Any, Any, bytes]] = XREF_FIXED_ENTRY_RE.findall(
+                block, 0, size * 20
+            )
+            pos = size * 20
+            if len(entries) != size:
+                entries, pos = [], 0
+                # grown in place as needed: appending to bytes would copy
+                # the whole block each time
+                buffer = bytearray(block)
+                for entry_num in range(num, num + size):
+                    if len(buffer) - pos < 64:
+                        # stray EOLs made the entries longer than 20 bytes
+                        buffer += stream.read(4096)
+                    m = XREF_ENTRY_RE.match(buffer, pos)
+                    if m is not None:
+                        entries.append(m.groups())  # type: ignore
+                        pos = m.end()
+                        continue
+                    while buffer[pos : pos + 1] in (b"\r", b"\n"):
+                        pos += 1
+                    line = bytes(buffer[pos : pos + 20])
+                    pos += 20
+                    # (0-9 means we've bled into the next xref entry, t means
+                    # we've bled into the text "trailer")
+                    if line[-1:] and line[-1] in b"0123456789t":
+                        pos -= 1
+                    entries.append(self._read_invalid_xref_entry(stream, entry_num, line))
+            stream.seek(start + pos, 0)
+
+            add_table_entries(self.xref, self.xref_free_entry, num, entries)
             read_non_whitespace(stream)
             stream.seek(-1, 1)
             trailertag = stream.read(7)
@@ -1597,54 +1997,223 @@ class PdfReader:
             else:
                 break
 
+    def _read_invalid_xref_entry(
+        self, stream: StreamType, num: int, line: bytes
+    ) -> Tuple[int, int, bytes]:
+        """
+        Parse an xref entry XREF_ENTRY_RE rejected, or locate the object.
+
+        :return: (offset, generation, entry type)
+        """
+        try:
+            offset_b, generation_b = line[:16].split(b" ")
+            entry_type_b = line[17:18]
+
+            return int(offset_b), int(generation_b), entry_type_b
+        except Exception:
+            # if something wrong occured
+            for generation, offsets in sorted(self._object_offsets(stream).items()):
+                if num in offsets:
+                    logger_warning(
+                        f"entry {num} in Xref table invalid but object found",
+                        __name__,
+                    )
+                    self.repair_count += 1
+                    return offsets[num], generation, line[17:18]
+            logger_warning(
+                f"entry {num} in Xref table invalid; object not found",
+                __name__,
+            )
+            return -1, 65535, line[17:18]
+
+    @staticmethod
+    def _file_contents(stream: StreamType) -> Union[bytes, memoryview]:
+        """The whole file, without a copy when the stream has ``getbuffer``."""
+        if hasattr(stream, "getbuffer"):
+            return stream.getbuffer()  # type: ignore
+        p = stream.tell()
+        stream.seek(0, 0)
+        buf = stream.read(-1)
+        stream.seek(p, 0)
+        return buf
+
+    def _object_offsets(self, stream: StreamType) -> Dict[int, Dict[int, int]]:
+        """
+        Offsets of all the object headers of the file, as
+        ``{generation: {idnum: offset}}``.
+
+        The file is scanned once, on the first repair; when an object appears
+        more than once, the last one (the latest incremental update) wins.
+        """
+        if self._object_index is None:
+            index: Dict[int, Dict[int, int]] = {}
+            for m in OBJECT_SCAN_RE.finditer(self._file_contents(stream)):
+                generation = int(m.group(2))
+                if generation not in index:
+                    index[generation] = {}
+                index[generation][int(m.group(1))] = m.start(1)
+            self._object_index = index
+        return self._object_index
+
+    def _find_object(
+        self, stream: StreamType, indirect_reference: IndirectObject
+    ) -> Optional[int]:
+        """Offset of the header of `indirect_reference` in the file, if any."""
+        return self._object_offsets(stream).get(indirect_reference.generation, {}).get(
+            indirect_reference.idnum
+        )
+
     def _read_xref_tables_and_trailers(
         self, stream: StreamType, startxref: Optional[int], xref_issue_nr: int
     ) -> None:
-        self.xref: Dict[int, Dict[Any, Any]] = {}
-        self.xref_free_entry: Dict[int, Dict[Any, Any]] = {}
-        self.xref_objStm: Dict[int, Tuple[Any, Any]] = {}
+        self.xref: Dict[int, MutableMapping[Any, Any]] = {}
+        self.xref_free_entry: Dict[int, MutableMapping[Any, Any]] = {}
+        self.xref_objStm: MutableMapping[int, Tuple[Any, Any]] = XrefObjectStreams()
         self.trailer = DictionaryObject()
+        self._xref_prev = None
+        self._trailer_prev = None
         while startxref is not None:
-            # load the xref table
-            stream.seek(startxref, 0)
+            startxref, xref_issue_nr = self._read_xref_section(
+                stream, startxref, xref_issue_nr
+            )
+            if self.lazy_xref and startxref is not None and TK.ROOT in self.trailer:
+                # the older sections are read on demand, see _load_xref_for
+                self._xref_prev = startxref, xref_issue_nr
+                self._trailer_prev = startxref
+                break
+
+    def _read_older_info(self) -> None:
+        """
+        With ``lazy_xref``, take the /Info the newer trailers lack from the
+        older ones, as reading all the sections would. Only the trailers are
+        read, following /Prev until one has /Info or the chain ends; the
+        xref entries are left for later. /Encrypt and /ID must be repeated
+        in the trailer of an update, so they are not looked for.
+        """
+        stream = self.stream
+        pos = stream.tell()
+        prev, self._trailer_prev = self._trailer_prev, None
+        seen = set()
+        while prev is not None and prev not in seen and TK.INFO not in self.trailer:
+            seen.add(prev)
+            try:
+                trailer = self._read_trailer_at(stream, prev)
+            except Exception as e:
+                logger_warning(f"Previous trailer can not be read {e.args}", __name__)
+                break
+            if TK.INFO in trailer:
+                self.trailer[NameObject(TK.INFO)] = trailer.raw_get(TK.INFO)
+            value = trailer.get("/Prev")
+            prev = int(value) if isinstance(value, int) else None
+        stream.seek(pos, 0)
+
+    def _read_trailer_at(self, stream: StreamType, startxref: int) -> DictionaryObject:
+        """
+        The trailer of the xref section at `startxref`: the dictionary after
+        the "trailer" keyword of a table, or the dictionary of an xref
+        stream, read without its entries.
+        """
+        stream.seek(startxref, 0)
+        x = stream.read(1)
+        if x in b"\r\n":
             x = stream.read(1)
-            if x in b"\r\n":
-                x = stream.read(1)
-            if x == b"x":
-                startxref = self._read_xref(stream)
-            elif xref_issue_nr:
-                try:
-                    self._rebuild_xref_table(stream)
+        if x.isdigit():
+            stream.seek(-1, 1)
+            self.read_object_header(stream)
+        elif x == b"x":
+            # skip the table, which can be long, up to the keyword
+            pos, tail = stream.tell(), b""
+            while True:
+                piece = stream.read(64 * 1024)
+                if not piece:
+                    raise PdfReadError("trailer not found")
+                found = (tail + piece).find(b"trailer")
+                if found >= 0:
+                    stream.seek(pos - len(tail) + found + 7, 0)
                     break
-                except Exception:
-                    xref_issue_nr = 0
-            elif x.isdigit():
-                try:
-                    xrefstream = self._read_pdf15_xref_stream(stream)
-                except Exception as e:
-                    if TK.ROOT in self.trailer:
-                        logger_warning(
-                            f"Previous trailer can not be read {e.args}",
-                            __name__,
-                        )
-                        break
-                    else:
-                        raise PdfReadError(f"trailer can not be read {e.args}")
-                trailer_keys = TK.ROOT, TK.ENCRYPT, TK.INFO, TK.ID
-                for key in trailer_keys:
-                    if key in xrefstream and key not in self.trailer:
-                        self.trailer[NameObject(key)] = xrefstream.raw_get(key)
-                if "/XRefStm" in xrefstream:
-                    p = stream.tell()
-                    stream.seek(cast(int, xrefstream["/XRefStm"]) + 1, 0)
-                    self._read_pdf15_xref_stream(stream)
-                    stream.seek(p, 0)
-                if "/Prev" in xrefstream:
-                    startxref = cast(int, xrefstream["/Prev"])
+                pos += len(piece)
+                tail = piece[-6:]
+            read_non_whitespace(stream)
+            stream.seek(-1, 1)
+        else:
+            raise PdfReadError(f"no xref section at {startxref}")
+        trailer = read_object(stream, self)
+        if not isinstance(trailer, DictionaryObject):
+            raise PdfReadError(f"invalid trailer at {startxref}")
+        return trailer
+
+    def _read_xref_section(
+        self, stream: StreamType, startxref: int, xref_issue_nr: int
+    ) -> Tuple[Optional[int], int]:
+        """
+        Read the xref section (table or stream) at `startxref` and its trailer.
+
+        Entries already read from a newer section are kept.
+
+        :return: the offset of the previous section, if any, and the updated
+            xref_issue_nr
+        """
+        stream.seek(startxref, 0)
+        x = stream.read(1)
+        if x in b"\r\n":
+            x = stream.read(1)
+        if x == b"x":
+            return self._read_xref(stream), xref_issue_nr
+        elif xref_issue_nr:
+            try:
+                self._rebuild_xref_table(stream)
+                return None, xref_issue_nr
+            except Exception:
+                return startxref, 0  # read it again, as a table or stream
+        elif x.isdigit():
+            try:
+                xrefstream = self._read_pdf15_xref_stream(stream)
+            except Exception as e:
+                if TK.ROOT in self.trailer:
+                    logger_warning(
+                        f"Previous trailer can not be read {e.args}",
+                        __name__,
+                    )
+                    return None, xref_issue_nr
                 else:
-                    break
-            else:
-                startxref = self._read_xref_other_error(stream, startxref)
+                    raise PdfReadError(f"trailer can not be read {e.args}")
+            trailer_keys = TK.ROOT, TK.ENCRYPT, TK.INFO, TK.ID
+            for key in trailer_keys:
+                if key in xrefstream and key not in self.trailer:
+                    self.trailer[NameObject(key)] = xrefstream.raw_get(key)
+            if "/XRefStm" in xrefstream:
+                p = stream.tell()
+                stream.seek(cast(int, xrefstream["/XRefStm"]) + 1, 0)
+                self._read_pdf15_xref_stream(stream)
+                stream.seek(p, 0)
+            if "/Prev" in xrefstream:
+                return cast(int, xrefstream["/Prev"]), xref_issue_nr
+            return None, xref_issue_nr
+        else:
+            return self._read_xref_other_error(stream, startxref), xref_issue_nr
+
+    def _load_xref_for(self, indirect_reference: IndirectObject) -> None:
+        """
+        With ``lazy_xref``, read older xref sections until one has an entry
+        for `indirect_reference`, or there are none left.
+        """
+        idnum, generation = indirect_reference.idnum, indirect_reference.generation
+        pos = self.stream.tell()
+        while self._xref_prev is not None:
+            if (generation == 0 and idnum in self.xref_objStm) or (
+                idnum in self.xref.get(generation, ())
+            ):
+                break
+            startxref, xref_issue_nr = self._xref_prev
+            self._xref_prev = None
+            startxref, xref_issue_nr = self._read_xref_section(
+                self.stream, startxref, xref_issue_nr
+            )
+            if startxref is not None:
+                self._xref_prev = startxref, xref_issue_nr
+            if self.xref_index and not self.strict:
+                self._fix_xref_index(self.stream)
+        self.stream.seek(pos, 0)
 
     def _read_xref(self, stream: StreamType) -> Optional[int]:
         self._read_standard_xref_table(stream)
@@ -1721,7 +2290,7 @@ class PdfReader:
         xrefstream = cast(ContentStream, read_object(stream, self))
         assert cast(str, xrefstream["/Type"]) == "/XRef"
         self.cache_indirect_object(generation, idnum, xrefstream)
-        stream_data = BytesIO(b_(xrefstream.get_data()))
+        data = b_(xrefstream.get_data())
         # Index pairs specify the subsections in the dictionary. If
         # none create one subsection that spans everything.
         idx_pairs = xrefstream.get("/Index", [0, xrefstream.get("/Size")])
@@ -1730,26 +2299,10 @@ class PdfReader:
         if self.strict and len(entry_sizes) > 3:
             raise PdfReadError(f"Too many entry sizes: {entry_sizes}")
 
-        def get_entry(i: int) -> Union[int, Tuple[int, ...]]:
-            # Reads the correct number of bytes for each entry. See the
-            # discussion of the W parameter in PDF spec table 17.
-            if entry_sizes[i] > 0:
-                d = stream_data.read(entry_sizes[i])
-                return convert_to_int(d, entry_sizes[i])
-
-            # PDF Spec Table 17: A value of zero for an element in the
-            # W array indicates...the default value shall be used
-            if i == 0:
-                return 1  # First value defaults to 1
-            else:
-                return 0
-
-        def used_before(num: int, generation: Union[int, Tuple[int, ...]]) -> bool:
-            # We move backwards through the xrefs, don't replace any.
-            return num in self.xref.get(generation, []) or num in self.xref_objStm  # type: ignore
-
         # Iterate through each subsection
-        self._read_xref_subsections(idx_pairs, get_entry, used_before)
+        self._read_xref_subsections(
+            idx_pairs, _xref_stream_rows(data, [int(w) for w in entry_sizes])
+        )
         return xrefstream
 
     @staticmethod
@@ -1778,17 +2331,12 @@ class PdfReader:
         return 0
 
     def _rebuild_xref_table(self, stream: StreamType) -> None:
-        self.xref = {}
-        stream.seek(0, 0)
-        f_ = stream.read(-1)
-
-        for m in re.finditer(rb"[\r\n \t][ \t]*(\d+)[ \t]+(\d+)[ \t]+obj", f_):
-            idnum = int(m.group(1))
-            generation = int(m.group(2))
-            if generation not in self.xref:
-                self.xref[generation] = {}
-            self.xref[generation][idnum] = m.start(1)
-        stream.seek(0, 0)
+        self.repair_count += 1
+        self.xref = {
+            generation: new_generation(generation, offsets.items())
+            for generation, offsets in self._object_offsets(stream).items()
+        }
+        f_ = self._file_contents(stream)
         for m in re.finditer(rb"[\r\n \t][ \t]*trailer[\r\n \t]*(<<)", f_):
             stream.seek(m.start(1), 0)
             new_trailer = cast(Dict[Any, Any], read_object(stream, self))
@@ -1799,37 +2347,36 @@ class PdfReader:
     def _read_xref_subsections(
         self,
         idx_pairs: List[int],
-        get_entry: Callable[[int], Union[int, Tuple[int, ...]]],
-        used_before: Callable[[int, Union[int, Tuple[int, ...]]], bool],
+        rows: Iterator[Tuple[int, int, int]],
     ) -> None:
+        xref = self.xref
+        xref_objStm = self.xref_objStm
+        if 0 not in xref:
+            xref[0] = new_generation(0)
         last_end = 0
         for start, size in self._pairs(idx_pairs):
             # The subsections must increase
             assert start >= last_end
             last_end = start + size
-            for num in range(start, start + size):
-                # The first entry is the type
-                xref_type = get_entry(0)
-                # The rest of the elements depend on the xref_type
-                if xref_type == 0:
-                    # linked list of free objects
-                    next_free_object = get_entry(1)  # noqa: F841
-                    next_generation = get_entry(2)  # noqa: F841
-                elif xref_type == 1:
-                    # objects that are in use but are not compressed
-                    byte_offset = get_entry(1)
-                    generation = get_entry(2)
-                    if generation not in self.xref:
-                        self.xref[generation] = {}  # type: ignore
-                    if not used_before(num, generation):
-                        self.xref[generation][num] = byte_offset  # type: ignore
-                elif xref_type == 2:
-                    # compressed objects
-                    objstr_num = get_entry(1)
-                    obstr_idx = get_entry(2)
-                    generation = 0  # PDF spec table 18, generation is 0
-                    if not used_before(num, generation):
-                        self.xref_objStm[num] = (objstr_num, obstr_idx)
+            # We move backwards through the xrefs, don't replace any entry
+            # that was already read (from this or a later xref). Objects in
+            # use (type 1: field1 is the byte offset, field2 the generation)
+            # and compressed (type 2: field1 is the object stream number,
+            # field2 the index in it; PDF spec table 18, generation is 0)
+            # are stored by add_stream_rows, but for generations > 0.
+            others = add_stream_rows(
+                cast(XrefOffsets, xref[0]),
+                cast(XrefObjectStreams, xref_objStm),
+                start,
+                size,
+                rows,
+            )
+            for num, xref_type, field1, field2 in others:
+                if xref_type == 1:
+                    if field2 not in xref:
+                        xref[field2] = new_generation(field2)
+                    if num not in xref[field2] and num not in xref_objStm:
+                        xref[field2][num] = field1
                 elif self.strict:
                     raise PdfReadError(f"Unknown xref type: {xref_type}")
 
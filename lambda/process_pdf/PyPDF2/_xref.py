@@ -0,0 +1,324 @@
+"""Compact storage for the cross-reference entries of a PdfReader."""
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, MutableMapping, Tuple, cast
+
+#: an object number more than this past the end of the arrays (and past
+#: twice their length) is kept in a dict, so that one stray huge number
+#: does not allocate gigabytes
+MAX_GAP = 4096
+
+
+class _ArrayMapping(MutableMapping[int, Any]):
+    """
+    Mapping of object numbers to unsigned ints stored in an ``array``
+    indexed by object number, where all ones marks an unused slot.
+
+    Keys that are not small non-negative ints, and values that do not fit
+    the array, go to a plain dict instead.
+    """
+
+    typecode = "Q"
+
+    def __init__(self, items: Iterable[Tuple[int, Any]] = ()) -> None:
+        self._values = array(self.typecode)
+        self._missing = (1 << (8 * self._values.itemsize)) - 1
+        self._sparse: Dict[Any, Any] = {}
+        self._len = 0
+        for key, value in items:
+            self[key] = value
+
+    def reserve(self, size: int) -> None:
+        """Grow the array to hold object numbers below `size`."""
+        values = self._values
+        if len(values) < size:
+            values.frombytes(b"\xff" * ((size - len(values)) * values.itemsize))
+
+    def _grow(self, start: int, end: int) -> bool:
+        """
+        Grow the array to hold object numbers below `end`, but only when
+        `start` is near enough its end by the rule of single keys (see
+        ``MAX_GAP``).
+
+        :return: whether the array holds them
+        """
+        if start < 2 * len(self._values) + MAX_GAP:
+            self.reserve(end)
+        return end <= len(self._values)
+
+    def _slot(self, key: Any) -> int:
+        """Index of `key` in the array, or -1."""
+        if isinstance(key, int) and key >= 0:
+            if len(self._values) <= key < 2 * len(self._values) + MAX_GAP:
+                self.reserve(key + 1)
+            if key < len(self._values):
+                return key
+        return -1
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            if key >= 0 and self._values[key] != self._missing:  # type: ignore
+                return True
+        except (IndexError, TypeError):
+            pass
+        return key in self._sparse
+
+    def _get(self, key: int) -> Any:
+        try:
+            if key >= 0:
+                v = self._values[key]
+                if v != self._missing:
+                    return v
+        except (IndexError, TypeError):
+            pass
+        return self._sparse[key]
+
+    def _set(self, key: int, v: int, value: Any) -> int:
+        """
+        Store `value`, whose array form is the int `v`.
+
+        :return: the array index it was stored at, or -1 (in the dict)
+        """
+        values = self._values
+        fits = 0 <= v < self._missing
+        if fits and isinstance(key, int) and 0 <= key < len(values):
+            if values[key] == self._missing:
+                if key in self._sparse:
+                    del self._sparse[key]
+                else:
+                    self._len += 1
+            values[key] = v
+            return key
+        if key in self:
+            del self[key]
+        self._len += 1
+        slot = self._slot(key) if fits else -1
+        if slot >= 0:
+            values[slot] = v
+        else:
+            self._sparse[key] = value
+        return slot
+
+    def __delitem__(self, key: int) -> None:
+        try:
+            if key >= 0 and self._values[key] != self._missing:
+                self._values[key] = self._missing
+                self._len -= 1
+                return
+        except (IndexError, TypeError):
+            pass
+        del self._sparse[key]
+        self._len -= 1
+
+    def __iter__(self) -> Iterator[int]:
+        missing = self._missing
+        for key, v in enumerate(self._values):
+            if v != missing:
+                yield key
+        yield from list(self._sparse)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
+
+
+class XrefOffsets(_ArrayMapping):
+    """Byte offsets of the objects of one generation (``PdfReader.xref[0]``)."""
+
+    typecode = "Q"
+
+    def __getitem__(self, key: int) -> int:
+        return self._get(key)
+
+    def __setitem__(self, key: int, value: int) -> None:
+        self._set(key, value, value)
+
+
+class XrefFreeFlags(_ArrayMapping):
+    """Free / in use flags of a classic xref table (``xref_free_entry[0]``)."""
+
+    typecode = "B"
+
+    def __getitem__(self, key: int) -> bool:
+        value = self._get(key)
+        return bool(value)
+
+    def __setitem__(self, key: int, value: bool) -> None:
+        self._set(key, 1 if value else 0, value)
+
+
+class XrefObjectStreams(_ArrayMapping):
+    """
+    Object stream number and index of the compressed objects
+    (``PdfReader.xref_objStm``): the stream numbers are kept in the array
+    of the base class, the indexes in a second one.
+    """
+
+    typecode = "I"
+
+    def __init__(self, items: Iterable[Tuple[int, Tuple[int, int]]] = ()) -> None:
+        self._indexes = array(self.typecode)
+        super().__init__(items)
+
+    def reserve(self, size: int) -> None:
+        super().reserve(size)
+        indexes = self._indexes
+        if len(indexes) < len(self._values):
+            indexes.frombytes(
+                b"\xff" * ((len(self._values) - len(indexes)) * indexes.itemsize)
+            )
+
+    def __getitem__(self, key: int) -> Tuple[int, int]:
+        value = self._get(key)
+        if isinstance(value, tuple):
+            return value
+        return value, self._indexes[key]
+
+    def __setitem__(self, key: int, value: Tuple[int, int]) -> None:
+        stmnum, idx = value
+        if not 0 <= idx < self._missing:
+            stmnum = self._missing  # does not fit: kept in the dict
+        slot = self._set(key, stmnum, value)
+        if slot >= 0:
+            self._indexes[slot] = idx
+
+
+def add_stream_rows(
+    offsets: XrefOffsets,
+    object_streams: XrefObjectStreams,
+    start: int,
+    size: int,
+    rows: Iterator[Tuple[int, int, int]],
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Add the rows of one cross-reference stream subsection, for the objects
+    that have no entry yet in either map (newer sections are read first).
+
+    Uncompressed generation 0 objects go to `offsets`, compressed ones to
+    `object_streams`, with the arrays indexed directly. The arrays grow as
+    the rows are read and by the rule of single keys, so that a huge
+    start or size (which the stream data need not back) is not allocated
+    up front; objects too far past their end go to the dicts.
+
+    :return: the other rows but the free ones, as (object number, type,
+        field 1, field 2)
+    """
+    end = start + size
+    values, stmnums, indexes = offsets._values, object_streams._values, object_streams._indexes
+    no_offset, no_stmnum = offsets._missing, object_streams._missing
+    covered, in_arrays = start, True  # the arrays hold the objects below covered
+    others = []
+    for num, (xref_type, field1, field2) in zip(range(start, end), rows):
+        if num >= covered and in_arrays:
+            covered = min(end, 2 * len(values) + MAX_GAP)
+            in_arrays = offsets._grow(num, covered) and object_streams._grow(num, covered)
+        if xref_type == 2 or (xref_type == 1 and field2 == 0):
+            if not in_arrays:
+                if num not in offsets and num not in object_streams:
+                    if xref_type == 1:
+                        offsets[num] = field1
+                    else:
+                        object_streams[num] = (field1, field2)
+                continue
+            if values[num] != no_offset or stmnums[num] != no_stmnum:
+                continue
+            if num in offsets._sparse or num in object_streams._sparse:
+                continue
+            if xref_type == 1:
+                if field1 < no_offset:
+                    values[num] = field1
+                    offsets._len += 1
+                else:
+                    offsets[num] = field1
+            elif field1 < no_stmnum and field2 < no_stmnum:
+                stmnums[num] = field1
+                indexes[num] = field2
+                object_streams._len += 1
+            else:
+                object_streams[num] = (field1, field2)
+        elif xref_type != 0:  # free objects (type 0) are skipped
+            others.append((num, xref_type, field1, field2))
+    return others
+
+
+def new_generation(
+    generation: int, items: Iterable[Tuple[int, int]] = ()
+) -> MutableMapping[int, int]:
+    """
+    The ``PdfReader.xref`` map of a generation: generation 0, which holds
+    almost every object, is array-backed; the others are plain dicts.
+    """
+    if generation == 0:
+        return XrefOffsets(items)
+    return dict(items)
+
+
+def add_table_entries(
+    xref: Dict[int, MutableMapping[int, int]],
+    free_entries: Dict[int, MutableMapping[int, bool]],
+    start: int,
+    entries: List[Tuple[Any, Any, bytes]],
+) -> None:
+    """
+    Add the (offset, generation, "f" or "n") entries of one classic xref
+    subsection, but for the objects that already have an entry in their
+    generation (newer sections are read first).
+
+    Each entry is also flagged free or in use in ``free_entries``, for its
+    generation and for generation 65535, when those maps exist.
+
+    The arrays are indexed directly when the subsection starts near enough
+    their end (see ``MAX_GAP``); the entries of a far one go to the dicts.
+    """
+    end = start + len(entries)
+    if 0 not in xref:
+        xref[0] = new_generation(0)
+        free_entries[0] = XrefFreeFlags()
+    offsets0 = cast(XrefOffsets, xref[0])
+    values0, no_offset = offsets0._values, offsets0._missing
+    # flags of generation 0 entries, set in the arrays directly
+    flags0 = [
+        cast(XrefFreeFlags, free_entries[g]) for g in (0, 65535) if g in free_entries
+    ]
+    in_arrays = all(m._grow(start, end) for m in (offsets0, *flags0))
+    for num, (offset, generation, entry_type_b) in enumerate(entries, start):
+        offset, generation = int(offset), int(generation)
+        if in_arrays and generation == 0 and 0 <= offset < no_offset:
+            # It really seems like we should allow the last
+            # xref table in the file to override previous
+            # ones. Since we read the file backwards, assume
+            # any existing key is already set correctly.
+            if values0[num] != no_offset or num in offsets0._sparse:
+                continue
+            values0[num] = offset
+            offsets0._len += 1
+            is_free = entry_type_b == b"f"
+            for flags in flags0:
+                if flags._values[num] == flags._missing:
+                    if flags._sparse.pop(num, None) is None:
+                        flags._len += 1
+                flags._values[num] = is_free
+            continue
+        offsets = xref.get(generation)
+        if offsets is None:
+            offsets = xref[generation] = new_generation(generation)
+            free_entries[generation] = XrefFreeFlags()
+            if generation == 65535:
+                if cast(XrefFreeFlags, free_entries[generation])._grow(start, end):
+                    flags0.append(cast(XrefFreeFlags, free_entries[generation]))
+                else:
+                    in_arrays = False
+        if num in offsets:
+            continue
+        offsets[num] = offset
+        # the free entry maps may be missing when an xref stream
+        # created the generation (hybrid files)
+        is_free = entry_type_b == b"f"
+        flags = free_entries.get(generation)
+        if flags is not None:
+            flags[num] = is_free
+        flags = free_entries.get(65535)
+        if flags is not None:
+            flags[num] = is_free
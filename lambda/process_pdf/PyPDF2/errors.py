@@ -35,6 +35,12 @@ class PdfStreamError(PdfReadError):
     pass
 
 
+class LimitReachedError(PdfStreamError):
+    """Raised when decoding a stream would exceed the configured size."""
+
+    pass
+
+
 class ParseError(Exception):
     pass
 
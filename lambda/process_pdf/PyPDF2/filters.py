@@ -34,11 +34,13 @@ See TABLE H.1 Abbreviations for standard filter names
 __author__ = "Mathieu Fenniak"
 __author_email__ = "biziqe@mathieu.fenniak.net"
 
+import binascii
 import math
 import struct
 import zlib
 from io import BytesIO
-from typing import Any, Dict, Optional, Tuple, Union, cast
+from itertools import accumulate
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union, cast
 
 from .generic import ArrayObject, DictionaryObject, IndirectObject, NameObject
 
@@ -49,7 +51,7 @@ except ImportError:
     # For older Python versions, the backport typing_extensions is necessary:
     from typing_extensions import Literal  # type: ignore[misc]
 
-from ._utils import b_, deprecate_with_replacement, ord_, paeth_predictor
+from ._utils import b_, deprecate_with_replacement, logger_warning
 from .constants import CcittFaxDecodeParameters as CCITT
 from .constants import ColorSpaces
 from .constants import FilterTypeAbbreviations as FTA
@@ -58,21 +60,112 @@ from .constants import GraphicsStateParameters as G
 from .constants import ImageAttributes as IA
 from .constants import LzwFilterParameters as LZW
 from .constants import StreamAttributes as SA
-from .errors import PdfReadError, PdfStreamError
+from .errors import LimitReachedError, PdfReadError, PdfStreamError
 
 
-def decompress(data: bytes) -> bytes:
+#: most bytes recovered from a damaged Flate stream
+FLATE_RECOVERY_MAX_BYTES = 256 * 1024 * 1024
+#: input fed at once to the recovering decompressor, before narrowing down
+FLATE_RECOVERY_CHUNK = 64 * 1024
+#: largest piece of output produced at once by the incremental decoders
+OUTPUT_CHUNK_SIZE = 1024 * 1024
+
+
+def decompress(data: bytes, max_recovered: Optional[int] = None) -> bytes:
+    """
+    Inflate `data`; if it is damaged, return what can be decoded before the
+    damage.
+
+    :param max_recovered: most bytes to return from a damaged stream.
+        Defaults to ``FLATE_RECOVERY_MAX_BYTES``
+    """
     try:
         return zlib.decompress(data)
     except zlib.error:
-        d = zlib.decompressobj(zlib.MAX_WBITS | 32)
-        result_str = b""
-        for b in [data[i : i + 1] for i in range(len(data))]:
+        if max_recovered is None:
+            max_recovered = FLATE_RECOVERY_MAX_BYTES
+        return _decompress_prefix(data, max_recovered)
+
+
+def _decompress_prefix(data: bytes, max_recovered: int) -> bytes:
+    """The output of a decompressor fed until the first byte it rejects."""
+    output = bytearray()
+    for piece in _inflate((data,)):
+        output += piece
+        if len(output) > max_recovered:
+            logger_warning(
+                f"Damaged Flate stream: recovery stopped after {max_recovered} bytes",
+                __name__,
+            )
+            del output[max_recovered:]
+            break
+    return bytes(output)
+
+
+def _inflate(
+    chunks: Iterable[bytes], max_recovered: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Inflate `chunks` incrementally, in pieces of at most OUTPUT_CHUNK_SIZE
+    bytes, up to the end of the stream or the first byte rejected.
+
+    The data goes in large chunks; when one is rejected, the decompressor is
+    restored to its state before the chunk and the chunk is fed again in
+    smaller pieces, down to single bytes around the damage. Output already
+    yielded for the rejected chunk is not repeated.
+
+    :param max_recovered: once a byte has been rejected, the output stops
+        at this many bytes in all. Defaults to ``FLATE_RECOVERY_MAX_BYTES``
+    """
+    d = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    skip = 0  # bytes yielded before the decompressor was restored
+    total = 0  # bytes yielded
+    limit: Optional[int] = None  # most bytes to yield, once damage is found
+    for data in chunks:
+        view = memoryview(data)
+        pos = 0
+        step = FLATE_RECOVERY_CHUNK
+        while pos < len(view):
+            if d.eof:
+                return
+            chunk = view[pos : pos + step]
+            saved = d.copy()
+            produced = 0
             try:
-                result_str += d.decompress(b)
+                tail: Any = chunk
+                while tail:
+                    piece = d.decompress(tail, OUTPUT_CHUNK_SIZE)
+                    tail = d.unconsumed_tail
+                    produced += len(piece)
+                    if skip:
+                        dropped = min(skip, len(piece))
+                        piece = piece[dropped:]
+                        skip -= dropped
+                    if limit is not None and total + len(piece) > limit:
+                        piece = piece[: limit - total]
+                        logger_warning(
+                            f"Damaged Flate stream: recovery stopped after {limit} bytes",
+                            __name__,
+                        )
+                        if piece:
+                            yield piece
+                        return
+                    if piece:
+                        total += len(piece)
+                        yield piece
             except zlib.error:
-                pass
-        return result_str
+                if step == 1:
+                    # everything after a rejected byte is rejected as well
+                    return
+                if limit is None:
+                    limit = (
+                        FLATE_RECOVERY_MAX_BYTES if max_recovered is None else max_recovered
+                    )
+                d = saved
+                skip = produced
+                step = max(step // 16, 1)
+                continue
+            pos += len(chunk)
 
 
 class FlateDecode:
@@ -96,6 +189,48 @@ class FlateDecode:
             deprecate_with_replacement("decodeParms", "parameters", "4.0.0")
             decode_parms = kwargs["decodeParms"]
         str_data = decompress(data)
+        png_parameters = FlateDecode._png_parameters(decode_parms)
+        if png_parameters is not None:
+            str_data = FlateDecode._decode_png_prediction(str_data, *png_parameters)
+        return str_data
+
+    @staticmethod
+    def decode_chunks(
+        chunks: Iterable[bytes],
+        decode_parms: Union[None, ArrayObject, DictionaryObject] = None,
+    ) -> Iterator[bytes]:
+        """
+        Incremental version of :meth:`decode`: inflate `chunks` and undo the
+        predictor as the data comes, one batch of rows at a time.
+        """
+        png_parameters = FlateDecode._png_parameters(decode_parms)
+        if png_parameters is None:
+            yield from _inflate(chunks)
+            return
+        columns, rowlength, bpp = png_parameters
+        pending = b""
+        prev: Optional[bytes] = None
+        for chunk in _inflate(chunks):
+            pending += chunk
+            size = len(pending) - len(pending) % rowlength
+            if size:
+                rows = FlateDecode._decode_png_prediction(
+                    pending[:size], columns, rowlength, bpp, prev
+                )
+                prev = rows[len(rows) - (rowlength - 1) :]
+                pending = pending[size:]
+                yield rows
+        if pending:
+            raise PdfReadError("Image data is not rectangular")
+
+    @staticmethod
+    def _png_parameters(
+        decode_parms: Union[None, ArrayObject, DictionaryObject]
+    ) -> Optional[Tuple[int, int, int]]:
+        """
+        :return: (columns, row length, bytes per pixel) of the PNG predictor,
+            or None without predictor.
+        """
         predictor = 1
 
         if decode_parms:
@@ -109,86 +244,214 @@ class FlateDecode:
             except (AttributeError, TypeError):  # Type Error is NullObject
                 pass  # Usually an array with a null object was read
         # predictor 1 == no predictor
-        if predictor != 1:
-            # The /Columns param. has 1 as the default value; see ISO 32000,
-            # §7.4.4.3 LZWDecode and FlateDecode Parameters, Table 8
-            DEFAULT_BITS_PER_COMPONENT = 8
-            if isinstance(decode_parms, ArrayObject):
-                columns = 1
-                bits_per_component = DEFAULT_BITS_PER_COMPONENT
-                for decode_parm in decode_parms:
-                    if "/Columns" in decode_parm:
-                        columns = decode_parm["/Columns"]
-                    if LZW.BITS_PER_COMPONENT in decode_parm:
-                        bits_per_component = decode_parm[LZW.BITS_PER_COMPONENT]
-            else:
-                columns = (
-                    1 if decode_parms is None else decode_parms.get(LZW.COLUMNS, 1)
-                )
-                bits_per_component = (
-                    decode_parms.get(LZW.BITS_PER_COMPONENT, DEFAULT_BITS_PER_COMPONENT)
-                    if decode_parms
-                    else DEFAULT_BITS_PER_COMPONENT
-                )
-
-            # PNG predictor can vary by row and so is the lead byte on each row
-            rowlength = (
-                math.ceil(columns * bits_per_component / 8) + 1
-            )  # number of bytes
-
-            # PNG prediction:
-            if 10 <= predictor <= 15:
-                str_data = FlateDecode._decode_png_prediction(str_data, columns, rowlength)  # type: ignore
-            else:
-                # unsupported predictor
-                raise PdfReadError(f"Unsupported flatedecode predictor {predictor!r}")
-        return str_data
+        if predictor == 1:
+            return None
+        # The /Columns param. has 1 as the default value; see ISO 32000,
+        # §7.4.4.3 LZWDecode and FlateDecode Parameters, Table 8
+        DEFAULT_BITS_PER_COMPONENT = 8
+        if isinstance(decode_parms, ArrayObject):
+            columns = 1
+            colors = 1
+            bits_per_component = DEFAULT_BITS_PER_COMPONENT
+            for decode_parm in decode_parms:
+                if "/Columns" in decode_parm:
+                    columns = decode_parm["/Columns"]
+                if LZW.COLORS in decode_parm:
+                    colors = decode_parm[LZW.COLORS]
+                if LZW.BITS_PER_COMPONENT in decode_parm:
+                    bits_per_component = decode_parm[LZW.BITS_PER_COMPONENT]
+        else:
+            columns = 1 if decode_parms is None else decode_parms.get(LZW.COLUMNS, 1)
+            colors = 1 if decode_parms is None else decode_parms.get(LZW.COLORS, 1)
+            bits_per_component = (
+                decode_parms.get(LZW.BITS_PER_COMPONENT, DEFAULT_BITS_PER_COMPONENT)
+                if decode_parms
+                else DEFAULT_BITS_PER_COMPONENT
+            )
+
+        # PNG predictor can vary by row and so is the lead byte on each row
+        bits_per_pixel = colors * bits_per_component
+        rowlength = math.ceil(columns * bits_per_pixel / 8) + 1  # number of bytes
+        # the predictors work on the corresponding byte of the previous
+        # pixel; below a byte per pixel, on the previous byte
+        bpp = max(math.ceil(bits_per_pixel / 8), 1)
+
+        # PNG prediction:
+        if not 10 <= predictor <= 15:
+            # unsupported predictor
+            raise PdfReadError(f"Unsupported flatedecode predictor {predictor!r}")
+        return columns, rowlength, bpp
 
     @staticmethod
-    def _decode_png_prediction(data: str, columns: int, rowlength: int) -> bytes:
-        output = BytesIO()
+    def _decode_png_prediction(
+        data: bytes,
+        columns: int,
+        rowlength: int,
+        bpp: int = 1,
+        prev: Optional[bytes] = None,
+    ) -> bytes:
         # PNG prediction can vary from row to row
         if len(data) % rowlength != 0:
             raise PdfReadError("Image data is not rectangular")
-        prev_rowdata = (0,) * rowlength
-        for row in range(len(data) // rowlength):
-            rowdata = [
-                ord_(x) for x in data[(row * rowlength) : ((row + 1) * rowlength)]
-            ]
-            filter_byte = rowdata[0]
-
-            if filter_byte == 0:
-                pass
-            elif filter_byte == 1:
-                for i in range(2, rowlength):
-                    rowdata[i] = (rowdata[i] + rowdata[i - 1]) % 256
-            elif filter_byte == 2:
-                for i in range(1, rowlength):
-                    rowdata[i] = (rowdata[i] + prev_rowdata[i]) % 256
-            elif filter_byte == 3:
-                for i in range(1, rowlength):
-                    left = rowdata[i - 1] if i > 1 else 0
-                    floor = math.floor(left + prev_rowdata[i]) / 2
-                    rowdata[i] = (rowdata[i] + int(floor)) % 256
-            elif filter_byte == 4:
-                for i in range(1, rowlength):
-                    left = rowdata[i - 1] if i > 1 else 0
-                    up = prev_rowdata[i]
-                    up_left = prev_rowdata[i - 1] if i > 1 else 0
-                    paeth = paeth_predictor(left, up, up_left)
-                    rowdata[i] = (rowdata[i] + paeth) % 256
-            else:
-                # unsupported PNG filter
-                raise PdfReadError(f"Unsupported PNG filter {filter_byte!r}")
-            prev_rowdata = tuple(rowdata)
-            output.write(bytearray(rowdata[1:]))
-        return output.getvalue()
+        if len(data) >= PNG_NUMPY_THRESHOLD:
+            np = _numpy()
+            if np is not None:
+                return _png_unpredict_numpy(np, data, rowlength, bpp, prev)
+        return _png_unpredict(data, rowlength, bpp, prev)
 
     @staticmethod
     def encode(data: bytes) -> bytes:
         return zlib.compress(data)
 
 
+_HEX_IGNORED = b" \t\n\r\x0b\x0c\x00"  # bytes.isspace() and NUL
+_NOT_ASCII85 = bytes(c for c in range(256) if not (33 <= c <= 117 or c == ord("z")))
+_ASCII85_DIGITS = bytes((c - 33) % 256 for c in range(256))
+
+#: predictor data from this size on is decoded with NumPy, when installed
+PNG_NUMPY_THRESHOLD = 16 * 1024
+
+_LOW_BYTE = (255).__and__
+_np: Any = None  # the numpy module once imported, False if unavailable
+
+
+def _numpy() -> Any:
+    """Import numpy on first use; None if it is not installed."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+
+            _np = numpy
+        except ImportError:
+            _np = False
+    return _np or None
+
+
+def _png_unpredict(
+    data: bytes, rowlength: int, bpp: int, prev: Optional[bytes] = None
+) -> bytes:
+    """
+    Undo the PNG predictors, one row at a time.
+
+    :param data: rows of `rowlength` bytes, each starting with its filter type
+    :param bpp: distance in bytes to the corresponding byte on the left
+    :param prev: the decoded row above the first one, if any
+    """
+    width = rowlength - 1
+    output = bytearray(len(data) // rowlength * width)
+    # lane masks for adding two rows bytewise as integers (Up)
+    low_bits = int.from_bytes(b"\x7f" * width, "big")
+    high_bits = int.from_bytes(b"\x80" * width, "big")
+    if prev is None:
+        prev = bytes(width)
+    for out, start in enumerate(range(0, len(data), rowlength)):
+        filter_byte = data[start]
+        row: Any = data[start + 1 : start + rowlength]
+        if filter_byte == 0:
+            pass
+        elif filter_byte == 1:
+            row = bytearray(row)
+            for lane in range(bpp):
+                row[lane::bpp] = bytes(map(_LOW_BYTE, accumulate(row[lane::bpp])))
+        elif filter_byte == 2:
+            x = int.from_bytes(row, "big")
+            y = int.from_bytes(prev, "big")
+            row = (((x & low_bits) + (y & low_bits)) ^ ((x ^ y) & high_bits)).to_bytes(
+                width, "big"
+            )
+        elif filter_byte == 3:
+            row = _png_average(row, prev, bpp)
+        elif filter_byte == 4:
+            row = _png_paeth(row, prev, bpp)
+        else:
+            # unsupported PNG filter
+            raise PdfReadError(f"Unsupported PNG filter {filter_byte!r}")
+        output[out * width : (out + 1) * width] = row
+        prev = row
+    return bytes(output)
+
+
+def _png_average(row: bytes, prev: bytes, bpp: int) -> bytearray:
+    cur = bytearray(row)
+    first = min(bpp, len(cur))
+    for i in range(first):
+        cur[i] = (cur[i] + (prev[i] >> 1)) & 255
+    for i in range(first, len(cur)):
+        cur[i] = (cur[i] + ((cur[i - bpp] + prev[i]) >> 1)) & 255
+    return cur
+
+
+def _png_paeth(row: bytes, prev: bytes, bpp: int) -> bytearray:
+    cur = bytearray(row)
+    first = min(bpp, len(cur))
+    # no left neighbour: the predictor is the byte above
+    for i in range(first):
+        cur[i] = (cur[i] + prev[i]) & 255
+    for i in range(first, len(cur)):
+        left = cur[i - bpp]
+        up = prev[i]
+        up_left = prev[i - bpp]
+        # paeth_predictor, inlined
+        dist_left = abs(up - up_left)
+        dist_up = abs(left - up_left)
+        dist_up_left = abs(left + up - 2 * up_left)
+        if dist_left <= dist_up and dist_left <= dist_up_left:
+            cur[i] = (cur[i] + left) & 255
+        elif dist_up <= dist_up_left:
+            cur[i] = (cur[i] + up) & 255
+        else:
+            cur[i] = (cur[i] + up_left) & 255
+    return cur
+
+
+def _png_unpredict_numpy(
+    np: Any, data: bytes, rowlength: int, bpp: int, prev: Optional[bytes] = None
+) -> bytes:
+    """
+    Same as :func:`_png_unpredict`. Sub rows are decoded all at once and runs
+    of Up rows with one cumulative sum; Average and Paeth depend on the byte
+    just decoded on their left and still go byte by byte.
+    """
+    rows = np.frombuffer(data, dtype=np.uint8).reshape(-1, rowlength)
+    filters = rows[:, 0]
+    unsupported = np.flatnonzero(filters > 4)
+    if len(unsupported):
+        filter_byte = int(filters[unsupported[0]])
+        raise PdfReadError(f"Unsupported PNG filter {filter_byte!r}")
+    output = rows[:, 1:].copy()
+    if output.size == 0:
+        return b""
+
+    sub = filters == 1
+    if sub.any():
+        for lane in range(bpp):
+            output[sub, lane::bpp] = np.cumsum(
+                output[sub, lane::bpp], axis=1, dtype=np.uint8
+            )
+
+    # rows of the same filter type are handled together
+    starts = np.flatnonzero(filters[1:] != filters[:-1]) + 1
+    bounds = zip([0, *starts.tolist()], [*starts.tolist(), len(filters)])
+    if prev is None:
+        prev = np.zeros(rowlength - 1, dtype=np.uint8)
+    else:
+        prev = np.frombuffer(prev, dtype=np.uint8)
+    for start, end in bounds:
+        filter_byte = filters[start]
+        if filter_byte == 2:
+            output[start] += prev
+            output[start:end] = np.cumsum(output[start:end], axis=0, dtype=np.uint8)
+        elif filter_byte in (3, 4):
+            unpredict_row = _png_average if filter_byte == 3 else _png_paeth
+            prev_row = prev.tobytes()
+            for i in range(start, end):
+                prev_row = unpredict_row(output[i].tobytes(), prev_row, bpp)
+                output[i] = np.frombuffer(prev_row, dtype=np.uint8)
+        prev = output[end - 1]
+    return output.tobytes()
+
+
 class ASCIIHexDecode:
     """
     The ASCIIHexDecode filter decodes data that has been encoded in ASCII
@@ -197,41 +460,31 @@ class ASCIIHexDecode:
 
     @staticmethod
     def decode(
-        data: str,
+        data: Union[str, bytes],
         decode_parms: Union[None, ArrayObject, DictionaryObject] = None,  # noqa: F841
         **kwargs: Any,
-    ) -> str:
+    ) -> bytes:
         """
-        :param data: a str sequence of hexadecimal-encoded values to be
-            converted into a base-7 ASCII string
+        :param data: hexadecimal digits, possibly separated by white-space and
+            terminated by ``>``
         :param decode_parms:
-        :return: a string conversion in base-7 ASCII, where each of its values
-            v is such that 0 <= ord(v) <= 127.
+        :return: the decoded bytes. An odd final digit is followed by an
+            implicit 0, as the specification requires.
 
-        :raises PdfStreamError:
+        :raises PdfStreamError: if the ``>`` end marker is missing
         """
         if "decodeParms" in kwargs:  # pragma: no cover
             deprecate_with_replacement("decodeParms", "parameters", "4.0.0")
             decode_parms = kwargs["decodeParms"]  # noqa: F841
-        retval = ""
-        hex_pair = ""
-        index = 0
-        while True:
-            if index >= len(data):
-                raise PdfStreamError("Unexpected EOD in ASCIIHexDecode")
-            char = data[index]
-            if char == ">":
-                break
-            elif char.isspace():
-                index += 1
-                continue
-            hex_pair += char
-            if len(hex_pair) == 2:
-                retval += chr(int(hex_pair, base=16))
-                hex_pair = ""
-            index += 1
-        assert hex_pair == ""
-        return retval
+        if isinstance(data, str):
+            data = data.encode("latin-1")
+        end = data.find(b">")
+        if end < 0:
+            raise PdfStreamError("Unexpected EOD in ASCIIHexDecode")
+        digits = data[:end].translate(None, _HEX_IGNORED)
+        if len(digits) % 2:
+            digits += b"0"
+        return binascii.unhexlify(digits)
 
 
 class LZWDecode:
@@ -240,42 +493,36 @@ class LZWDecode:
     """
 
     class Decoder:
-        def __init__(self, data: bytes) -> None:
+        def __init__(self, data: bytes, early_change: int = 1) -> None:
             self.STOP = 257
             self.CLEARDICT = 256
             self.data = data
+            self.early_change = early_change
             self.bytepos = 0
-            self.bitpos = 0
-            self.dict = [""] * 4096
-            for i in range(256):
-                self.dict[i] = chr(i)
+            self.bitbuf = 0  # bits read from data but not consumed yet
+            self.bitcount = 0
+            self.dict = [bytes((i,)) for i in range(256)]
             self.reset_dict()
 
         def reset_dict(self) -> None:
+            del self.dict[256:]
+            self.dict += (b"", b"")  # CLEARDICT and STOP
             self.dictlen = 258
             self.bitspercode = 9
 
         def next_code(self) -> int:
-            fillbits = self.bitspercode
-            value = 0
-            while fillbits > 0:
+            while self.bitcount < self.bitspercode:
                 if self.bytepos >= len(self.data):
                     return -1
-                nextbits = ord_(self.data[self.bytepos])
-                bitsfromhere = 8 - self.bitpos
-                bitsfromhere = min(bitsfromhere, fillbits)
-                value |= (
-                    (nextbits >> (8 - self.bitpos - bitsfromhere))
-                    & (0xFF >> (8 - bitsfromhere))
-                ) << (fillbits - bitsfromhere)
-                fillbits -= bitsfromhere
-                self.bitpos += bitsfromhere
-                if self.bitpos >= 8:
-                    self.bitpos = 0
-                    self.bytepos = self.bytepos + 1
+                self.bitbuf = self.bitbuf << 8 | self.data[self.bytepos]
+                self.bytepos += 1
+                self.bitcount += 8
+            self.bitcount -= self.bitspercode
+            value = self.bitbuf >> self.bitcount
+            self.bitbuf &= (1 << self.bitcount) - 1
             return value
 
-        def decode(self) -> str:
+        def decode(self) -> bytes:
             """
             TIFF 6.0 specification explains in sufficient details the steps to
             implement the LZW encode() and decode() algorithms.
@@ -286,52 +533,101 @@ class LZWDecode:
 
             :raises PdfReadError: If the stop code is missing
             """
-            cW = self.CLEARDICT
-            baos = ""
+            return b"".join(self.iter_decode())
+
+        def iter_decode(self) -> Iterator[bytes]:
+            """:meth:`decode`, in pieces of about OUTPUT_CHUNK_SIZE bytes."""
+            CLEARDICT, STOP = self.CLEARDICT, self.STOP
+            cW = CLEARDICT
+            baos = bytearray()
+            table = self.dict
+            data = self.data
+            # the decoder state is kept in locals; next_code, inlined
+            bytepos, bitbuf, bitcount = self.bytepos, self.bitbuf, self.bitcount
+            dictlen, bitspercode = self.dictlen, self.bitspercode
+            next_width = (1 << bitspercode) - self.early_change
             while True:
                 pW = cW
-                cW = self.next_code()
-                if cW == -1:
-                    raise PdfReadError("Missed the stop code in LZWDecode!")
-                if cW == self.STOP:
+                while bitcount < bitspercode:
+                    if bytepos >= len(data):
+                        raise PdfReadError("Missed the stop code in LZWDecode!")
+                    bitbuf = bitbuf << 8 | data[bytepos]
+                    bytepos += 1
+                    bitcount += 8
+                bitcount -= bitspercode
+                cW = bitbuf >> bitcount
+                bitbuf &= (1 << bitcount) - 1
+                if cW == STOP:
                     break
-                elif cW == self.CLEARDICT:
+                elif cW == CLEARDICT:
                     self.reset_dict()
-                elif pW == self.CLEARDICT:
-                    baos += self.dict[cW]
+                    dictlen, bitspercode = self.dictlen, self.bitspercode
+                    next_width = (1 << bitspercode) - self.early_change
+                elif pW == CLEARDICT:
+                    baos += table[cW]
                 else:
-                    if cW < self.dictlen:
-                        baos += self.dict[cW]
-                        p = self.dict[pW] + self.dict[cW][0]
-                        self.dict[self.dictlen] = p
-                        self.dictlen += 1
+                    if cW < dictlen:
+                        entry = table[cW]
+                        p = table[pW] + entry[:1]
                     else:
-                        p = self.dict[pW] + self.dict[pW][0]
-                        baos += p
-                        self.dict[self.dictlen] = p
-                        self.dictlen += 1
-                    if (
-                        self.dictlen >= (1 << self.bitspercode) - 1
-                        and self.bitspercode < 12
-                    ):
-                        self.bitspercode += 1
-            return baos
+                        p = entry = table[pW] + table[pW][:1]
+                    baos += entry
+                    if len(baos) >= OUTPUT_CHUNK_SIZE:
+                        yield bytes(baos)
+                        baos.clear()
+                    if dictlen < 4096:
+                        table.append(p)
+                        dictlen += 1
+                        if dictlen >= next_width and bitspercode < 12:
+                            bitspercode += 1
+                            next_width = (1 << bitspercode) - self.early_change
+            self.bytepos, self.bitbuf, self.bitcount = bytepos, bitbuf, bitcount
+            self.dictlen, self.bitspercode = dictlen, bitspercode
+            yield bytes(baos)
 
     @staticmethod
     def decode(
         data: bytes,
         decode_parms: Union[None, ArrayObject, DictionaryObject] = None,
         **kwargs: Any,
-    ) -> str:
+    ) -> bytes:
         """
         :param data: ``bytes`` or ``str`` text to decode.
-        :param decode_parms: a dictionary of parameter values.
+        :param decode_parms: a dictionary of parameter values, understanding
+            the "/EarlyChange":<int> key only
         :return: decoded data.
         """
         if "decodeParms" in kwargs:  # pragma: no cover
             deprecate_with_replacement("decodeParms", "parameters", "4.0.0")
-            decode_parms = kwargs["decodeParms"]  # noqa: F841
-        return LZWDecode.Decoder(data).decode()
+            decode_parms = kwargs["decodeParms"]
+        if isinstance(data, str):
+            data = data.encode("latin-1")
+        return LZWDecode.Decoder(data, LZWDecode._early_change(decode_parms)).decode()
+
+    @staticmethod
+    def decode_chunks(
+        chunks: Iterable[bytes],
+        decode_parms: Union[None, ArrayObject, DictionaryObject] = None,
+    ) -> Iterator[bytes]:
+        """Incremental version of :meth:`decode`, for the decoded side."""
+        early_change = LZWDecode._early_change(decode_parms)
+        yield from LZWDecode.Decoder(b"".join(chunks), early_change).iter_decode()
+
+    @staticmethod
+    def _early_change(
+        decode_parms: Union[None, ArrayObject, DictionaryObject]
+    ) -> int:
+        early_change = 1
+        try:
+            if isinstance(decode_parms, ArrayObject):
+                for decode_parm in decode_parms:
+                    if LZW.EARLY_CHANGE in decode_parm:
+                        early_change = decode_parm[LZW.EARLY_CHANGE]
+            elif decode_parms:
+                early_change = decode_parms.get(LZW.EARLY_CHANGE, 1)
+        except (AttributeError, TypeError):  # Type Error is NullObject
+            pass
+        return early_change
 
 
 class ASCII85Decode:
@@ -348,25 +644,34 @@ class ASCII85Decode:
             decode_parms = kwargs["decodeParms"]  # noqa: F841
         if isinstance(data, str):
             data = data.encode("ascii")
-        group_index = b = 0
-        out = bytearray()
-        for char in data:
-            if ord("!") <= char and char <= ord("u"):
-                group_index += 1
-                b = b * 85 + (char - 33)
-                if group_index == 5:
-                    out += struct.pack(b">L", b)
-                    group_index = b = 0
-            elif char == ord("z"):
-                assert group_index == 0
-                out += b"\0\0\0\0"
-            elif char == ord("~"):
-                if group_index:
-                    for _ in range(5 - group_index):
-                        b = b * 85 + 84
-                    out += struct.pack(b">L", b)[: group_index - 1]
-                break
-        return bytes(out)
+        end = data.find(b"~")
+        if end >= 0:
+            data = data[:end]
+        # characters outside of the encoding (white-space, ...) are ignored,
+        # "z" stands for a group of zeros; then every 5 digits are 4 bytes
+        data = data.translate(None, _NOT_ASCII85)
+        if b"z" in data and any(len(run) % 5 for run in data.split(b"z")[:-1]):
+            raise PdfStreamError("Invalid ASCII85 data: 'z' inside a group")
+        digits = data.replace(b"z", b"!!!!!").translate(_ASCII85_DIGITS)
+        tail = len(digits) % 5
+        if tail and end < 0:
+            # without the ~> end marker, a final partial group is dropped
+            digits, tail = digits[: len(digits) - tail], 0
+        elif tail:
+            # a final partial group is padded with the highest digit
+            digits += b"\x54" * (5 - tail)
+        groups = [digits[i::5] for i in range(5)]
+        try:
+            out = struct.pack(
+                f">{len(digits) // 5}L",
+                *[
+                    (((a * 85 + b) * 85 + c) * 85 + d) * 85 + e
+                    for a, b, c, d, e in zip(*groups)
+                ],
+            )
+        except struct.error as exc:
+            raise PdfStreamError("Invalid ASCII85 group") from exc
+        return out[: len(out) - 4 + tail - 1] if tail else out
 
 
 class DCTDecode:
@@ -511,43 +816,100 @@ class CCITTFaxDecode:
 
 
 def decode_stream_data(stream: Any) -> Union[str, bytes]:  # utils.StreamObject
+    # If there is not data to decode we should not try to decode the data.
+    if not stream._raw_data():
+        return stream._data
+    return b"".join(decode_stream_chunks(stream))
+
+
+def decode_stream_chunks(
+    stream: Any, max_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Decode the data of `stream` incrementally.
+
+    The filters are chained as generators: Flate (with its predictor) and LZW
+    produce their output in pieces as they go, the other filters decode all
+    of their input at once. The caller can stop iterating at any time.
+
+    :param max_size: most decoded bytes allowed. Defaults to the
+        ``max_decoded_size`` of the stream, set by the reader it comes from
+    :raises LimitReachedError: if the decoded data gets larger
+    """
     filters = stream.get(SA.FILTER, ())
     if isinstance(filters, IndirectObject):
         filters = cast(ArrayObject, filters.get_object())
     if len(filters) and not isinstance(filters[0], NameObject):
         # we have a single filter instance
         filters = (filters,)
-    data: bytes = stream._data
-    # If there is not data to decode we should not try to decode the data.
+    if max_size is None:
+        max_size = getattr(stream, "max_decoded_size", None)
+    data = stream._raw_data()
+    chunks: Iterable[bytes] = (data,)
     if data:
         for filter_type in filters:
-            if filter_type in (FT.FLATE_DECODE, FTA.FL):
-                data = FlateDecode.decode(data, stream.get(SA.DECODE_PARMS))
-            elif filter_type in (FT.ASCII_HEX_DECODE, FTA.AHx):
-                data = ASCIIHexDecode.decode(data)  # type: ignore
-            elif filter_type in (FT.LZW_DECODE, FTA.LZW):
-                data = LZWDecode.decode(data, stream.get(SA.DECODE_PARMS))  # type: ignore
-            elif filter_type in (FT.ASCII_85_DECODE, FTA.A85):
-                data = ASCII85Decode.decode(data)
-            elif filter_type == FT.DCT_DECODE:
-                data = DCTDecode.decode(data)
-            elif filter_type == "/JPXDecode":
-                data = JPXDecode.decode(data)
-            elif filter_type == FT.CCITT_FAX_DECODE:
-                height = stream.get(IA.HEIGHT, ())
-                data = CCITTFaxDecode.decode(data, stream.get(SA.DECODE_PARMS), height)
-            elif filter_type == "/Crypt":
-                decode_parms = stream.get(SA.DECODE_PARMS, {})
-                if "/Name" not in decode_parms and "/Type" not in decode_parms:
-                    pass
-                else:
-                    raise NotImplementedError(
-                        "/Crypt filter with /Name or /Type not supported yet"
-                    )
-            else:
-                # Unsupported filter
-                raise NotImplementedError(f"unsupported filter {filter_type}")
-    return data
+            # the output of every filter is counted, not only the last one:
+            # the filters which need all of their input join it first
+            chunks = _limited(_decode_chunks(filter_type, chunks, stream), max_size)
+    if not len(filters):
+        chunks = _limited(chunks, max_size)
+    yield from chunks
+
+
+def _limited(chunks: Iterable[bytes], max_size: Optional[int]) -> Iterator[bytes]:
+    """Pass `chunks` through, raising once they add up to over `max_size`."""
+    if max_size is None:
+        yield from chunks
+        return
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if size > max_size:
+            raise LimitReachedError(
+                f"Decoded stream data is larger than {max_size} bytes"
+            )
+        yield chunk
+
+
+def _decode_chunks(
+    filter_type: str, chunks: Iterable[bytes], stream: Any
+) -> Iterable[bytes]:
+    if filter_type in (FT.FLATE_DECODE, FTA.FL):
+        return FlateDecode.decode_chunks(chunks, stream.get(SA.DECODE_PARMS))
+    elif filter_type in (FT.ASCII_HEX_DECODE, FTA.AHx):
+        return _decode_all(ASCIIHexDecode.decode, chunks)
+    elif filter_type in (FT.LZW_DECODE, FTA.LZW):
+        return LZWDecode.decode_chunks(chunks, stream.get(SA.DECODE_PARMS))
+    elif filter_type in (FT.ASCII_85_DECODE, FTA.A85):
+        return _decode_all(ASCII85Decode.decode, chunks)
+    elif filter_type == FT.DCT_DECODE:
+        return _decode_all(DCTDecode.decode, chunks)
+    elif filter_type == "/JPXDecode":
+        return _decode_all(JPXDecode.decode, chunks)
+    elif filter_type == FT.CCITT_FAX_DECODE:
+        height = stream.get(IA.HEIGHT, ())
+        return _decode_all(
+            lambda data: CCITTFaxDecode.decode(
+                data, stream.get(SA.DECODE_PARMS), height
+            ),
+            chunks,
+        )
+    elif filter_type == "/Crypt":
+        decode_parms = stream.get(SA.DECODE_PARMS, {})
+        if "/Name" not in decode_parms and "/Type" not in decode_parms:
+            return chunks
+        else:
+            raise NotImplementedError(
+                "/Crypt filter with /Name or /Type not supported yet"
+            )
+    else:
+        # Unsupported filter
+        raise NotImplementedError(f"unsupported filter {filter_type}")
+
+
+def _decode_all(decode: Any, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Run a filter which needs all of its input at once."""
+    yield decode(b"".join(chunks))
 
 
 def decodeStreamData(stream: Any) -> Union[str, bytes]:  # pragma: no cover
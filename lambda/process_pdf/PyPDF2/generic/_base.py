@@ -32,7 +32,7 @@ import re
 from binascii import unhexlify
 from typing import Any, Callable, List, Optional, Tuple, Union, cast
 
-from .._codecs import _pdfdoc_encoding_rev
+from .._codecs import _pdfdoc_encoding_map
 from .._protocols import PdfObjectProtocol, PdfWriterProtocol
 from .._utils import (
     StreamType,
@@ -42,10 +42,10 @@ from .._utils import (
     hexencode,
     logger_warning,
     read_non_whitespace,
-    read_until_regex,
     str_,
 )
 from ..errors import STREAM_TRUNCATED_PREMATURELY, PdfReadError, PdfStreamError
+from ._lexer import TOKEN_WINDOW, Lexer
 
 __author__ = "Mathieu Fenniak"
 __author_email__ = "biziqe@mathieu.fenniak.net"
@@ -402,7 +402,12 @@ class NumberObject(int, PdfObject):
 
     @staticmethod
     def read_from_stream(stream: StreamType) -> Union["NumberObject", "FloatObject"]:
-        num = read_until_regex(stream, NumberObject.NumberPattern)
+        with Lexer(stream, window=TOKEN_WINDOW) as lexer:
+            return NumberObject._read(lexer)
+
+    @staticmethod
+    def _read(lexer: Lexer) -> Union["NumberObject", "FloatObject"]:
+        num = lexer.read_number()
         if num.find(b".") != -1:
             return FloatObject(num)
         return NumberObject(num)
@@ -602,10 +607,20 @@ class NameObject(str, PdfObject):
 
     @staticmethod
     def read_from_stream(stream: StreamType, pdf: Any) -> "NameObject":  # PdfReader
-        name = stream.read(1)
-        if name != NameObject.surfix:
-            raise PdfReadError("name read error")
-        name += read_until_regex(stream, NameObject.delimiter_pattern, ignore_eof=True)
+        with Lexer(stream, window=TOKEN_WINDOW) as lexer:
+            return NameObject._read(lexer, pdf)
+
+    @staticmethod
+    def _read(lexer: Lexer, pdf: Any) -> "NameObject":  # PdfReader
+        return NameObject._from_bytes(lexer.read_name(), pdf)
+
+    @staticmethod
+    def _from_bytes(name: bytes, pdf: Any) -> "NameObject":  # PdfReader
+        if b"#" not in name:
+            try:
+                return NameObject(name.decode("utf-8"))
+            except UnicodeDecodeError:
+                pass
         try:
             # Name objects should represent irregular characters
             # with a '#' followed by the symbol's hex number
@@ -637,12 +652,9 @@ class NameObject(str, PdfObject):
 
 
 def encode_pdfdocencoding(unicode_string: str) -> bytes:
-    retval = b""
-    for c in unicode_string:
-        try:
-            retval += b_(chr(_pdfdoc_encoding_rev[c]))
-        except KeyError:
-            raise UnicodeEncodeError(
-                "pdfdocencoding", c, -1, -1, "does not exist in translation table"
-            )
-    return retval
+    if "\ufffe" in unicode_string:  # what the undefined codes map to
+        i = unicode_string.index("\ufffe")
+        raise UnicodeEncodeError(
+            "pdfdocencoding", unicode_string, i, i + 1, "does not exist in translation table"
+        )
+    return codecs.charmap_encode(unicode_string, "strict", _pdfdoc_encoding_map)[0]
@@ -32,8 +32,9 @@ __author_email__ = "biziqe@mathieu.fenniak.net"
 import logging
 import re
 from io import BytesIO
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Union, cast
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast
 
+from .._buffer_stream import BufferStream
 from .._protocols import PdfWriterProtocol
 from .._utils import (
     WHITESPACES,
@@ -44,8 +45,6 @@ from .._utils import (
     hex_str,
     logger_warning,
     read_non_whitespace,
-    read_until_regex,
-    skip_over_comment,
 )
 from ..constants import (
     CheckboxRadioButtonAttributes,
@@ -68,7 +67,8 @@ from ._base import (
     TextStringObject,
 )
 from ._fit import Fit
-from ._utils import read_hex_string_from_stream, read_string_from_stream
+from ._lexer import CONTENT_TOKEN_RE, EOL_RE, SIMPLE_OBJECT_RE, SPACE_RE, Lexer
+from ._utils import create_string_object
 
 logger = logging.getLogger(__name__)
 NumberSigns = b"+-"
@@ -130,24 +130,29 @@ class ArrayObject(list, PdfObject):
         stream: StreamType,
         pdf: Any,
         forced_encoding: Union[None, str, List[str], Dict[int, str]] = None,
+    ) -> "ArrayObject":  # PdfReader
+        with Lexer(stream) as lexer:
+            return ArrayObject._read(lexer, pdf, forced_encoding)
+
+    @staticmethod
+    def _read(
+        lexer: Lexer,
+        pdf: Any,
+        forced_encoding: Union[None, str, List[str], Dict[int, str]] = None,
     ) -> "ArrayObject":  # PdfReader
         arr = ArrayObject()
-        tmp = stream.read(1)
+        tmp = lexer.read(1)
         if tmp != b"[":
             raise PdfReadError("Could not read array")
         while True:
             # skip leading whitespace
-            tok = stream.read(1)
-            while tok.isspace():
-                tok = stream.read(1)
-            stream.seek(-1, 1)
+            lexer.skip(SPACE_RE)
             # check for array ending
-            peekahead = stream.read(1)
-            if peekahead == b"]":
+            if lexer.peek(1) == b"]":
+                lexer.pos += 1
                 break
-            stream.seek(-1, 1)
             # read and append obj
-            arr.append(read_object(stream, pdf, forced_encoding))
+            arr.append(_read_object(lexer, pdf, forced_encoding))
         return arr
 
     @staticmethod
@@ -331,6 +336,15 @@ class DictionaryObject(dict, PdfObject):
         stream: StreamType,
         pdf: Any,  # PdfReader
         forced_encoding: Union[None, str, List[str], Dict[int, str]] = None,
+    ) -> "DictionaryObject":
+        with Lexer(stream) as lexer:
+            return DictionaryObject._read(lexer, pdf, forced_encoding)
+
+    @staticmethod
+    def _read(
+        lexer: Lexer,
+        pdf: Any,  # PdfReader
+        forced_encoding: Union[None, str, List[str], Dict[int, str]] = None,
     ) -> "DictionaryObject":
         def get_next_obj_pos(
             p: int, p1: int, rem_gens: List[int], pdf: Any
@@ -357,33 +371,31 @@ class DictionaryObject(dict, PdfObject):
             stream.seek(curr + p + 9)
             return rw[: p - 1]
 
-        tmp = stream.read(2)
+        tmp = lexer.read(2)
         if tmp != b"<<":
             raise PdfReadError(
-                f"Dictionary read error at byte {hex_str(stream.tell())}: "
+                f"Dictionary read error at byte {hex_str(lexer.tell())}: "
                 "stream must begin with '<<'"
             )
         data: Dict[Any, Any] = {}
         while True:
-            tok = read_non_whitespace(stream)
+            tok = lexer.read_non_whitespace()
             if tok == b"\x00":
                 continue
             elif tok == b"%":
-                stream.seek(-1, 1)
-                skip_over_comment(stream)
+                lexer.skip_comment()
                 continue
             if not tok:
                 raise PdfStreamError(STREAM_TRUNCATED_PREMATURELY)
 
             if tok == b">":
-                stream.read(1)
+                lexer.read(1)
                 break
-            stream.seek(-1, 1)
+            lexer.pos -= 1
             try:
-                key = read_object(stream, pdf)
-                tok = read_non_whitespace(stream)
-                stream.seek(-1, 1)
-                value = read_object(stream, pdf, forced_encoding)
+                key = _read_object(lexer, pdf)
+                lexer.skip()
+                value = _read_object(lexer, pdf, forced_encoding)
             except Exception as exc:
                 if pdf is not None and pdf.strict:
                     raise PdfReadError(exc.__repr__())
@@ -398,15 +410,16 @@ class DictionaryObject(dict, PdfObject):
                 # multiple definitions of key not permitted
                 msg = (
                     f"Multiple definitions in dictionary at byte "
-                    f"{hex_str(stream.tell())} for key {key}"
+                    f"{hex_str(lexer.tell())} for key {key}"
                 )
                 if pdf is not None and pdf.strict:
                     raise PdfReadError(msg)
                 logger_warning(msg, __name__)
 
-        pos = stream.tell()
-        s = read_non_whitespace(stream)
-        if s == b"s" and stream.read(5) == b"tream":
+        pos = lexer.pos
+        if lexer.read_non_whitespace() == b"s" and lexer.read(5) == b"tream":
+            # the stream data is read from the stream itself
+            stream = lexer.as_stream()
             eol = stream.read(1)
             # odd PDF file output has spaces after 'stream' keyword but before EOL.
             # patch provided by Danial Sandler
@@ -427,36 +440,52 @@ class DictionaryObject(dict, PdfObject):
                 length = pdf.get_object(length)
                 stream.seek(t, 0)
             pstart = stream.tell()
-            data["__streamdata__"] = stream.read(length)
-            e = read_non_whitespace(stream)
-            ndstream = stream.read(8)
-            if (e + ndstream) != b"endstream":
-                # (sigh) - the odd PDF file has a length that is too long, so
-                # we need to read backwards to find the "endstream" ending.
-                # ReportLab (unknown version) generates files with this bug,
-                # and Python users into PDF files tend to be our audience.
-                # we need to do this to correct the streamdata and chop off
-                # an extra character.
-                pos = stream.tell()
-                stream.seek(-10, 1)
-                end = stream.read(9)
-                if end == b"endstream":
-                    # we found it by looking back one character further.
-                    data["__streamdata__"] = data["__streamdata__"][:-1]
-                elif not pdf.strict:
+            source: Optional[Tuple[StreamType, int, int]] = None
+            if pdf is not None and stream is getattr(pdf, "stream", None):
+                # in a reader's file, only check for the end marker: the data
+                # is read on first use (StreamObject._data)
+                stream.seek(length, 1)
+                if read_non_whitespace(stream) + stream.read(8) == b"endstream":
+                    source = (stream, pstart, length)
+                else:
                     stream.seek(pstart, 0)
-                    data["__streamdata__"] = read_unsized_from_steam(stream, pdf)
+            if source is not None:
+                data["__streamdata__"] = None
+            else:
+                data["__streamdata__"] = stream.read(length)
+                e = read_non_whitespace(stream)
+                ndstream = stream.read(8)
+                if (e + ndstream) != b"endstream":
+                    # (sigh) - the odd PDF file has a length that is too long, so
+                    # we need to read backwards to find the "endstream" ending.
+                    # ReportLab (unknown version) generates files with this bug,
+                    # and Python users into PDF files tend to be our audience.
+                    # we need to do this to correct the streamdata and chop off
+                    # an extra character.
                     pos = stream.tell()
-                else:
-                    stream.seek(pos, 0)
-                    raise PdfReadError(
-                        "Unable to find 'endstream' marker after stream at byte "
-                        f"{hex_str(stream.tell())} (nd='{ndstream!r}', end='{end!r}')."
-                    )
+                    stream.seek(-10, 1)
+                    end = stream.read(9)
+                    if end == b"endstream":
+                        # we found it by looking back one character further.
+                        data["__streamdata__"] = data["__streamdata__"][:-1]
+                    elif not pdf.strict:
+                        stream.seek(pstart, 0)
+                        data["__streamdata__"] = read_unsized_from_steam(stream, pdf)
+                        pos = stream.tell()
+                    else:
+                        stream.seek(pos, 0)
+                        raise PdfReadError(
+                            "Unable to find 'endstream' marker after stream at byte "
+                            f"{hex_str(stream.tell())} (nd='{ndstream!r}', end='{end!r}')."
+                        )
+            lexer.resync(stream)
         else:
-            stream.seek(pos, 0)
+            lexer.pos = pos
         if "__streamdata__" in data:
-            return StreamObject.initialize_from_dictionary(data)
+            stream_obj = StreamObject.initialize_from_dictionary(data)
+            stream_obj._source = source
+            stream_obj.max_decoded_size = getattr(pdf, "max_decoded_stream_size", None)
+            return stream_obj
         else:
             retval = DictionaryObject()
             retval.update(data)
@@ -677,6 +706,11 @@ def _reset_node_tree_relationship(child_obj: Any) -> None:
 
 
 class StreamObject(DictionaryObject):
+    #: most bytes the data may decode to, see filters.decode_stream_chunks
+    max_decoded_size: Optional[int] = None
+    #: (stream, offset, length) of the data not read from the file yet
+    _source: Optional[Tuple[StreamType, int, int]] = None
+
     def __init__(self) -> None:
         self.__data: Optional[str] = None
         self.decoded_self: Optional["DecodedStreamObject"] = None
@@ -718,11 +752,29 @@ class StreamObject(DictionaryObject):
 
     @property
     def _data(self) -> Any:
+        if self._source is not None:
+            stream, offset, length = self._source
+            pos = stream.tell()
+            stream.seek(offset, 0)
+            self.__data = stream.read(length)
+            stream.seek(pos, 0)
+            self._source = None
         return self.__data
 
     @_data.setter
     def _data(self, value: Any) -> None:
         self.__data = value
+        self._source = None
+
+    def _raw_data(self) -> Any:
+        """
+        The data before decoding. While it is still in the file of a reader
+        reading from a buffer, a memoryview of the file rather than a copy.
+        """
+        if self._source is not None and isinstance(self._source[0], BufferStream):
+            stream, offset, length = self._source
+            return stream.getbuffer()[offset : offset + length]
+        return self._data
 
     def write_to_stream(
         self, stream: StreamType, encryption_key: Union[None, str, bytes]
@@ -844,6 +896,16 @@ class EncodedStreamObject(StreamObject):
 
 
 class ContentStream(DecodedStreamObject):
+    """
+    A content stream, as a list of ``(operands, operator)`` operations.
+
+    The stream (or each stream of a /Contents array) is only decoded and
+    parsed when the operations are needed: :meth:`iter_operations` parses
+    them as they are consumed, so a caller that stops early never decodes
+    or tokenizes the rest; :attr:`operations` parses them all into a list,
+    which then makes up the data of the stream.
+    """
+
     def __init__(
         self,
         stream: Any,
@@ -851,30 +913,45 @@ class ContentStream(DecodedStreamObject):
         forced_encoding: Union[None, str, List[str], Dict[int, str]] = None,
     ) -> None:
         self.pdf = pdf
+        self.forced_encoding = forced_encoding
 
         # The inner list has two elements:
         #  [0] : List
         #  [1] : str
-        self.operations: List[Tuple[Any, Any]] = []
+        self._operations: Optional[List[Tuple[Any, Any]]] = []
+        # stream objects or data still to parse, when _operations is None
+        self._parts: List[Union[bytes, StreamObject]] = []
 
         # stream may be a StreamObject or an ArrayObject containing
-        # multiple StreamObjects to be cat'd together.
+        # multiple StreamObjects, parsed one after the other.
         if stream is not None:
             stream = stream.get_object()
             if isinstance(stream, ArrayObject):
-                data = b""
-                for s in stream:
-                    data += b_(s.get_object().get_data())
-                    if len(data) == 0 or data[-1] != b"\n":
-                        data += b"\n"
-                stream_bytes = BytesIO(data)
+                self._parts = [s.get_object() for s in stream]
             else:
-                stream_data = stream.get_data()
-                assert stream_data is not None
-                stream_data_bytes = b_(stream_data)
-                stream_bytes = BytesIO(stream_data_bytes)
-            self.forced_encoding = forced_encoding
-            self.__parse_content_stream(stream_bytes)
+                self._parts = [stream]
+            self._operations = None
+
+    @property
+    def operations(self) -> List[Tuple[Any, Any]]:
+        if self._operations is None:
+            self._operations = list(self._parse_parts(self._parts))
+            self._parts = []
+        return self._operations
+
+    @operations.setter
+    def operations(self, operations: List[Tuple[Any, Any]]) -> None:
+        self._operations = operations
+        self._parts = []
+
+    def iter_operations(self) -> Iterator[Tuple[Any, Any]]:
+        """
+        Iterate over the operations, parsing them as they are consumed when
+        :attr:`operations` has not been built yet.
+        """
+        if self._operations is not None:
+            return iter(self._operations)
+        return self._parse_parts(self._parts)
 
     def clone(
         self,
@@ -912,35 +989,122 @@ class ContentStream(DecodedStreamObject):
         # super(DictionaryObject,self)._clone(src, pdf_dest, force_duplicate, ignore_fields)
         return
 
-    def __parse_content_stream(self, stream: StreamType) -> None:
-        stream.seek(0, 0)
-        operands: List[Union[int, str, PdfObject]] = []
+    def _parse_parts(
+        self, parts: List[Union[bytes, StreamObject]]
+    ) -> Iterator[Tuple[Any, Any]]:
+        # [position of the token being read, operands of the next operator,
+        # (index, position) of the first of them read from the current
+        # data]: operands may precede their operator in an earlier part
+        state: List[Any] = [0, [], None]
+        # data left to parse with the next piece: the end of a piece that
+        # may be the start of a token, or a token that could not be read
+        carry = b""
+        retry_at = 0
+        for part in parts:
+            for piece, ends_part in self._pieces(part):
+                data = carry + piece if carry else piece
+                hold = b""
+                if not ends_part:
+                    # a decoded chunk may end in the middle of a token or
+                    # of a comment: parse up to its last end of line
+                    cut = max(piece.rfind(b"\n"), piece.rfind(b"\r"))
+                    if cut < 0 or len(data) < retry_at:
+                        # no end of line yet, or less than twice the data
+                        # the last attempt failed on: read on
+                        carry = data
+                        continue
+                    cut += len(data) - len(piece)
+                    data, hold = data[: cut + 1], data[cut + 1 :]
+                try:
+                    yield from self._parse_content_stream(data, state)
+                except PdfReadError:
+                    carry = data[state[0] :] + hold
+                    retry_at = 2 * len(carry)
+                else:
+                    if not ends_part and state[2][0] < len(state[1]):
+                        # operands still waiting for their operator may
+                        # have been cut (a dictionary cut short is returned
+                        # as read so far): they are read again with the
+                        # data that follows
+                        index, start = state[2]
+                        del state[1][index:]
+                        carry = data[start:] + hold
+                        retry_at = 2 * len(carry)
+                    else:
+                        carry = hold
+                        retry_at = 0
+            if carry and not carry.endswith(b"\n"):
+                # a token was cut by the end of the part
+                carry += b"\n"
+        if carry:
+            # raises the error again
+            yield from self._parse_content_stream(carry, state)
+
+    @staticmethod
+    def _pieces(part: Union[bytes, StreamObject]) -> Iterator[Tuple[bytes, bool]]:
+        """
+        The data of a part as (data, ends the part) pieces: filtered streams
+        are decoded a chunk at a time, see :func:`decode_stream_chunks`.
+        """
+        if isinstance(part, bytes):
+            yield part, True
+        elif isinstance(part, EncodedStreamObject) and part.decoded_self is None:
+            from ..filters import decode_stream_chunks
+
+            for chunk in decode_stream_chunks(part):
+                yield bytes(chunk), False
+            yield b"", True
+        else:
+            yield b_(part.get_data()), True
+
+    def _parse_content_stream(
+        self, data: bytes, state: List[Any]
+    ) -> Iterator[Tuple[Any, Any]]:
+        lexer = Lexer(data=data)
+        operands: List[Union[int, str, PdfObject]] = state[1]
+        state[2] = None
         while True:
-            peek = read_non_whitespace(stream)
-            if peek == b"" or peek == 0:
-                break
-            stream.seek(-1, 1)
-            if peek.isalpha() or peek in (b"'", b'"'):
-                operator = read_until_regex(stream, NameObject.delimiter_pattern, True)
+            state[0] = lexer.pos
+            if state[2] is None:
+                state[2] = len(operands), lexer.pos
+            # whitespace, then an operator or a simple operand in one match
+            m = cast("re.Match[bytes]", CONTENT_TOKEN_RE.match(data, lexer.pos))
+            kind = m.lastgroup
+            if kind == "op":
+                lexer.pos = m.end()
+                operator = m.group(kind)
                 if operator == b"BI":
                     # begin inline image - a completely different parsing
                     # mechanism is required, of course... thanks buddy...
                     assert operands == []
+                    stream = lexer.as_stream()
                     ii = self._read_inline_image(stream)
-                    self.operations.append((ii, b"INLINE IMAGE"))
+                    lexer.resync(stream)
+                    yield ii, b"INLINE IMAGE"
                 else:
-                    self.operations.append((operands, operator))
-                    operands = []
-            elif peek == b"%":
+                    yield operands, operator
+                    operands = state[1] = []
+                state[2] = None
+                continue
+            if kind is not None:
+                obj = _simple_object(m, None)
+                if obj is not None:
+                    lexer.pos = m.end()
+                    operands.append(obj)
+                    continue
+            lexer.pos = m.start(kind) if kind else m.end()
+            peek = data[lexer.pos : lexer.pos + 1]
+            if peek == b"":
+                break
+            if peek == b"%":
                 # If we encounter a comment in the content stream, we have to
                 # handle it here.  Typically, read_object will handle
                 # encountering a comment -- but read_object assumes that
                 # following the comment must be the object we're trying to
                 # read.  In this case, it could be an operator instead.
-                while peek not in (b"\r", b"\n"):
-                    peek = stream.read(1)
+                lexer.skip_comment()
             else:
-                operands.append(read_object(stream, None, self.forced_encoding))
+                operands.append(_read_object(lexer, None, self.forced_encoding))
 
     def _read_inline_image(self, stream: StreamType) -> Dict[str, Any]:
         # begin reading just after the "BI" - begin image
@@ -1024,7 +1188,8 @@ class ContentStream(DecodedStreamObject):
 
     @_data.setter
     def _data(self, value: Union[str, bytes]) -> None:
-        self.__parse_content_stream(BytesIO(b_(value)))
+        self._parts = [b_(value)]
+        self._operations = None
 
 
 def read_object(
@@ -1032,53 +1197,89 @@ def read_object(
     pdf: Any,  # PdfReader
     forced_encoding: Union[None, str, List[str], Dict[int, str]] = None,
 ) -> Union[PdfObject, int, str, ContentStream]:
-    tok = stream.read(1)
-    stream.seek(-1, 1)  # reset to start
+    with Lexer(stream) as lexer:
+        return _read_object(lexer, pdf, forced_encoding)
+
+
+def _simple_object(m: "re.Match[bytes]", pdf: Any) -> Optional[PdfObject]:
+    """Build the object matched by SIMPLE_OBJECT, or None to take the long way."""
+    kind = m.lastgroup
+    if kind == "num":
+        num = m.group(kind)
+        return FloatObject(num) if b"." in num else NumberObject(num)
+    if kind == "name":
+        return NameObject._from_bytes(m.group(kind), pdf)
+    # indirect references are only looked for in the next 20 bytes
+    if m.end() < m.start(kind) + 20:
+        return IndirectObject(int(m.group("id")), int(m.group("gen")), pdf)
+    return None
+
+
+def _read_object(
+    lexer: Lexer,
+    pdf: Any,  # PdfReader
+    forced_encoding: Union[None, str, List[str], Dict[int, str]] = None,
+) -> Union[PdfObject, int, str, ContentStream]:
+    buf, pos = lexer.buf, lexer.pos
+    if pos + 20 > len(buf) and not lexer.eof:
+        lexer.fill(20)
+        buf = lexer.buf
+    m = SIMPLE_OBJECT_RE.match(buf, pos)
+    if m is not None:
+        obj = _simple_object(m, pdf)
+        if obj is not None:
+            lexer.pos = m.end()
+            return obj
+    tok = buf[pos : pos + 1]
     if tok == b"/":
-        return NameObject.read_from_stream(stream, pdf)
+        return NameObject._read(lexer, pdf)
     elif tok == b"<":
         # hexadecimal string OR dictionary
-        peek = stream.read(2)
-        stream.seek(-2, 1)  # reset to start
-
-        if peek == b"<<":
-            return DictionaryObject.read_from_stream(stream, pdf, forced_encoding)
+        if lexer.peek(2) == b"<<":
+            return DictionaryObject._read(lexer, pdf, forced_encoding)
         else:
-            return read_hex_string_from_stream(stream, forced_encoding)
+            return create_string_object(lexer.read_hex_string(), forced_encoding)
     elif tok == b"[":
-        return ArrayObject.read_from_stream(stream, pdf, forced_encoding)
+        return ArrayObject._read(lexer, pdf, forced_encoding)
     elif tok == b"t" or tok == b"f":
-        return BooleanObject.read_from_stream(stream)
+        word = lexer.read(4)
+        if word == b"true":
+            return BooleanObject(True)
+        elif word == b"fals":
+            lexer.read(1)
+            return BooleanObject(False)
+        raise PdfReadError("Could not read Boolean object")
     elif tok == b"(":
-        return read_string_from_stream(stream, forced_encoding)
-    elif tok == b"e" and stream.read(6) == b"endobj":
-        stream.seek(-6, 1)
+        return create_string_object(lexer.read_literal_string(), forced_encoding)
+    elif tok == b"e" and lexer.peek(6) == b"endobj":
         return NullObject()
     elif tok == b"n":
-        return NullObject.read_from_stream(stream)
+        if lexer.read(4) != b"null":
+            raise PdfReadError("Could not read Null object")
+        return NullObject()
     elif tok == b"%":
         # comment
-        while tok not in (b"\r", b"\n"):
-            tok = stream.read(1)
+        m = lexer.search(EOL_RE)
+        if m is None:
             # Prevents an infinite loop by raising an error if the stream is at
             # the EOF
-            if len(tok) <= 0:
-                raise PdfStreamError("File ended unexpectedly.")
-        tok = read_non_whitespace(stream)
-        stream.seek(-1, 1)
-        return read_object(stream, pdf, forced_encoding)
+            raise PdfStreamError("File ended unexpectedly.")
+        lexer.pos = m.end()
+        lexer.skip()
+        return _read_object(lexer, pdf, forced_encoding)
+    elif not tok:
+        raise PdfStreamError(STREAM_TRUNCATED_PREMATURELY)
     elif tok in b"0123456789+-.":
-        # number object OR indirect reference
-        peek = stream.read(20)
-        stream.seek(-len(peek), 1)  # reset to start
-        if IndirectPattern.match(peek) is not None:
-            return IndirectObject.read_from_stream(stream, pdf)
+        # number object OR indirect reference (within the next 20 bytes)
+        m = IndirectPattern.match(buf, pos, pos + 20)
+        if m is not None:
+            lexer.pos = m.end() - 1  # up to the "R"
+            return IndirectObject(int(buf[pos : m.end(1)]), int(m.group(2)), pdf)
         else:
-            return NumberObject.read_from_stream(stream)
+            return NumberObject._read(lexer)
     else:
-        stream.seek(-20, 1)
         raise PdfReadError(
-            f"Invalid Elementary Object starting with {tok!r} @{stream.tell()}: {stream.read(80).__repr__()}"
+            f"Invalid Elementary Object starting with {tok!r} {lexer.context()}"
         )
 
 
@@ -0,0 +1,326 @@
+"""
+Buffer based tokenizer used by the object readers.
+
+The ``read_from_stream`` methods of the generic objects used to scan their
+input one ``stream.read(1)`` / ``stream.seek(-1, 1)`` at a time. They now
+read a window of the stream into a bytes buffer and scan it with an integer
+cursor and precompiled regular expressions; the stream is only repositioned
+once, when the outermost reader is done (:meth:`Lexer.sync`).
+"""
+
+import mmap
+import re
+from binascii import unhexlify
+from io import BytesIO
+from typing import Any, List, Optional, Pattern
+
+from .._buffer_stream import BufferStream
+from .._utils import StreamType, b_, logger_warning
+from ..errors import STREAM_TRUNCATED_PREMATURELY, PdfReadError, PdfStreamError
+
+#: same set as PyPDF2._utils.WHITESPACES
+WHITESPACE_RE = re.compile(rb"[ \n\r\t\x00]*")
+#: bytes.isspace() characters, used between array elements
+SPACE_RE = re.compile(rb"[ \t\n\r\x0b\x0c]*")
+#: the character class of NumberObject.NumberPattern
+NUMBER_RE = re.compile(rb"[+-.0-9]*")
+#: "/" and everything up to NameObject.delimiter_pattern
+NAME_RE = re.compile(rb"/[^\s()<>\[\]{}/%]*")
+#: content stream operators
+KEYWORD_RE = re.compile(rb"[^\s()<>\[\]{}/%]*")
+_DELIMITERS = rb"\s()<>\[\]{}/%"
+#: the objects which are complete in one match: an indirect reference, a
+#: number or a name, followed by a delimiter (without it, the token could go
+#: on past the buffer and the token readers above take over)
+SIMPLE_OBJECT = (
+    rb"(?P<ref>(?P<id>[+-]?\d+)\s+(?P<gen>\d+)\s+R)(?=[^a-zA-Z])"
+    rb"|(?P<num>[+-.0-9]+)(?=[^+-.0-9])"
+    rb"|(?P<name>/[^" + _DELIMITERS + rb"]*)(?=[" + _DELIMITERS + rb"])"
+)
+SIMPLE_OBJECT_RE = re.compile(SIMPLE_OBJECT)
+#: whitespace, then an operator or a simple object, in a content stream
+CONTENT_TOKEN_RE = re.compile(
+    rb"[ \n\r\t\x00]*(?:(?P<op>[A-Za-z'\"][^" + _DELIMITERS + rb"]*)|"
+    + SIMPLE_OBJECT
+    + rb")?"
+)
+#: characters which need attention in a literal string
+STRING_SPECIAL_RE = re.compile(rb"[()\\]")
+EOL_RE = re.compile(rb"[\r\n]")
+
+STRING_ESCAPES = {
+    b"n": b"\n",
+    b"r": b"\r",
+    b"t": b"\t",
+    b"b": b"\b",
+    b"f": b"\f",
+    b"c": rb"\c",
+    b"(": b"(",
+    b")": b")",
+    b"/": b"/",
+    b"\\": b"\\",
+    b" ": b" ",
+    b"%": b"%",
+    b"<": b"<",
+    b">": b">",
+    b"[": b"[",
+    b"]": b"]",
+    b"#": b"#",
+    b"_": b"_",
+    b"&": b"&",
+    b"$": b"$",
+}
+OCTAL_DIGITS = b"01234567"
+
+# first read of a stream lexer; the buffer doubles each time it runs out
+INITIAL_WINDOW = 512
+# for the readers of a single token (NumberObject, NameObject, ...)
+TOKEN_WINDOW = 32
+
+
+class Lexer:
+    """
+    Cursor over a PDF byte buffer.
+
+    Built on a stream, the buffer is a window starting at the stream position
+    at creation time, read lazily and grown as the tokens require. Built on
+    `data`, the whole buffer is in memory and there is no stream to sync.
+    Use it as a context manager to leave the stream right after the last
+    token read, as the byte-wise readers used to.
+    """
+
+    __slots__ = ("stream", "start", "buf", "pos", "eof", "window", "whole")
+
+    def __init__(
+        self,
+        stream: Optional[StreamType] = None,
+        data: bytes = b"",
+        window: int = INITIAL_WINDOW,
+    ) -> None:
+        self.stream = stream
+        self.start = stream.tell() if stream is not None else 0
+        self.buf = data
+        self.pos = 0
+        self.eof = stream is None
+        self.window = window
+        # a BufferStream over bytes or an mmap is scanned in place
+        self.whole = isinstance(stream, BufferStream) and isinstance(
+            stream.buffer, (bytes, mmap.mmap)
+        )
+        if self.whole:
+            self.buf = stream.buffer  # type: ignore[union-attr]
+            self.pos, self.start = self.start, 0
+            self.eof = True
+
+    def __enter__(self) -> "Lexer":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.sync()
+
+    def tell(self) -> int:
+        return self.start + self.pos
+
+    def sync(self) -> None:
+        """Move the underlying stream to the cursor."""
+        if self.stream is not None:
+            self.stream.seek(self.start + self.pos, 0)
+
+    def as_stream(self) -> StreamType:
+        """
+        Stream positioned at the cursor, for readers which still work on a
+        stream (stream data, inline images). Call :meth:`resync` afterwards.
+        """
+        if self.stream is not None:
+            self.sync()
+            return self.stream
+        stream = BytesIO(self.buf)  # shares the bytes until written to
+        stream.seek(self.pos, 0)
+        return stream
+
+    def resync(self, stream: StreamType) -> None:
+        """Continue from where the stream returned by :meth:`as_stream` is."""
+        if self.whole:
+            self.pos = stream.tell()
+        elif self.stream is not None:
+            self.start = stream.tell()
+            self.buf = b""
+            self.pos = 0
+            self.eof = False
+        else:
+            self.pos = stream.tell()
+
+    def fill(self, n: int) -> bool:
+        """Make at least `n` bytes available after the cursor, if possible."""
+        if len(self.buf) - self.pos >= n:
+            return True
+        while len(self.buf) - self.pos < n:
+            if self.eof:
+                return False
+            assert self.stream is not None
+            want = max(n, len(self.buf), self.window)
+            more = self.stream.read(want)
+            if len(more) < want:
+                self.eof = True
+            if more:
+                self.buf += more
+        return True
+
+    def peek(self, n: int = 1) -> bytes:
+        if self.pos + n > len(self.buf) and not self.eof:
+            self.fill(n)
+        return self.buf[self.pos : self.pos + n]
+
+    def read(self, n: int = 1) -> bytes:
+        if self.pos + n > len(self.buf) and not self.eof:
+            self.fill(n)
+        data = self.buf[self.pos : self.pos + n]
+        self.pos += len(data)
+        return data
+
+    def match(self, pattern: Pattern[bytes]) -> Optional["re.Match[bytes]"]:
+        """
+        Match `pattern` at the cursor, growing the buffer while it may go on.
+        Patterns have to be decided by their first character when they fail.
+        """
+        m = pattern.match(self.buf, self.pos)
+        while not self.eof and (
+            m.end() == len(self.buf) if m is not None else self.pos >= len(self.buf)
+        ):
+            self.fill(len(self.buf) - self.pos + 1)
+            m = pattern.match(self.buf, self.pos)
+        return m
+
+    def search(self, pattern: Pattern[bytes]) -> Optional["re.Match[bytes]"]:
+        """Search `pattern` from the cursor, reading until found or EOF."""
+        start = self.pos
+        while True:
+            m = pattern.search(self.buf, start)
+            if m is not None or self.eof:
+                return m
+            # a match can not start before the end of what was scanned
+            start = len(self.buf)
+            self.fill(len(self.buf) - self.pos + 1)
+
+    def skip(self, pattern: Pattern[bytes] = WHITESPACE_RE) -> None:
+        self.pos = self.match(pattern).end()  # type: ignore[union-attr]
+
+    def read_non_whitespace(self) -> bytes:
+        """Same as PyPDF2._utils.read_non_whitespace."""
+        self.skip()
+        return self.read(1)
+
+    def skip_comment(self) -> None:
+        """Skip a comment up to and including its end of line."""
+        m = self.search(EOL_RE)
+        self.pos = m.end() if m is not None else len(self.buf)
+
+    def context(self) -> str:
+        """Position and surroundings for error messages."""
+        start = max(self.pos - 20, 0)
+        self.fill(self.pos - start + 80)
+        return f"@{self.start + start}: {self.buf[start : start + 80]!r}"
+
+    # token readers, returning raw bytes; the objects are built in _base.py
+
+    def read_number(self) -> bytes:
+        m = self.match(NUMBER_RE)
+        assert m is not None
+        if m.end() == len(self.buf):
+            # no delimiter before the end of the data
+            self.pos = m.end()
+            raise PdfStreamError(STREAM_TRUNCATED_PREMATURELY)
+        self.pos = m.end()
+        return m.group()
+
+    def read_name(self) -> bytes:
+        m = self.match(NAME_RE)
+        if m is None:
+            self.pos += 1
+            raise PdfReadError("name read error")
+        self.pos = m.end()
+        return m.group()
+
+    def read_keyword(self) -> bytes:
+        m = self.match(KEYWORD_RE)
+        assert m is not None
+        self.pos = m.end()
+        return m.group()
+
+    def read_hex_string(self) -> bytes:
+        self.read(1)  # "<"
+        end = self.buf.find(b">", self.pos)
+        while end < 0:
+            if not self.fill(len(self.buf) - self.pos + 1):
+                self.pos = len(self.buf)
+                raise PdfStreamError(STREAM_TRUNCATED_PREMATURELY)
+            end = self.buf.find(b">", self.pos)
+        digits = self.buf[self.pos : end].translate(None, b" \n\r\t\x00")
+        self.pos = end + 1
+        if len(digits) % 2:
+            digits += b"0"
+        try:
+            return unhexlify(digits)
+        except ValueError:
+            # int() accepts a few more forms than unhexlify (signs, ...)
+            return b_(
+                "".join(
+                    chr(int(digits[i : i + 2], base=16))
+                    for i in range(0, len(digits), 2)
+                )
+            )
+
+    def read_literal_string(self) -> bytes:
+        self.read(1)  # "("
+        parens = 1
+        txt: List[bytes] = []
+        while True:
+            m = self.search(STRING_SPECIAL_RE)
+            if m is None:
+                self.pos = len(self.buf)
+                raise PdfStreamError(STREAM_TRUNCATED_PREMATURELY)
+            txt.append(self.buf[self.pos : m.start()])
+            self.pos = m.end()
+            tok = m.group()
+            if tok == b"(":
+                parens += 1
+            elif tok == b")":
+                parens -= 1
+                if parens == 0:
+                    break
+            else:
+                tok = self.read(1)
+                if not tok:
+                    raise PdfStreamError(STREAM_TRUNCATED_PREMATURELY)
+                try:
+                    tok = STRING_ESCAPES[tok]
+                except KeyError:
+                    if tok in OCTAL_DIGITS:
+                        # "The number ddd may consist of one, two, or three
+                        # octal digits; high-order overflow shall be ignored.
+                        # Three octal digits shall be used, with leading zeros
+                        # as needed, if the next character of the string is also
+                        # a digit." (PDF reference 7.3.4.2, p 16)
+                        for _ in range(2):
+                            ntok = self.peek(1)
+                            if ntok and ntok in OCTAL_DIGITS:
+                                tok += ntok
+                                self.pos += 1
+                            else:
+                                break
+                        tok = b_(chr(int(tok, base=8)))
+                    elif tok in b"\n\r":
+                        # This case is  hit when a backslash followed by a line
+                        # break occurs.  If it's a multi-char EOL, consume the
+                        # second character:
+                        ntok = self.peek(1)
+                        if ntok and ntok in b"\n\r":
+                            self.pos += 1
+                        # Then don't add anything to the actual string, since this
+                        # line break was escaped:
+                        tok = b""
+                    else:
+                        msg = rf"Unexpected escaped string: {tok.decode('utf8')}"
+                        logger_warning(msg, __name__)
+            txt.append(tok)
+        return b"".join(txt)
@@ -1,18 +1,28 @@
 import os
 import json
 import urllib.parse
-from io import BytesIO
 from datetime import datetime
+from typing import Any, Dict, Optional
 
-import boto3
-import PyPDF2
+from s3_range_file import S3RangeFile
 
-# AWS clients
-s3        = boto3.client("s3")
-sns       = boto3.client("sns")
-ddb       = boto3.client("dynamodb")
-usage_ddb = boto3.client("dynamodb")
-textract  = boto3.client("textract")
+# boto3 and PyPDF2 are imported on first use, not at import time: the
+# module stays cheap to load, and warm_up() (run before the SnapStart
+# snapshot when the runtime supports it) can pay for both ahead of time.
+
+# AWS clients, built on first use from one shared session
+_session = None
+_clients: Dict[str, Any] = {}
+
+# records are handled one at a time, so a small pool is enough; keep the
+# connections alive between warm invocations
+CLIENT_CONFIG = {
+    "max_pool_connections": 4,
+    "connect_timeout":      3,
+    "read_timeout":         30,   # Textract can take a while on large pages
+    "retries":              {"max_attempts": 3, "mode": "standard"},
+    "tcp_keepalive":        True,
+}
 
 # Environment variables
 TOPIC_ARN       = os.environ["TOPIC_ARN"]
@@ -23,14 +33,45 @@ OCR_PAGE_LIMIT  = int(os.environ["OCR_PAGE_LIMIT"])
 # OCR thresholds
 MAX_OCR_BYTES = 2 * 1024 * 1024   # only OCR files ≤2 MB
 
+# length of the text preview stored with the metadata
+PREVIEW_CHARS = 200
+
+def client(service: str) -> Any:
+    """The boto3 client for `service`, created on first use."""
+    c = _clients.get(service)
+    if c is None:
+        global _session
+        import boto3
+        from botocore.config import Config
+
+        if _session is None:
+            _session = boto3.session.Session()
+        c = _clients[service] = _session.client(service, config=Config(**CLIENT_CONFIG))
+    return c
+
+def warm_up() -> None:
+    """Import PyPDF2 and create the clients, e.g. before a snapshot is taken."""
+    import PyPDF2  # noqa: F401
+
+    for service in ("s3", "sns", "dynamodb", "textract"):
+        client(service)
+
+try:
+    from snapshot_restore_py import register_before_snapshot
+except ImportError:  # runtime without SnapStart
+    pass
+else:
+    register_before_snapshot(warm_up)
+
 def should_ocr_and_record(num_pages: int, month_key: str) -> bool:
     """
     Atomically increment this month's OCR page count by num_pages, 
     but only if the new total would be <= OCR_PAGE_LIMIT.
     Returns True if increment succeeded, False if limit reached.
     """
+    ddb = client("dynamodb")
     try:
-        usage_ddb.update_item(
+        ddb.update_item(
             TableName=USAGE_TABLE,
             Key={"month": {"S": month_key}},
             UpdateExpression="SET used = if_not_exists(used, :zero) + :inc",
@@ -42,41 +83,45 @@ def should_ocr_and_record(num_pages: int, month_key: str) -> bool:
             }
         )
         return True
-    except usage_ddb.exceptions.ConditionalCheckFailedException:
+    except ddb.exceptions.ConditionalCheckFailedException:
         return False
 
-def extract_pdf_metadata(bucket: str, key: str) -> dict:
-    # 1) Check object size
-    head = s3.head_object(Bucket=bucket, Key=key)
-    size = head["ContentLength"]
+def extract_pdf_metadata(bucket: str, key: str, size: int, etag: Optional[str] = None) -> dict:
+    import PyPDF2
 
-    # 2) Download & parse with PyPDF2
-    data   = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
-    reader = PyPDF2.PdfReader(BytesIO(data))
+    # 1) Parse with PyPDF2 straight from S3; only the byte ranges the
+    #    reader touches (trailer, xref, catalog, first page) are downloaded
+    stream = S3RangeFile(client("s3"), bucket, key, size, etag)
+    reader = PyPDF2.PdfReader(stream)
 
-    num_pages = len(reader.pages)
-    meta      = reader.metadata or {}
+    # page count & /Info straight from the trailer and catalog
+    summary   = reader.get_summary()
+    num_pages = summary.page_count
+    meta      = summary.metadata or {}
 
-    # 3) Try built-in text extraction
-    text = reader.pages[0].extract_text() or ""
+    # 2) Try built-in text extraction; the first page is only decoded
+    #    and parsed until there is enough text for the preview
+    text = reader.extract_text_prefix(PREVIEW_CHARS, max_pages=1) or ""
 
-    # 4) Fallback to Textract if no text & size & monthly limit allow
+    # 3) Fallback to Textract if no text & size & monthly limit allow
     if not text.strip() and size <= MAX_OCR_BYTES:
         month_key = datetime.utcnow().strftime("%Y-%m")
         if should_ocr_and_record(num_pages, month_key):
-            resp  = textract.detect_document_text(
+            resp  = client("textract").detect_document_text(
                 Document={"S3Object": {"Bucket": bucket, "Name": key}}
             )
             lines = [b["DetectedText"] for b in resp.get("Blocks", []) if b["BlockType"]=="LINE"]
             text  = " ".join(lines)
 
-    preview = text.replace("\n", " ").strip()[:200]
+    preview = text.replace("\n", " ").strip()[:PREVIEW_CHARS]
 
     return {
         "title":   meta.get("/Title")  or "",
         "author":  meta.get("/Author") or "",
         "pages":   num_pages,
-        "preview": preview
+        "preview": preview,
+        # offsets / xref entries PyPDF2 had to repair; > 0 means a damaged upload
+        "repairs": reader.repair_count,
     }
 
 def main(event, context):
@@ -84,20 +129,16 @@ def main(event, context):
         bucket = record["s3"]["bucket"]["name"]
         raw_key = record["s3"]["object"]["key"]
         key = urllib.parse.unquote_plus(raw_key)
-        # size cap
-        head      = s3.head_object(Bucket=bucket, Key=key)
-        size      = head["ContentLength"]
-        MAX_BYTES = 5 * 1024 * 1024
-        if size > MAX_BYTES:
-            print(f"[WARN] Skipping {key}: size {size} > {MAX_BYTES}")
-            continue
-        
+        # size & version come with the event, no need for a HEAD request
+        size = record["s3"]["object"]["size"]
+        etag = record["s3"]["object"].get("eTag")
+
         try:
             # Extract (and potentially OCR‐augment) the text
-            md = extract_pdf_metadata(bucket, key)
+            md = extract_pdf_metadata(bucket, key, size, etag)
 
             # Write metadata to DynamoDB
-            ddb.put_item(
+            client("dynamodb").put_item(
                 TableName=META_TABLE,
                 Item={
                     "s3Key":    {"S": key},
@@ -111,11 +152,11 @@ def main(event, context):
 
             # Notify via SNS (optional)
             payload = {"s3Path": f"s3://{bucket}/{key}", "metadata": md}
-            sns.publish(TopicArn=TOPIC_ARN, Message=json.dumps(payload), Subject="AutoPDF PDF Uploaded")
+            client("sns").publish(TopicArn=TOPIC_ARN, Message=json.dumps(payload), Subject="AutoPDF PDF Uploaded")
 
         except Exception as e:
             err = {"s3Path": f"s3://{bucket}/{key}", "error": str(e)}
             print("[ERROR] Failed to process PDF:", json.dumps(err))
-            sns.publish(TopicArn=TOPIC_ARN, Message=json.dumps(err), Subject="AutoPDF PDF Processing Failed")
+            client("sns").publish(TopicArn=TOPIC_ARN, Message=json.dumps(err), Subject="AutoPDF PDF Processing Failed")
 
     return {"status": "ok"}
@@ -0,0 +1,175 @@
+import io
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Block cache defaults: 64 KiB blocks, up to 16 MiB held in memory
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_READ_AHEAD = 2
+DEFAULT_MAX_BLOCKS = 256
+
+
+class S3RangeFile(io.RawIOBase):
+    """
+    Seekable, read-only file object over an S3 object.
+
+    Bytes are fetched lazily with ranged GETs and kept in an LRU block cache.
+    All missing blocks touched by one read() are coalesced into as few GETs as
+    possible, and the last GET of a read also pulls `read_ahead` extra blocks
+    so sequential parsing does not cost one request per block.
+
+    `client` only needs a boto3-style ``get_object(Bucket=, Key=, Range=, IfMatch=)``,
+    so tests can pass a local stand-in. `size` and `etag` come from the S3
+    event record; the ETag is sent as If-Match so an object overwritten
+    mid-parse fails loudly instead of mixing two versions.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        bucket: str,
+        key: str,
+        size: int,
+        etag: Optional[str] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+        max_blocks: int = DEFAULT_MAX_BLOCKS,
+    ) -> None:
+        super().__init__()
+        if block_size <= 0:
+            raise ValueError("block_size must be positive")
+        self._client     = client
+        self._bucket     = bucket
+        self._key        = key
+        self._size       = int(size)
+        self._etag       = etag
+        self._block_size = block_size
+        self._read_ahead = max(0, read_ahead)
+        self._max_blocks = max(1, max_blocks)
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        self._pos = 0
+
+        # counters, handy for logging how much of the object was downloaded
+        self.requests      = 0
+        self.bytes_fetched = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._check_open()
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        # same semantics as BytesIO: relative seeks clamp at 0
+        self._check_open()
+        if whence == io.SEEK_SET:
+            if offset < 0:
+                raise ValueError(f"negative seek value {offset}")
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = max(0, self._pos + offset)
+        elif whence == io.SEEK_END:
+            pos = max(0, self._size + offset)
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        self._pos = pos
+        return pos
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        self._check_open()
+        if size is None or size < 0:
+            end = self._size
+        else:
+            end = min(self._size, self._pos + size)
+        if end <= self._pos:
+            return b""
+        data = self._read_range(self._pos, end)
+        self._pos = end
+        return data
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, buffer: Any) -> int:
+        data = self.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        return n
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+    def _read_range(self, start: int, end: int) -> bytes:
+        bs = self._block_size
+        first, last = start // bs, (end - 1) // bs
+        blocks: Dict[int, bytes] = {}
+        missing: List[int] = []
+        for idx in range(first, last + 1):
+            block = self._blocks.get(idx)
+            if block is None:
+                missing.append(idx)
+            else:
+                self._blocks.move_to_end(idx)
+                blocks[idx] = block
+        if missing:
+            blocks.update(self._fetch(self._coalesce(missing)))
+
+        if first == last:
+            return blocks[first][start - first * bs : end - first * bs]
+        parts = [blocks[first][start - first * bs :]]
+        parts.extend(blocks[idx] for idx in range(first + 1, last))
+        parts.append(blocks[last][: end - last * bs])
+        return b"".join(parts)
+
+    def _coalesce(self, missing: List[int]) -> List[Tuple[int, int]]:
+        """Group missing block indices into inclusive runs, read-ahead on the last."""
+        runs: List[Tuple[int, int]] = []
+        run_start = run_end = missing[0]
+        for idx in missing[1:]:
+            if idx == run_end + 1:
+                run_end = idx
+            else:
+                runs.append((run_start, run_end))
+                run_start = run_end = idx
+        n_blocks = (self._size + self._block_size - 1) // self._block_size
+        ahead = run_end
+        while (
+            ahead - run_end < self._read_ahead
+            and ahead + 1 < n_blocks
+            and ahead + 1 not in self._blocks
+        ):
+            ahead += 1
+        runs.append((run_start, ahead))
+        return runs
+
+    def _fetch(self, runs: List[Tuple[int, int]]) -> Dict[int, bytes]:
+        bs = self._block_size
+        fetched: Dict[int, bytes] = {}
+        for run_start, run_end in runs:
+            lo = run_start * bs
+            hi = min(self._size, (run_end + 1) * bs) - 1
+            params = {"Bucket": self._bucket, "Key": self._key, "Range": f"bytes={lo}-{hi}"}
+            if self._etag:
+                params["IfMatch"] = self._etag
+            data = self._client.get_object(**params)["Body"].read()
+            self.requests      += 1
+            self.bytes_fetched += len(data)
+            for i, idx in enumerate(range(run_start, run_end + 1)):
+                block = data[i * bs : (i + 1) * bs]
+                fetched[idx] = block
+                self._store(idx, block)
+        return fetched
+
+    def _store(self, idx: int, block: bytes) -> None:
+        self._blocks[idx] = block
+        self._blocks.move_to_end(idx)
+        while len(self._blocks) > self._max_blocks:
+            self._blocks.popitem(last=False)
@@ -0,0 +1,69 @@
+"""In-memory stand-ins for the boto3 clients used by the process_pdf handler."""
+import io
+import types
+
+ENV = {
+    "TOPIC_ARN": "arn:aws:sns:us-east-1:000000000000:topic",
+    "METADATA_TABLE": "metadata",
+    "OCR_USAGE_TABLE": "usage",
+    "OCR_PAGE_LIMIT": "10",
+}
+
+
+class FakeS3:
+    """Local stand-in for the boto3 S3 client: serves ranged GETs from memory."""
+
+    def __init__(self, data: bytes, etag: str = "abc123") -> None:
+        self.data = data
+        self.etag = etag
+        self.ranges = []
+
+    def get_object(self, Bucket, Key, Range, IfMatch=None):
+        if IfMatch is not None and IfMatch != self.etag:
+            raise RuntimeError("PreconditionFailed")
+        lo, hi = (int(x) for x in Range[len("bytes="):].split("-"))
+        self.ranges.append((lo, hi))
+        return {"Body": io.BytesIO(self.data[lo : hi + 1])}
+
+
+class FakeDynamoDB:
+    exceptions = types.SimpleNamespace(ConditionalCheckFailedException=KeyError)
+
+    def __init__(self):
+        self.calls = []
+
+    def put_item(self, **kwargs):
+        self.calls.append(("put_item", kwargs))
+
+    def update_item(self, **kwargs):
+        self.calls.append(("update_item", kwargs))
+
+
+class FakeSNS:
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, TopicArn, Message, Subject):
+        self.messages.append(Subject)
+
+
+class FakeTextract:
+    def detect_document_text(self, Document):
+        return {"Blocks": [{"BlockType": "LINE", "DetectedText": "scanned text"}]}
+
+
+def s3_event(data):
+    obj = {"key": "docs/a+file.pdf", "size": len(data), "eTag": "abc123"}
+    return {"Records": [{"s3": {"bucket": {"name": "bucket"}, "object": obj}}]}
+
+
+def install_clients(handler, data):
+    """Put fakes serving `data` in the handler's client cache."""
+    fakes = {
+        "s3": FakeS3(data),
+        "dynamodb": FakeDynamoDB(),
+        "sns": FakeSNS(),
+        "textract": FakeTextract(),
+    }
+    handler._clients.update(fakes)
+    return fakes
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# Lambda sources are deployed from lambda/<function>/ and import each other as
+# top-level modules; "lambda" itself is not an importable package name.
+PROCESS_PDF_DIR = Path(__file__).resolve().parents[2] / "lambda" / "process_pdf"
+if str(PROCESS_PDF_DIR) not in sys.path:
+    sys.path.insert(0, str(PROCESS_PDF_DIR))
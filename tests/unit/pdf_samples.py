@@ -0,0 +1,279 @@
+"""Small hand-rolled PDF builders for the process_pdf tests."""
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _stream(dict_body: bytes, data: bytes) -> bytes:
+    return b"<< %s /Length %d >>\nstream\n%s\nendstream" % (dict_body, len(data), data)
+
+
+def build_pdf(
+    objects: Dict[int, bytes],
+    root: int,
+    info: Optional[int] = None,
+    version: bytes = b"1.4",
+    xref_stream: bool = False,
+    compressed: Iterable[int] = (),
+) -> bytes:
+    """
+    Serialize ``{objnum: body}`` into a PDF.
+
+    Objects listed in `compressed` are packed into one /ObjStm (which implies
+    a cross-reference stream); everything else is written as a plain object.
+    """
+    compressed = sorted(compressed)
+    objects = dict(objects)
+    size = max(objects) + 1
+    stm_num = xref_num = None
+    if compressed:
+        xref_stream = True
+        stm_num = size
+        size += 1
+        header, body = [], b""
+        for num in compressed:
+            header.append(b"%d %d" % (num, len(body)))
+            body += objects.pop(num) + b"\n"
+        head = b" ".join(header) + b"\n"
+        objects[stm_num] = _stream(
+            b"/Type /ObjStm /N %d /First %d" % (len(compressed), len(head)), head + body
+        )
+    if xref_stream:
+        xref_num = size
+        size += 1
+
+    out = b"%PDF-" + version + b"\n%\xe2\xe3\xcf\xd3\n"
+    offsets: Dict[int, int] = {}
+    for num in sorted(objects):
+        offsets[num] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, objects[num])
+
+    trailer = b"/Size %d /Root %d 0 R" % (size, root)
+    if info is not None:
+        trailer += b" /Info %d 0 R" % info
+    if not xref_stream:
+        startxref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % size
+        for num in range(1, size):
+            if num in offsets:
+                out += b"%010d 00000 n \n" % offsets[num]
+            else:
+                out += b"0000000000 00000 f \n"
+        out += b"trailer\n<< %s >>\n" % trailer
+    else:
+        startxref = offsets[xref_num] = len(out)
+        rows = [b"\x00\x00\x00\x00\xff\xff"]
+        for num in range(1, size):
+            if num in offsets:
+                rows.append(b"\x01" + offsets[num].to_bytes(4, "big") + b"\x00")
+            elif num in compressed:
+                idx = compressed.index(num)
+                rows.append(b"\x02" + stm_num.to_bytes(4, "big") + bytes((idx,)))
+            else:
+                rows.append(b"\x00" * 6)
+        data = zlib.compress(b"".join(rows))
+        out += b"%d 0 obj\n" % xref_num
+        out += _stream(
+            b"/Type /XRef /W [1 4 1] /Filter /FlateDecode " + trailer, data
+        )
+        out += b"\nendobj\n"
+    out += b"startxref\n%d\n%%%%EOF\n" % startxref
+    return out
+
+
+def text_pdf(
+    pages: List[str],
+    fanout: int = 0,
+    title: str = "Sample",
+    author: str = "AutoPDF",
+    padding: int = 0,
+    **kwargs: object,
+) -> bytes:
+    """
+    One Helvetica text line per page.
+
+    With `fanout` > 0 the page tree is built as nested /Pages nodes holding
+    at most `fanout` kids each, and /Resources + /MediaBox are only set on
+    the root so pages have to inherit them. `padding` appends an unused
+    stream of that many bytes, to make the file bigger than what is parsed.
+    """
+    objects: Dict[int, bytes] = {}
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[3] = b"<< /Title (%s) /Author (%s) >>" % (title.encode(), author.encode())
+    objects[4] = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    next_num = 5
+    if padding:
+        objects[next_num] = _stream(b"", b"%" * padding)
+        next_num += 1
+
+    resources = b"/Resources << /Font << /F1 4 0 R >> >> /MediaBox [0 0 612 792]"
+    leaves: List[Tuple[int, int]] = []  # (page objnum, content objnum)
+    for text in pages:
+        page_num, content_num = next_num, next_num + 1
+        next_num += 2
+        content = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode("latin-1")
+        objects[content_num] = _stream(b"", content)
+        leaves.append((page_num, content_num))
+
+    if fanout <= 0:
+        kids = b" ".join(b"%d 0 R" % p for p, _ in leaves)
+        objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d %s >>" % (
+            kids,
+            len(leaves),
+            resources,
+        )
+        for page_num, content_num in leaves:
+            objects[page_num] = (
+                b"<< /Type /Page /Parent 2 0 R /Contents %d 0 R >>" % content_num
+            )
+        return build_pdf(objects, root=1, info=3, **kwargs)  # type: ignore[arg-type]
+
+    # group leaves bottom-up into /Pages nodes of at most `fanout` kids
+    level: List[Tuple[int, int]] = [(p, 1) for p, _ in leaves]  # (objnum, count)
+    parents: Dict[int, int] = {}
+    while len(level) > fanout:
+        grouped: List[Tuple[int, int]] = []
+        for i in range(0, len(level), fanout):
+            chunk = level[i : i + fanout]
+            node = next_num
+            next_num += 1
+            count = sum(c for _, c in chunk)
+            objects[node] = b"<< /Type /Pages /Kids [%s] /Count %d /Parent %%(parent)s >>" % (
+                b" ".join(b"%d 0 R" % n for n, _ in chunk),
+                count,
+            )
+            for n, _ in chunk:
+                parents[n] = node
+            grouped.append((node, count))
+        level = grouped
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d %s >>" % (
+        b" ".join(b"%d 0 R" % n for n, _ in level),
+        sum(c for _, c in level),
+        resources,
+    )
+    for n, _ in level:
+        parents[n] = 2
+    for num, body in list(objects.items()):
+        if b"%(parent)s" in body:
+            objects[num] = body.replace(b"%(parent)s", b"%d 0 R" % parents[num])
+    for page_num, content_num in leaves:
+        objects[page_num] = b"<< /Type /Page /Parent %d 0 R /Contents %d 0 R >>" % (
+            parents[page_num],
+            content_num,
+        )
+    return build_pdf(objects, root=1, info=3, **kwargs)  # type: ignore[arg-type]
+
+
+def font_pdf(
+    pages: List[bytes],
+    fonts: Dict[str, bytes],
+    to_unicode: Optional[Dict[str, bytes]] = None,
+) -> bytes:
+    """
+    Pages drawn by the raw content streams `pages`, all using the fonts
+    `fonts` ({resource name: font dictionary}) as shared indirect objects.
+
+    `to_unicode` gives some of the fonts a /ToUnicode CMap stream.
+    """
+    objects: Dict[int, bytes] = {1: b"<< /Type /Catalog /Pages 2 0 R >>"}
+    next_num = 3
+    font_refs = []
+    for name, body in fonts.items():
+        font_num = next_num
+        next_num += 1
+        if to_unicode and name in to_unicode:
+            objects[next_num] = _stream(b"", to_unicode[name])
+            body = body.replace(b">>", b" /ToUnicode %d 0 R >>" % next_num, 1)
+            next_num += 1
+        objects[font_num] = body
+        font_refs.append(b"/%s %d 0 R" % (name.encode(), font_num))
+    resources = b"/Resources << /Font << %s >> >> /MediaBox [0 0 612 792]" % (
+        b" ".join(font_refs)
+    )
+    kids = []
+    for content in pages:
+        objects[next_num + 1] = _stream(b"", content)
+        objects[next_num] = b"<< /Type /Page /Parent 2 0 R /Contents %d 0 R %s >>" % (
+            next_num + 1,
+            resources,
+        )
+        kids.append(b"%d 0 R" % next_num)
+        next_num += 2
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+    return build_pdf(objects, root=1)
+
+
+def incremental_update(data: bytes, objects: Dict[int, bytes]) -> bytes:
+    """
+    Append an incremental update (re)defining `objects` to the PDF `data`,
+    with a classic xref section whose /Prev points at the previous one.
+    """
+    prev = int(data.rsplit(b"startxref", 1)[1].split()[0])
+    trailer = re.findall(rb"/Root \d+ 0 R(?: /Info \d+ 0 R)?", data)[-1]
+    size = max(int(re.findall(rb"/Size (\d+)", data)[-1]), max(objects) + 1)
+    out = data
+    offsets: Dict[int, int] = {}
+    for num in sorted(objects):
+        offsets[num] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, objects[num])
+    startxref = len(out)
+    out += b"xref\n"
+    for num in sorted(offsets):
+        out += b"%d 1\n%010d 00000 n \n" % (num, offsets[num])
+    out += b"trailer\n<< /Size %d %s /Prev %d >>\n" % (size, trailer, prev)
+    out += b"startxref\n%d\n%%%%EOF\n" % startxref
+    return out
+
+
+def lzw_encode(data: bytes, early_change: int = 1) -> bytes:
+    """LZWDecode-compatible encoder: 9 to 12 bit codes, MSB first."""
+    CLEAR, STOP = 256, 257
+    codes: List[Tuple[int, int]] = []  # (code, width)
+    # code width as the decoder sees it: its table lags one entry behind
+    state = {"width": 9, "size": 258, "first": True}
+
+    def emit(code: int) -> None:
+        codes.append((code, state["width"]))
+        if code == CLEAR:
+            state.update(width=9, size=258, first=True)
+        elif state["first"]:
+            state["first"] = False
+        else:
+            state["size"] += 1
+            if state["size"] >= (1 << state["width"]) - early_change:
+                state["width"] = min(state["width"] + 1, 12)
+
+    table: Dict[Tuple[int, int], int] = {}  # (prefix code, byte) -> code
+    emit(CLEAR)
+    code = -1
+    for byte in data:
+        if code < 0:
+            code = byte
+            continue
+        longer = table.get((code, byte))
+        if longer is not None:
+            code = longer
+            continue
+        emit(code)
+        table[code, byte] = len(table) + 258
+        code = byte
+        if len(table) + 258 >= 4094:
+            emit(CLEAR)
+            table = {}
+    if code >= 0:
+        emit(code)
+    emit(STOP)
+
+    bits = 0
+    nbits = 0
+    out = bytearray()
+    for code, width in codes:
+        bits = bits << width | code
+        nbits += width
+        while nbits >= 8:
+            nbits -= 8
+            out.append(bits >> nbits & 0xFF)
+        bits &= (1 << nbits) - 1
+    if nbits:
+        out.append(bits << (8 - nbits) & 0xFF)
+    return bytes(out)
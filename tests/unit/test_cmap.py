@@ -0,0 +1,245 @@
+import io
+import warnings
+
+import pytest
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2 import PdfReader
+    from PyPDF2._cmap import ToUnicodeMap, cmap_records, parse_bfrange, parse_to_unicode
+    from PyPDF2._codecs import CharmapEncoding
+    from PyPDF2._codecs.adobe_glyphs import GlyphList, dump_glyph_table
+    from PyPDF2.generic import (
+        DecodedStreamObject,
+        DictionaryObject,
+        NameObject,
+        create_string_object,
+    )
+
+from tests.unit.pdf_samples import font_pdf
+
+HELVETICA = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+TYPE0 = b"<< /Type /Font /Subtype /Type0 /BaseFont /Custom /Encoding /Identity-H >>"
+
+TO_UNICODE = b"""/CIDInit /ProcSet findresource begin
+12 dict begin
+begincmap
+1 begincodespacerange
+<0000> <FFFF>
+endcodespacerange
+2 beginbfchar
+<0001> <0048>
+<0002> <0069>
+endbfchar
+1 beginbfrange
+<0010> <0019> <0030>
+endbfrange
+endcmap
+CMapName currentdict /CMap defineresource pop
+end
+end"""
+
+
+def _reader(data: bytes, **kwargs) -> PdfReader:
+    return PdfReader(io.BytesIO(data), **kwargs)
+
+
+def test_char_maps_are_shared_by_pages():
+    pages = [
+        b"BT /F1 12 Tf 72 720 Td <00010002> Tj /F2 12 Tf (p%d) Tj ET" % i
+        for i in range(10)
+    ]
+    data = font_pdf(pages, {"F1": TYPE0, "F2": HELVETICA}, {"F1": TO_UNICODE})
+    reader = _reader(data)
+    texts = [page.extract_text() for page in reader.pages]
+    assert texts == ["Hip%d" % i for i in range(10)]
+    cache = reader.char_map_cache
+    assert (cache.misses, cache.hits, len(cache)) == (2, 18, 2)
+    assert cache.hit_rate == 0.9
+
+    # a different space width is a different char map
+    reader.pages[0].extract_text(space_width=100.0)
+    assert (cache.misses, len(cache)) == (4, 4)
+
+    uncached = _reader(data, char_map_cache_size=0)
+    assert [page.extract_text() for page in uncached.pages] == texts
+    assert len(uncached.char_map_cache) == 0
+    assert uncached.char_map_cache.evictions == 20
+
+
+def test_char_map_cache_is_lru():
+    pages = [b"BT /F1 12 Tf 72 720 Td (a) Tj ET", b"BT /F2 12 Tf 72 720 Td (b) Tj ET"]
+    data = font_pdf(pages, {"F1": HELVETICA, "F2": HELVETICA})
+    reader = _reader(data, char_map_cache_size=3)
+    for page in list(reader.pages) * 2:
+        page.extract_text()
+    # each page builds the char maps of both fonts: the cache holds them all
+    assert (reader.char_map_cache.misses, reader.char_map_cache.hits) == (2, 6)
+    reader.char_map_cache.max_size = 1
+    reader.char_map_cache.clear()
+    for page in reader.pages:
+        page.extract_text()
+    assert reader.char_map_cache.evictions == 3
+
+
+def _to_unicode(cm: bytes):
+    stream = DecodedStreamObject()
+    stream.set_data(cm)
+    return parse_to_unicode(DictionaryObject({NameObject("/ToUnicode"): stream}), 32)
+
+
+def test_ranges_are_kept_as_intervals():
+    map_dict, space_code, int_entry = _to_unicode(
+        b"2 beginbfrange\n<0000> <FFFF> <0000>\n<4E00> <9FFF> <4E00>\nendbfrange\n"
+        b"1 beginbfchar\n<0020> <0021>\nendbfchar"
+    )
+    assert isinstance(map_dict, ToUnicodeMap)
+    # 0000-001F, 0021-4DFF, 4E00-9FFF, A000-FFFF
+    assert map_dict._starts == [0, 0x21, 0x4E00, 0xA000]
+    assert len(map_dict) == 65536 + 1  # and -1
+    assert map_dict[-1] == 2
+    assert map_dict["\u4e2d"] == "\u4e2d" and map_dict.get("\uffff") == "\uffff"
+    assert map_dict[" "] == "!" and space_code == 32  # no code maps to a space
+    assert int_entry == [*range(256), 0x20]  # the codes above 255 are not used
+
+
+def test_four_byte_ranges_keep_utf16_keys():
+    cmap, int_entry = ToUnicodeMap(), []
+    parse_bfrange(b"00000041", b"00000043", b"0061", cmap, int_entry)
+    parse_bfrange(b"0011FFFF", b"00120000", b"0030", cmap, int_entry)
+    assert cmap.get("\x00B") == "b"
+    assert "B" not in cmap
+    assert list(cmap) == [-1, "\x00A", "\x00B", "\x00C", "\x11\uffff", "\x12\x00"]
+    assert int_entry == [0x41, 0x42, 0x43, 0x11FFFF, 0x120000]
+
+
+def test_later_entries_take_precedence():
+    map_dict, space_code, int_entry = _to_unicode(
+        b"2 beginbfchar\n<0003> <0020>\n<0041> <0042>\nendbfchar\n"
+        b"2 beginbfrange\n<0040> <0045> <0061>\n"
+        b"<0000> <0004> [<0066> <0067> <0068> <0069> <006A>]\nendbfrange\n"
+        b"1 beginbfrange\n<0043> <0048> <0071>\n<00FE> <0101> <00660066>\nendbfrange"
+    )
+    assert {k: v for k, v in map_dict.items() if k != -1} == {
+        "\x00": "f", "\x01": "g", "\x02": "h", "\x03": "i", "\x04": "j",
+        "@": "a", "A": "b", "B": "c",
+        "C": "q", "D": "r", "E": "s", "F": "t", "G": "u", "H": "v",
+        "\xfe": "ff", "\xff": "fg", "\u0100": "fh", "\u0101": "fi",
+    }
+    assert space_code == 32  # the space of <0003> was replaced
+
+
+def test_to_unicode_map_edits():
+    map_dict = ToUnicodeMap()
+    map_dict.add_range(0x10, 0x1F, 0x30)
+    map_dict["\x15"] = "x"
+    del map_dict["\x18"]
+    assert len(map_dict) == 15
+    assert list(map_dict)[0] == "\x15" and "\x18" not in map_dict
+    assert map_dict["\x14"] == "4" and map_dict["\x19"] == "9"
+
+    map_dict.add_range(0x12, 0x16, 0x61)
+    values = "".join(map_dict.get(chr(c), "-") for c in range(0x10, 0x20))
+    assert values == "01abcde7-9:;<=>?"
+    assert len(map_dict) == 15
+    with pytest.raises(KeyError):
+        map_dict["\x18"]
+    assert map_dict.space_key() is None
+
+
+def test_space_code_follows_dict_order():
+    chars = b"1 beginbfchar\n<0003> <0020>\nendbfchar\n"
+    ranges = b"1 beginbfrange\n<0010> <0012> <001F>\nendbfrange\n"
+    assert _to_unicode(chars + ranges)[1] == "\x11"
+    assert _to_unicode(ranges + chars)[1] == "\x03"
+    # a code set again keeps its place, as in a dict
+    assert _to_unicode(ranges + b"1 beginbfchar\n<0010> <0020>\nendbfchar")[1] == "\x11"
+    # a space replaced by a later entry does not count
+    assert _to_unicode(chars + ranges + b"1 beginbfchar\n<0011> <0041>\nendbfchar")[1] == "\x03"
+
+
+def test_cmap_records_of_word_printed_pdf():
+    # no line breaks around the keywords, \r line ends, spaces inside hex
+    # strings, an empty value and a dictionary holding hex-like text
+    cm = (
+        b"/CIDSystemInfo << /Registry (Adobe) <4142> >> def\r"
+        b"%% comment beginbfchar <0000> <0041>\r"
+        b"2 beginbfchar<0003><0020><00 11> <>endbfchar\r"
+        b"1 beginbfrange<0024><0026><0041>\rendbfrange"
+        b"1 beginbfrange <0030> <0032> [<0061>\r<0062>\n<00660066>] endbfrange"
+    )
+    assert list(cmap_records(cm)) == [
+        (b"0003", b"0020"),
+        (b"0011", b""),
+        (b"0024", b"0026", b"0041"),
+        (b"0030", b"0032", [b"0061", b"0062", b"00660066"]),
+    ]
+    map_dict, space_code, int_entry = _to_unicode(cm)
+    assert {k: v for k, v in map_dict.items() if k != -1} == {
+        "\x03": " ", "\x11": "",
+        "$": "A", "%": "B", "&": "C",
+        "0": "a", "1": "b", "2": "ff",
+    }
+    assert space_code == "\x03"
+    assert int_entry == [3, 17, 0x24, 0x25, 0x26, 0x30, 0x31, 0x32]
+
+
+def test_differences_are_decoded_with_a_charmap():
+    font = (
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Custom /Encoding << "
+        b"/BaseEncoding /WinAnsiEncoding /Differences [65 /Alpha /bullet /g123 200 /space] "
+        b">> >>"
+    )
+    pages = [b"BT /F1 12 Tf 72 720 Td (ABCDa\x80\xc8z) Tj ET"]
+    reader = _reader(font_pdf(pages, {"F1": font}))
+    assert reader.pages[0].extract_text() == "\u0391\u2022/g123Da\u20ac z"
+    encoding = reader.char_map_cache._maps.popitem()[1][2]
+    assert isinstance(encoding, CharmapEncoding)
+    assert encoding.decode(b"AB") == "\u0391\u2022"
+    encoding[65] = "a"
+    assert encoding.decode(b"AB") == "a\u2022"
+
+
+def test_charmap_encoding_missing_codes():
+    encoding = CharmapEncoding({0x41: "x", 0x80: "\u2022", 0x81: ""})
+    assert encoding.decode(b"AB\x80\x81") == "xB\u2022"
+    with pytest.raises(UnicodeDecodeError):
+        encoding.decode(b"\x82")
+    assert encoding.decode(b"a\x82", "replace") == "a\ufffd"
+    # strings keep the byte by byte fallback of plain dicts: missing codes
+    # are read as Latin-1
+    assert create_string_object(b"A\xe9\x80", encoding) == "x\xe9\u2022"
+    assert create_string_object(b"AB\x80", encoding) == "xB\u2022"
+
+
+def test_charmap_encoding_changes_drop_the_table():
+    encoding = CharmapEncoding({0x41: "x", 0x61: "y"})
+    assert encoding.decode(b"ACa") == "xCy"
+    encoding.update({0x43: "Z"})
+    assert encoding.decode(b"C") == "Z"
+    encoding |= {0x43: "W"}
+    assert encoding.decode(b"C") == "W"
+    encoding.pop(0x61)
+    assert encoding.decode(b"a") == "a"
+    encoding.setdefault(0x62, "v")
+    assert encoding.decode(b"b") == "v"
+    encoding.popitem()
+    assert encoding.decode(b"b") == "b"
+    encoding.clear()
+    assert encoding.decode(b"AC") == "AC"
+
+
+def test_glyph_list_is_loaded_on_first_lookup(tmp_path):
+    glyphs = GlyphList()
+    assert not glyphs.loaded
+    assert glyphs["/Alpha"] == "\u0391"
+    assert glyphs.loaded
+    assert "/g123" not in glyphs
+    assert glyphs["/a65"] == "A" and glyphs["/.notdef"] == "\u25a1"
+    assert len(glyphs) > 13000
+
+    path = str(tmp_path / "glyphs.marshal")
+    dump_glyph_table({"/bullet": "\u2022", "/Alpha": "\u0391"}, path)
+    small = GlyphList(path)
+    assert small.get("/bullet") == "\u2022"
+    assert len(small) == 3 + 256 and "/Alpha" in small
@@ -0,0 +1,306 @@
+import base64
+import gzip
+import io
+import math
+import random
+import warnings
+import zlib
+
+import pytest
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2 import PdfReader, filters
+    from PyPDF2._utils import paeth_predictor
+    from PyPDF2.errors import LimitReachedError, PdfReadError, PdfStreamError
+    from PyPDF2.filters import (
+        ASCII85Decode,
+        ASCIIHexDecode,
+        FlateDecode,
+        LZWDecode,
+        decode_stream_chunks,
+        decode_stream_data,
+    )
+    from PyPDF2.generic import (
+        ArrayObject,
+        DecodedStreamObject,
+        DictionaryObject,
+        EncodedStreamObject,
+        NameObject,
+        NumberObject,
+    )
+
+from tests.unit.pdf_samples import build_pdf, lzw_encode
+
+
+def _reference_png(data: bytes, rowlength: int, bpp: int = 1) -> bytes:
+    """The byte-wise decoder FlateDecode used before, with `bpp` added."""
+    output = bytearray()
+    prev_rowdata = (0,) * rowlength
+    for row in range(len(data) // rowlength):
+        rowdata = list(data[row * rowlength : (row + 1) * rowlength])
+        filter_byte = rowdata[0]
+        if filter_byte == 1:
+            for i in range(1 + bpp, rowlength):
+                rowdata[i] = (rowdata[i] + rowdata[i - bpp]) % 256
+        elif filter_byte == 2:
+            for i in range(1, rowlength):
+                rowdata[i] = (rowdata[i] + prev_rowdata[i]) % 256
+        elif filter_byte == 3:
+            for i in range(1, rowlength):
+                left = rowdata[i - bpp] if i > bpp else 0
+                rowdata[i] = (rowdata[i] + (left + prev_rowdata[i]) // 2) % 256
+        elif filter_byte == 4:
+            for i in range(1, rowlength):
+                left = rowdata[i - bpp] if i > bpp else 0
+                up_left = prev_rowdata[i - bpp] if i > bpp else 0
+                paeth = paeth_predictor(left, prev_rowdata[i], up_left)
+                rowdata[i] = (rowdata[i] + paeth) % 256
+        prev_rowdata = tuple(rowdata)
+        output += bytes(rowdata[1:])
+    return bytes(output)
+
+
+def _predicted(rows: int, rowlength: int, filter_types, seed: int = 0) -> bytes:
+    rnd = random.Random(seed)
+    data = bytearray()
+    for _ in range(rows):
+        data.append(rnd.choice(filter_types))
+        data += bytes(rnd.randrange(256) for _ in range(rowlength - 1))
+    return bytes(data)
+
+
+@pytest.fixture(params=["python", "numpy"])
+def png_path(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(filters, "PNG_NUMPY_THRESHOLD", 0)
+    else:
+        monkeypatch.setattr(filters, "_np", False)
+    return request.param
+
+
+@pytest.mark.parametrize("filter_types", [[0], [1], [2], [3], [4], [0, 1, 2, 3, 4]])
+@pytest.mark.parametrize("rowlength, bpp", [(2, 1), (6, 1), (97, 1), (13, 3), (17, 4), (9, 6)])
+def test_png_prediction_matches_reference(png_path, filter_types, rowlength, bpp):
+    data = _predicted(40, rowlength, filter_types)
+    assert FlateDecode._decode_png_prediction(data, 0, rowlength, bpp) == (
+        _reference_png(data, rowlength, bpp)
+    )
+
+
+def test_png_prediction_errors(png_path):
+    with pytest.raises(PdfReadError, match="not rectangular"):
+        FlateDecode._decode_png_prediction(b"\x00" * 7, 0, 3)
+    with pytest.raises(PdfReadError, match="Unsupported PNG filter 7"):
+        FlateDecode._decode_png_prediction(b"\x02\x00\x07\x00", 0, 2)
+
+
+@pytest.mark.parametrize(
+    "colors, bits, columns, bpp",
+    [(1, 8, 5, 1), (3, 8, 4, 3), (4, 16, 3, 8), (3, 4, 5, 2), (1, 1, 20, 1)],
+)
+def test_flate_decode_bytes_per_pixel(png_path, colors, bits, columns, bpp):
+    rowlength = math.ceil(columns * colors * bits / 8) + 1
+    data = _predicted(30, rowlength, [0, 1, 2, 3, 4], seed=colors * bits)
+    parms = DictionaryObject(
+        {
+            NameObject("/Predictor"): NumberObject(15),
+            NameObject("/Columns"): NumberObject(columns),
+            NameObject("/Colors"): NumberObject(colors),
+            NameObject("/BitsPerComponent"): NumberObject(bits),
+        }
+    )
+    assert FlateDecode.decode(zlib.compress(data), parms) == (
+        _reference_png(data, rowlength, bpp)
+    )
+
+
+def _text(size: int, seed: int = 0) -> bytes:
+    rnd = random.Random(seed)
+    words = [b"stream", b"obj", b"0", b"R", b"/Type", b"\xff\x00"]
+    return b" ".join(rnd.choice(words) for _ in range(size // 4))[:size]
+
+
+def test_lzw_spec_example():
+    # ISO 32000-1, 7.4.4.2, example 2
+    data = bytes.fromhex("800B6050220C0C8501")
+    assert LZWDecode.decode(data) == b"-----A---B"
+
+
+@pytest.mark.parametrize("early_change", [0, 1])
+def test_lzw_roundtrip(early_change):
+    # long enough for the table to fill up and be cleared several times
+    data = _text(200_000) + b"a" * 1000
+    parms = DictionaryObject({NameObject("/EarlyChange"): NumberObject(early_change)})
+    encoded = lzw_encode(data, early_change)
+    assert LZWDecode.decode(encoded, parms) == data
+    assert LZWDecode.decode(encoded, ArrayObject([parms])) == data
+
+
+def test_lzw_missing_stop_code():
+    with pytest.raises(PdfReadError, match="stop code"):
+        LZWDecode.decode(lzw_encode(b"abcabc")[:-2])
+
+
+def test_ascii_hex():
+    assert ASCIIHexDecode.decode(b"48 65\n6c6C\t6f>trailing") == b"Hello"
+    assert ASCIIHexDecode.decode("414>") == b"A@"
+    with pytest.raises(PdfStreamError):
+        ASCIIHexDecode.decode(b"4142")
+
+
+def test_ascii85():
+    data = _text(10_000) + b"\0" * 8 + b"end"
+    encoded = base64.a85encode(data, wrapcol=72)
+    assert ASCII85Decode.decode(encoded + b"~>\n") == data
+    assert ASCII85Decode.decode(b"87cURD]i,\"Ebo80~>") == b"Hello World!"
+    assert ASCII85Decode.decode("z 87cU RDZ~>") == b"\0\0\0\0Hello"
+    # as before: the final partial group needs the ~> end marker
+    assert ASCII85Decode.decode(b"87cURD]i,\"Ebo8") == b"Hello Wo"
+    with pytest.raises(PdfStreamError):
+        ASCII85Decode.decode(b"87czURD~>")
+
+
+def test_stream_with_ascii_filters():
+    stream = DecodedStreamObject()
+    stream[NameObject("/Filter")] = ArrayObject(
+        [NameObject("/AHx"), NameObject("/A85")]
+    )
+    stream._data = (base64.a85encode(b"payload") + b"~>").hex().encode() + b">"
+    assert decode_stream_data(stream) == b"payload"
+
+
+def _reference_recovery(data: bytes) -> bytes:
+    """The byte-at-a-time recovery decompress() used before."""
+    d = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    result = b""
+    for i in range(len(data)):
+        try:
+            result += d.decompress(data[i : i + 1])
+        except zlib.error:
+            pass
+    return result
+
+
+def _damaged_streams():
+    raw = _text(100_000, seed=5)
+    good = zlib.compress(raw)
+    flipped = bytearray(good)
+    flipped[len(good) // 2] ^= 0x10
+    return {
+        "truncated": good[: len(good) * 2 // 3],
+        "flipped bit": bytes(flipped),
+        "no checksum": good[:-4],
+        "truncated gzip": gzip.compress(raw)[:-5000],
+    }
+
+
+@pytest.mark.parametrize("name", list(_damaged_streams()))
+def test_flate_recovery_matches_bytewise_recovery(monkeypatch, name):
+    monkeypatch.setattr(filters, "FLATE_RECOVERY_CHUNK", 1000)
+    data = _damaged_streams()[name]
+    recovered = FlateDecode.decode(data)
+    assert recovered == _reference_recovery(data)
+    assert len(recovered) > 10_000
+
+
+def test_flate_recovery_cap():
+    data = _damaged_streams()["truncated"]
+    assert filters.decompress(data, max_recovered=1234) == _reference_recovery(data)[:1234]
+
+
+def _flate_stream(data: bytes, **parms: int) -> EncodedStreamObject:
+    stream = EncodedStreamObject()
+    stream[NameObject("/Filter")] = NameObject("/FlateDecode")
+    if parms:
+        stream[NameObject("/DecodeParms")] = DictionaryObject(
+            {NameObject("/" + k): NumberObject(v) for k, v in parms.items()}
+        )
+    stream._data = zlib.compress(data)
+    return stream
+
+
+def test_stream_is_decoded_in_pieces(monkeypatch):
+    monkeypatch.setattr(filters, "OUTPUT_CHUNK_SIZE", 1000)
+    data = _text(50_000)
+    stream = _flate_stream(data)
+    chunks = list(decode_stream_chunks(stream))
+    assert len(chunks) >= 50
+    assert b"".join(chunks) == data == stream.get_data()
+
+
+def test_predictor_is_undone_across_pieces(png_path, monkeypatch):
+    monkeypatch.setattr(filters, "OUTPUT_CHUNK_SIZE", 1000)  # not a row multiple
+    data = _predicted(3000, 7, [0, 1, 2, 3, 4])
+    stream = _flate_stream(data, Predictor=12, Columns=6)
+    assert b"".join(decode_stream_chunks(stream)) == _reference_png(data, 7)
+
+
+def test_lzw_stream_in_pieces(monkeypatch):
+    monkeypatch.setattr(filters, "OUTPUT_CHUNK_SIZE", 1000)
+    data = _text(20_000)
+    stream = EncodedStreamObject()
+    stream[NameObject("/Filter")] = ArrayObject([NameObject("/LZW")])
+    stream._data = lzw_encode(data)
+    assert len(list(decode_stream_chunks(stream))) > 1
+    assert stream.get_data() == data
+
+
+def test_decoded_size_limit(monkeypatch):
+    monkeypatch.setattr(filters, "OUTPUT_CHUNK_SIZE", 64 * 1024)
+    bomb = _flate_stream(b"\0" * (64 * 1024 * 1024))
+    pieces = decode_stream_chunks(bomb, max_size=1024 * 1024)
+    with pytest.raises(LimitReachedError):
+        for _ in pieces:
+            pass
+    # only the pieces up to the limit were inflated
+    assert next(decode_stream_chunks(bomb)) == b"\0" * 64 * 1024
+
+
+@pytest.mark.parametrize("second", ["/ASCII85Decode", "/DCTDecode", "/LZWDecode"])
+def test_decoded_size_limit_on_every_filter(monkeypatch, second):
+    # the Flate output is mostly white-space (dropped by ASCII85Decode) or
+    # fed whole to the next filter: it has to be counted on its own
+    monkeypatch.setattr(filters, "OUTPUT_CHUNK_SIZE", 64 * 1024)
+    joined = []  # sizes of the whole inputs built for the second filter
+    decode_all = filters._decode_all
+    monkeypatch.setattr(
+        filters,
+        "_decode_all",
+        lambda decode, chunks: decode_all(lambda data: joined.append(len(data)), chunks),
+    )
+    monkeypatch.setattr(LZWDecode, "Decoder", lambda data, early: joined.append(len(data)))
+    bomb = _flate_stream(b"z" + b" " * (64 * 1024 * 1024) + b"~>")
+    bomb[NameObject("/Filter")] = ArrayObject([NameObject("/FlateDecode"), NameObject(second)])
+    with pytest.raises(LimitReachedError):
+        for _ in decode_stream_chunks(bomb, max_size=1024 * 1024):
+            pass
+    assert joined == []
+
+
+def test_flate_recovery_cap_in_pieces(monkeypatch):
+    monkeypatch.setattr(filters, "FLATE_RECOVERY_MAX_BYTES", 1234)
+    data = _damaged_streams()["flipped bit"]
+    stream = EncodedStreamObject()
+    stream[NameObject("/Filter")] = NameObject("/FlateDecode")
+    stream._data = data
+    assert b"".join(decode_stream_chunks(stream)) == _reference_recovery(data)[:1234]
+
+
+def test_reader_limits_decoded_streams():
+    content = b"BT /F1 12 Tf (x) Tj ET" + b" " * 100_000
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>"}
+    objects[2] = b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>"
+    stream = zlib.compress(content)
+    objects[3] = b"<< /Type /Page /Parent 2 0 R /Contents 4 0 R >>"
+    objects[4] = b"<< /Filter /FlateDecode /Length %d >>\nstream\n%s\nendstream" % (
+        len(stream),
+        stream,
+    )
+    data = build_pdf(objects, root=1)
+    page = PdfReader(io.BytesIO(data), max_decoded_stream_size=1000).pages[0]
+    with pytest.raises(LimitReachedError):
+        page.get_contents().get_data()
+    page = PdfReader(io.BytesIO(data)).pages[0]
+    assert page["/Contents"].get_object().get_data() == content
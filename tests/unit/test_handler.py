@@ -0,0 +1,53 @@
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+from tests.unit.aws_fakes import ENV, install_clients, s3_event
+from tests.unit.conftest import PROCESS_PDF_DIR
+from tests.unit.pdf_samples import text_pdf
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    for name, value in ENV.items():
+        monkeypatch.setenv(name, value)
+    sys.modules.pop("handler", None)
+    module = importlib.import_module("handler")
+    yield module
+    sys.modules.pop("handler", None)
+
+
+def test_import_does_not_load_boto3_or_pypdf2():
+    code = "import sys, handler; print('boto3' in sys.modules, 'PyPDF2' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROCESS_PDF_DIR,
+        env={"PATH": "", **ENV},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_metadata_is_stored_and_published(handler):
+    data = text_pdf(["Hello from page one", "Page two"])
+    fakes = install_clients(handler, data)
+    assert handler.main(s3_event(data), None) == {"status": "ok"}
+    (call, item), = fakes["dynamodb"].calls
+    assert call == "put_item"
+    assert item["Item"]["s3Key"] == {"S": "docs/a file.pdf"}
+    assert item["Item"]["pages"] == {"N": "2"}
+    assert item["Item"]["preview"]["S"].startswith("Hello from page one")
+    assert fakes["sns"].messages == ["AutoPDF PDF Uploaded"]
+
+
+def test_ocr_usage_and_metadata_share_one_client(handler):
+    data = text_pdf([""])
+    fakes = install_clients(handler, data)
+    handler.main(s3_event(data), None)
+    calls = [call for call, _ in fakes["dynamodb"].calls]
+    assert calls == ["update_item", "put_item"]
+    assert fakes["dynamodb"].calls[1][1]["Item"]["preview"] == {"S": "scanned text"}
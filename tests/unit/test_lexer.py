@@ -0,0 +1,184 @@
+import io
+import warnings
+import zlib
+
+import pytest
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2 import filters
+    from PyPDF2.errors import PdfStreamError
+    from PyPDF2.generic import (
+        ArrayObject,
+        ByteStringObject,
+        ContentStream,
+        DecodedStreamObject,
+        EncodedStreamObject,
+        FloatObject,
+        IndirectObject,
+        NameObject,
+        NumberObject,
+        encode_pdfdocencoding,
+        read_object,
+    )
+
+
+def _read(data: bytes):
+    stream = io.BytesIO(data)
+    return read_object(stream, None), stream.tell()
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (rb"(a\(b\)c) ", b"a(b)c"),
+        (b"(nested (paren) ok) ", b"nested (paren) ok"),
+        (rb"(tab\tnl\n) ", b"tab\tnl\n"),
+        (rb"(\101\0572\7) ", b"A/2\x07"),
+        (b"(line\\\r\ncontinued) ", b"linecontinued"),
+        (b"<48 65\n6C6C 6F> ", b"Hello"),
+        (b"<414> ", b"A@"),
+    ],
+)
+def test_strings(data, expected):
+    obj, end = _read(data)
+    assert obj.get_original_bytes() == expected
+    assert end == len(data) - 1
+
+
+def test_pdfdoc_strings():
+    obj, _ = _read(b"(caf\351 \200\x18\xa0) ")
+    assert obj == "café •\u02d8€" and obj.autodetect_pdfdocencoding
+    assert obj.get_original_bytes() == b"caf\xe9 \x80\x18\xa0"
+    # codes PDFDocEncoding does not define: the string stays bytes
+    for undefined in (b"\x00", b"\x16", b"\x7f", b"\x9f", b"\xad"):
+        obj, _ = _read(b"(a%sb) " % undefined)
+        assert isinstance(obj, ByteStringObject)
+    with pytest.raises(UnicodeEncodeError):
+        encode_pdfdocencoding("\ufffe")
+    with pytest.raises(UnicodeEncodeError):
+        encode_pdfdocencoding("a\u4e00")
+
+
+def test_names_numbers_and_references():
+    obj, end = _read(b"/A#20B ")
+    assert obj == NameObject("/A B") and end == 6
+    obj, _ = _read(b"12 0 R ")
+    assert isinstance(obj, IndirectObject) and (obj.idnum, obj.generation) == (12, 0)
+    obj, end = _read(b"12 0 obj")
+    assert obj == NumberObject(12) and end == 2
+    obj, _ = _read(b"-.5]")
+    assert isinstance(obj, FloatObject) and obj == FloatObject("-0.5")
+
+
+def test_truncated_string():
+    with pytest.raises(PdfStreamError):
+        _read(b"(never closed")
+
+
+def test_dictionary_with_stream_leaves_stream_after_endstream():
+    data = (
+        b"<< /Length 5 /Kids [1 0 R 2 0 R] /Name (x) >>\nstream\nhello\nendstream\n"
+        b"endobj"
+    )
+    stream = io.BytesIO(data)
+    obj = read_object(stream, None)
+    assert obj.get_data() == b"hello"
+    assert [k.idnum for k in obj["/Kids"]] == [1, 2]
+    assert stream.read() == b"\nendobj"
+
+
+def test_content_stream_operations():
+    data = (
+        b"BT /F1 12 Tf 72 712 Td (Hi) Tj [(A) -120 (B)] TJ ET\n"
+        b"% a comment\nq 1 0 0 1 0 0 cm /Im1 Do Q 1 0 R\n"
+    )
+    stream = DecodedStreamObject()
+    stream.set_data(data)
+    ops = ContentStream(stream, None).operations
+    assert [op for _, op in ops] == [
+        b"BT", b"Tf", b"Td", b"Tj", b"TJ", b"ET", b"q", b"cm", b"Do", b"Q",
+    ]
+    assert ops[1][0] == [NameObject("/F1"), NumberObject(12)]
+    assert ops[4][0][0] == ["A", NumberObject(-120), "B"]
+    assert ops[8][0] == [NameObject("/Im1")]
+
+
+def _parts(*chunks: bytes) -> ArrayObject:
+    parts = ArrayObject()
+    for chunk in chunks:
+        part = DecodedStreamObject()
+        part.set_data(chunk)
+        parts.append(part)
+    return parts
+
+
+def test_content_stream_parts_are_parsed_lazily(monkeypatch):
+    decoded = []
+    get_data = DecodedStreamObject.get_data
+
+    def spy(self):
+        decoded.append(self)
+        return get_data(self)
+
+    monkeypatch.setattr(DecodedStreamObject, "get_data", spy)
+    content = ContentStream(_parts(b"q 1 0 0 1 0 0 cm", b"BT ET", b"Q"), None)
+    ops = content.iter_operations()
+    assert next(ops) == ([], b"q")
+    assert len(decoded) == 1
+    assert [op for _, op in ops] == [b"cm", b"BT", b"ET", b"Q"]
+    assert len(decoded) == 3
+
+
+def test_content_stream_tokens_across_parts():
+    # operands before their operator, a string and an inline image cut in two
+    content = ContentStream(
+        _parts(b"BT 72 712", b" Td (Hel", b"lo) Tj ET\nBI /W 1 /H 1 /IM", b" true ID x EI Q"),
+        None,
+    )
+    ops = list(content.iter_operations())
+    assert [op for _, op in ops] == [
+        b"BT", b"Td", b"Tj", b"ET", b"INLINE IMAGE", b"Q",
+    ]
+    assert ops[1][0] == [NumberObject(72), NumberObject(712)]
+    assert ops[2][0] == ["Hel\nlo"]
+    assert ops[4][0]["settings"]["/IM"] and ops[4][0]["data"] == b"x "
+    assert content.operations == ops
+
+
+def test_content_stream_operations_are_built_on_demand():
+    content = ContentStream(_parts(b"q", b"Q"), None)
+    assert content._operations is None
+    content.operations.insert(1, ([NameObject("/Im1")], b"Do"))
+    assert content.get_data() == b"q\n/Im1 Do\nQ\n"
+    content.set_data(b"BT ET")
+    assert [op for _, op in content.iter_operations()] == [b"BT", b"ET"]
+    with pytest.raises(PdfStreamError):
+        list(ContentStream(_parts(b"(never", b"closed"), None).iter_operations())
+
+
+def _flate(data: bytes) -> EncodedStreamObject:
+    stream = EncodedStreamObject()
+    stream[NameObject("/Filter")] = NameObject("/FlateDecode")
+    stream._data = zlib.compress(data)
+    return stream
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 16, 1000])
+def test_content_stream_decoded_in_chunks(monkeypatch, chunk_size):
+    monkeypatch.setattr(filters, "OUTPUT_CHUNK_SIZE", chunk_size)
+    data = (
+        b"% a comment with spaces\nBT /F1 12 Tf 72 712 Td\n"
+        b"(a string\nover lines) Tj [(x) -250 (y)] TJ ET\n"
+        b"BI /W 2 /H 1 ID \x00\n\xff EI Q\n"
+        # dictionaries and arrays over lines: DictionaryObject returns
+        # what it read when cut, so they must not be parsed in pieces
+        b"/Span <</ActualText (two\nlines) /A [1\n2] /B << /C\n3 >> >> BDC EMC\n"
+        b"[(a)\n-250\n(b)] TJ\n" * 20
+    )
+    expected = list(ContentStream(_parts(data), None).iter_operations())
+    content = ContentStream(_flate(data), None)
+    assert list(content.iter_operations()) == expected
+    assert len(expected) == 220
+    with pytest.raises(PdfStreamError):
+        list(ContentStream(_flate(data + b"(never closed"), None).iter_operations())
@@ -0,0 +1,63 @@
+import io
+import warnings
+
+from tests.unit.pdf_samples import text_pdf
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2 import ObjectCache, PdfReader
+    from PyPDF2.generic import (
+        DecodedStreamObject,
+        DictionaryObject,
+        NameObject,
+        NumberObject,
+    )
+
+
+def _stream(n: int) -> DecodedStreamObject:
+    stream = DecodedStreamObject()
+    stream.set_data(b"x" * n)
+    return stream
+
+
+def _catalog() -> DictionaryObject:
+    return DictionaryObject({NameObject("/Type"): NameObject("/Catalog")})
+
+
+def test_unbounded_cache_keeps_everything():
+    cache = ObjectCache()
+    for i in range(100):
+        cache[(0, i)] = _stream(10_000)
+    assert len(cache) == 100
+    assert cache.evictions == 0
+
+
+def test_lru_by_count_evicts_streams_before_other_objects():
+    cache = ObjectCache(max_objects=2)
+    cache[(0, 1)] = NumberObject(1)
+    cache[(0, 2)] = _stream(10)
+    cache[(0, 3)] = _stream(10)
+    assert (0, 1) in cache
+    assert (0, 2) not in cache
+    assert cache.evictions == 1
+
+
+def test_lru_by_bytes_pins_structural_objects():
+    cache = ObjectCache(max_bytes=5_000)
+    cache[(0, 1)] = _catalog()
+    cache[(0, 2)] = _stream(3_000)
+    cache[(0, 3)] = _stream(3_000)
+    assert cache.get((0, 2)) is None
+    assert cache.get((0, 3)) is not None
+    assert cache.get((0, 1)) is not None
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 1, 1)
+
+
+def test_reader_with_bounded_cache_reads_all_pages():
+    data = text_pdf(["page %d" % i for i in range(30)])
+    cache = ObjectCache(max_objects=3)
+    reader = PdfReader(io.BytesIO(data), object_cache=cache)
+    texts = [page.extract_text() for page in reader.pages]
+    assert texts == ["page %d" % i for i in range(30)]
+    assert cache.evictions > 0
+    assert len(cache) - len(cache._pinned) <= 3
@@ -0,0 +1,287 @@
+import io
+import mmap
+import sys
+import warnings
+import zlib
+
+import pytest
+
+from tests.unit.pdf_samples import build_pdf, text_pdf
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2 import PdfReader, filters
+
+
+def _reader(data: bytes) -> PdfReader:
+    return PdfReader(io.BytesIO(data))
+
+
+def test_summary_does_not_flatten_page_tree():
+    reader = _reader(text_pdf(["page"] * 40, fanout=4, version=b"1.5"))
+    summary = reader.get_summary()
+    assert summary.page_count == 40
+    assert summary.metadata["/Title"] == "Sample"
+    assert summary.metadata.author == "AutoPDF"
+    assert summary.pdf_version == "1.5"
+    assert summary.is_encrypted is False
+    assert reader.flattened_pages is None
+
+
+def test_summary_prefers_later_catalog_version():
+    data = text_pdf(["page"]).replace(
+        b"/Type /Catalog", b"/Type /Catalog /Version /1.7", 1
+    )
+    assert _reader(data).get_summary().pdf_version == "1.7"
+
+
+def test_summary_falls_back_when_count_is_missing():
+    data = text_pdf(["a", "b", "c"]).replace(b"/Count 3", b"/Foo 3", 1)
+    assert _reader(data).get_summary().page_count == 3
+
+
+def test_random_page_access_matches_flattened_tree():
+    texts = ["page %d" % i for i in range(200)]
+    data = text_pdf(texts, fanout=3)
+    lazy = _reader(data)
+    for n in (0, 199, 57, 123, 1):
+        page = lazy.pages[n]
+        assert page.extract_text() == texts[n]
+        assert page.mediabox.width == 612  # inherited from the root node
+    assert lazy.flattened_pages is None
+
+    flat = _reader(data)
+    flat._flatten()
+    assert [p.indirect_reference.idnum for p in flat.pages] == [
+        lazy.pages[i].indirect_reference.idnum for i in range(200)
+    ]
+
+
+def test_first_page_resolves_only_one_path():
+    reader = _reader(text_pdf(["x"] * 500, fanout=4))
+    reader.pages[0]
+    # catalog + one /Pages node per level + the page itself
+    assert len(reader.resolved_objects) < 20
+
+
+def test_flat_page_tree_resolves_only_what_is_read():
+    reader = _reader(text_pdf(["x"] * 2000))
+    assert len(reader.pages) == 2000
+    reader.pages[0]
+    # catalog, /Pages root, first page and its content stream
+    assert len(reader.resolved_objects) < 8
+    reader.pages[1999]  # the last page checks the root /Count
+    assert len(reader.pages) == 2000
+    assert reader.flattened_pages is None
+
+
+def test_page_cache_is_bounded():
+    reader = PdfReader(io.BytesIO(text_pdf(["x"] * 10)), page_cache_size=2)
+    first = reader.pages[0]
+    assert reader.pages[0] is first
+    reader.pages[1]
+    reader.pages[2]
+    assert len(reader._page_cache) == 2
+    assert reader.pages[0] is not first
+
+
+def test_wrong_count_falls_back_to_flattening():
+    data = text_pdf(["a", "b", "c", "d"], fanout=2).replace(b"/Count 2", b"/Count 1", 1)
+    reader = _reader(data)
+    assert [reader.pages[i].extract_text() for i in range(4)] == ["a", "b", "c", "d"]
+
+
+def test_wrong_root_count_uses_the_page_tree():
+    texts = ["a", "b", "c"]
+    for count in (b"/Count 5", b"/Count 2"):
+        reader = _reader(text_pdf(texts).replace(b"/Count 3", count, 1))
+        assert [page.extract_text() for page in reader.pages] == texts
+        assert len(reader.pages) == 3
+
+
+def _two_level_tree(root_count, counts):
+    """Root with two /Pages kids of two pages each, with the given /Counts."""
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>"}
+    objects[2] = b"<< /Type /Pages /Kids [3 0 R 4 0 R] /Count %d >>" % root_count
+    for node, first, count in ((3, 5, counts[0]), (4, 7, counts[1])):
+        objects[node] = b"<< /Type /Pages /Parent 2 0 R /Kids [%d 0 R %d 0 R] /Count %d >>" % (
+            first,
+            first + 1,
+            count,
+        )
+        for page in (first, first + 1):
+            objects[page] = b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d 10] >>" % (node, page)
+    return build_pdf(objects, root=1)
+
+
+def test_wrong_inner_counts_are_found_while_iterating():
+    # too high: the root agrees with its kids, a kid disagrees with its pages
+    reader = _reader(_two_level_tree(5, (2, 3)))
+    assert len(reader.pages) == 5
+    assert [p.mediabox.width for p in reader.pages] == [5, 6, 7, 8]
+    assert len(reader.pages) == 4
+    with pytest.raises(IndexError):
+        reader.pages[4]
+
+    # too low: the missing page is found once the tree is flattened
+    reader = _reader(_two_level_tree(4, (1, 3)))
+    assert len(reader.pages) == 4
+    assert [p.mediabox.width for p in reader.pages] == [5, 6, 7, 8]
+
+
+def test_deep_page_tree_does_not_recurse():
+    # a chain of /Pages nodes deeper than the recursion limit, one page each
+    depth = sys.getrecursionlimit() + 100
+    objects = {1: b"<< /Type /Catalog /Pages 3 0 R >>"}
+    for level in range(depth):
+        node, page = 3 + 2 * level, 4 + 2 * level
+        kids = b"%d 0 R" % page
+        if level + 1 < depth:
+            kids += b" %d 0 R" % (node + 2)
+        objects[node] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, depth - level)
+        objects[page] = b"<< /Type /Page /MediaBox [0 0 %d 10] >>" % (level + 1)
+    reader = _reader(build_pdf(objects, root=1))
+    assert reader.pages[depth - 1].mediabox.width == depth
+    reader._flatten()
+    assert len(reader.pages) == depth
+    assert reader.pages[depth - 1].mediabox.width == depth
+
+
+def test_object_stream_is_decoded_once(monkeypatch):
+    from PyPDF2.generic import DecodedStreamObject
+
+    calls = []
+    get_data = DecodedStreamObject.get_data
+
+    def spy(self):
+        if self.get("/Type") == "/ObjStm":
+            calls.append(self)
+        return get_data(self)
+
+    monkeypatch.setattr(DecodedStreamObject, "get_data", spy)
+    reader = _reader(text_pdf(["a", "b", "c"], compressed=[1, 2, 3, 4, 5, 7, 9]))
+    assert [p.extract_text() for p in reader.pages] == ["a", "b", "c"]
+    assert reader.metadata["/Author"] == "AutoPDF"
+    assert len(calls) == 1
+    assert len(reader._obj_stm_cache) == 1
+
+
+def test_object_stream_cache_is_bounded():
+    reader = _reader(text_pdf(["a", "b"], compressed=[1, 2, 3, 4, 5, 7]))
+    reader.obj_stm_cache_bytes = 0
+    assert [p.extract_text() for p in reader.pages] == ["a", "b"]
+    # the most recent stream is always kept, nothing more
+    assert len(reader._obj_stm_cache) == 1
+
+
+def test_stream_data_is_read_on_first_use():
+    reader = _reader(text_pdf(["a"], padding=100_000))
+    padding = reader.get_object(5)
+    assert padding._source is not None
+    assert reader.resolved_objects.size < 1000
+    reader.stream.seek(123)
+    assert padding.get_data() == b"%" * 100_000
+    assert padding._source is None
+    assert reader.stream.tell() == 123
+    assert reader.pages[0].extract_text() == "a"
+
+
+def test_stream_with_wrong_length_is_read_at_once():
+    # past "endstream": the data is found by scanning for the marker
+    data = text_pdf(["a"], padding=1000).replace(b"/Length 1000", b"/Length 1003")
+    padding = _reader(data).get_object(5)
+    assert padding._source is None
+    assert padding.get_data().rstrip(b"\r\n") == b"%" * 1000
+
+
+def _input_kinds(data: bytes, tmp_path):
+    path = tmp_path / "sample.pdf"
+    path.write_bytes(data)
+    with open(path, "rb") as fh:
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    return {
+        "bytes": data,
+        "bytearray": bytearray(data),
+        "memoryview": memoryview(data),
+        "mmap": mapped,
+        "path": path,
+        "str": str(path),
+    }
+
+
+def test_buffer_and_path_input(tmp_path):
+    data = text_pdf(["a", "b"], padding=10_000)
+    for kind, source in _input_kinds(data, tmp_path).items():
+        reader = PdfReader(source)
+        assert [p.extract_text() for p in reader.pages] == ["a", "b"], kind
+        padding = reader.get_object(5)
+        # stream payloads are views into the input, not copies
+        assert isinstance(padding._raw_data(), memoryview), kind
+        assert padding.get_data() == b"%" * 10_000, kind
+        reader.stream.close()
+
+
+def test_buffer_input_repairs_offsets():
+    data = text_pdf(["a"], padding=100)
+    offset = data.index(b"\n5 0 obj") + 1
+    data = data.replace(b"%010d 00000 n" % offset, b"%010d 00000 n" % 1, 1)
+    reader = PdfReader(data)
+    assert reader.get_object(5).get_data() == b"%" * 100
+    assert reader.xref[0][5] == offset
+
+
+def _long_page_pdf(lines: int) -> bytes:
+    content = b"BT /F1 12 Tf 72 720 Td\n" + b"".join(
+        b"(line %d) Tj 0 -14 Td\n" % i for i in range(lines)
+    ) + b"ET"
+    stream = zlib.compress(content)
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        3: b"<< /Type /Page /Parent 2 0 R /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> /MediaBox [0 0 612 792] >>",
+        4: b"<< /Filter /FlateDecode /Length %d >>\nstream\n%s\nendstream"
+        % (len(stream), stream),
+        5: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    return build_pdf(objects, root=1)
+
+
+def test_extract_text_max_chars(monkeypatch):
+    data = _long_page_pdf(5000)
+    full = _reader(data).pages[0].extract_text()
+    for n in (0, 1, 7, 500, len(full), len(full) + 10):
+        assert _reader(data).pages[0].extract_text(max_chars=n) == full[:n]
+
+    # the content stream is only inflated up to the text asked for
+    monkeypatch.setattr(filters, "OUTPUT_CHUNK_SIZE", 1000)
+    chunks = []
+    decode_stream_chunks = filters.decode_stream_chunks
+
+    def spy(stream, *args, **kwargs):
+        for chunk in decode_stream_chunks(stream, *args, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+
+    monkeypatch.setattr(filters, "decode_stream_chunks", spy)
+    assert _reader(data).pages[0].extract_text(max_chars=100) == full[:100]
+    assert 0 < len(chunks) <= 2
+    chunks.clear()
+    assert _reader(data).pages[0].extract_text() == full
+    assert len(chunks) > 50
+
+
+def test_extract_text_prefix_reads_pages_until_enough():
+    reader = _reader(text_pdf(["a b  c", "de", "fgh", "ijkl"] + ["x"] * 50))
+    assert reader.extract_text_prefix(5) == "a b  c\nde"
+    assert sorted(reader._page_cache) == [0, 1]
+    assert reader.extract_text_prefix(5, max_pages=1) == "a b  c"
+    assert reader.extract_text_prefix(0) == ""
+    assert reader.extract_text_prefix(1000) == "\n".join(
+        p.extract_text() for p in reader.pages
+    )
+    reader = _reader(_long_page_pdf(5000))
+    text = reader.extract_text_prefix(10)
+    assert text.startswith("line 0\nline 1\n") and len(text) < 1000
+    full = reader.pages[0].extract_text()
+    assert reader.extract_text_prefix(len(full)) == full
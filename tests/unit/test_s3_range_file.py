@@ -0,0 +1,56 @@
+import io
+import warnings
+
+import pytest
+
+from s3_range_file import S3RangeFile
+from tests.unit.aws_fakes import FakeS3
+from tests.unit.pdf_samples import text_pdf
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    import PyPDF2
+
+
+def _open(data, **kwargs):
+    client = FakeS3(data)
+    return client, S3RangeFile(client, "bucket", "key", len(data), "abc123", **kwargs)
+
+
+def test_reads_match_bytesio():
+    data = bytes(range(256)) * 1000
+    _, f = _open(data, block_size=1000, read_ahead=1, max_blocks=4)
+    ref = io.BytesIO(data)
+    for offset, whence, n in [(0, 0, 10), (5000, 0, 4321), (-10, 2, 50), (-700, 1, 2500), (0, 0, -1)]:
+        assert f.seek(offset, whence) == ref.seek(offset, whence)
+        assert f.read(n) == ref.read(n)
+        assert f.tell() == ref.tell()
+
+
+def test_adjacent_missing_blocks_are_one_request():
+    data = b"x" * 10_000
+    client, f = _open(data, block_size=1000, read_ahead=2)
+    f.seek(1500)
+    f.read(3000)
+    # blocks 1..4 requested, plus two blocks of read-ahead
+    assert client.ranges == [(1000, 6999)]
+    f.seek(5000)
+    f.read(2000)
+    assert f.requests == 1
+
+
+def test_etag_mismatch_fails():
+    client = FakeS3(b"x" * 100, etag="new")
+    f = S3RangeFile(client, "bucket", "key", 100, "old")
+    with pytest.raises(RuntimeError):
+        f.read(10)
+
+
+def test_pdf_reader_only_fetches_what_it_parses():
+    data = text_pdf(["Hello world"] * 3, padding=2_000_000)
+    client, f = _open(data)
+    reader = PyPDF2.PdfReader(f)
+    assert len(reader.pages) == 3
+    assert reader.metadata["/Title"] == "Sample"
+    assert "Hello world" in reader.pages[0].extract_text()
+    assert f.bytes_fetched < len(data) // 4
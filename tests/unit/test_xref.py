@@ -0,0 +1,247 @@
+import io
+import random
+import re
+import warnings
+
+import pytest
+
+from tests.unit.pdf_samples import incremental_update, text_pdf
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from PyPDF2 import PdfReader
+    from PyPDF2._reader import _xref_stream_rows, convert_to_int
+    from PyPDF2._xref import (
+        XrefFreeFlags,
+        XrefObjectStreams,
+        XrefOffsets,
+        add_stream_rows,
+    )
+
+
+def _rows_one_field_at_a_time(data, widths, n):
+    """How the xref stream rows used to be read: one read() per field."""
+    stream = io.BytesIO(data)
+    rows = []
+    for _ in range(n):
+        row = []
+        for i, w in enumerate(widths[:3]):
+            if w:
+                row.append(convert_to_int(stream.read(w), w))
+            else:
+                row.append(1 if i == 0 else 0)
+        rows.append(tuple(row))
+    return rows
+
+
+@pytest.mark.parametrize(
+    "widths", [[1, 4, 1], [1, 2, 1], [0, 3, 0], [1, 8, 2], [2, 5, 7], [1, 3, 2]]
+)
+def test_bulk_rows_match_field_reads(widths):
+    rng = random.Random(sum(widths))
+    n = 300
+    data = bytes(rng.randrange(256) for _ in range(n * sum(widths)))
+    rows = _xref_stream_rows(data, widths)
+    assert [next(rows) for _ in range(n)] == _rows_one_field_at_a_time(data, widths, n)
+
+
+def test_truncated_rows_match_field_reads():
+    widths = [1, 4, 2]
+    data = bytes(range(1, 7 * 10 + 4))  # ten full rows and a partial one
+    rows = _xref_stream_rows(data, widths)
+    assert [next(rows) for _ in range(13)] == _rows_one_field_at_a_time(data, widths, 13)
+
+
+def test_oversized_width_is_rejected():
+    with pytest.raises(Exception, match="invalid size"):
+        next(_xref_stream_rows(b"\x00" * 20, [1, 9, 1]))
+
+
+def test_xref_stream_with_object_streams():
+    data = text_pdf(["a", "b"], compressed=[2, 3, 4, 5, 7])
+    reader = PdfReader(io.BytesIO(data))
+    assert sorted(reader.xref_objStm) == [2, 3, 4, 5, 7]
+    assert 2 not in reader.xref[0]
+    assert [p.extract_text() for p in reader.pages] == ["a", "b"]
+
+
+def _rewrite_xref_entries(data: bytes, eol: bytes) -> bytes:
+    head, sep, rest = data.rpartition(b"\nxref\n")
+    table, trailer_sep, tail = rest.partition(b"trailer")
+    lines = table.split(b"\n")
+    entries = [line[:18] + eol for line in lines[1:] if line]
+    fixed = head + sep + lines[0] + b"\n" + b"".join(entries) + trailer_sep + tail
+    startxref = len(head) + 1
+    body, _, _ = fixed.rpartition(b"startxref")
+    return body + b"startxref\n%d\n%%%%EOF\n" % startxref
+
+
+@pytest.mark.parametrize("eol", [b" \n", b"\r\n", b" \r\n", b"\n", b"\r"])
+def test_classic_xref_line_endings(eol):
+    data = _rewrite_xref_entries(text_pdf(["a", "b"]), eol)
+    reader = PdfReader(io.BytesIO(data))
+    assert [p.extract_text() for p in reader.pages] == ["a", "b"]
+    assert reader.xref_free_entry[0][1] is False
+    assert reader.xref_free_entry[65535][0] is True
+
+
+def test_classic_xref_invalid_entry_locates_object(caplog):
+    data = text_pdf(["a"])
+    head, sep, rest = data.rpartition(b"\nxref\n")
+    entry_3 = rest.split(b"\n")[4]
+    data = head + sep + rest.replace(entry_3, b"garbage entry here", 1)
+    reader = PdfReader(io.BytesIO(data))
+    assert reader.metadata["/Title"] == "Sample"
+    assert "entry 3 in Xref table invalid but object found" in caplog.text
+
+
+def test_classic_xref_not_zero_indexed():
+    data = text_pdf(["a"])
+    data = data.replace(b"\nxref\n0 ", b"\nxref\n1 ", 1)
+    reader = PdfReader(io.BytesIO(data))
+    assert reader.xref_index == 1
+
+
+def test_bad_offsets_are_repaired_from_one_scan(monkeypatch):
+    data = text_pdf(["a", "b", "c"])
+    head, sep, rest = data.rpartition(b"\nxref\n")
+    rest = re.sub(rb"\d{10} 00000 n", b"0000000001 00000 n", rest)
+    scans = []
+    file_contents = PdfReader._file_contents
+
+    def spy(stream):
+        scans.append(stream)
+        return file_contents(stream)
+
+    monkeypatch.setattr(PdfReader, "_file_contents", staticmethod(spy))
+    reader = PdfReader(io.BytesIO(head + sep + rest))
+    assert [p.extract_text() for p in reader.pages] == ["a", "b", "c"]
+    assert reader.metadata["/Title"] == "Sample"
+    assert len(scans) == 1
+    assert reader.repair_count == len(reader.resolved_objects)
+
+
+def test_objects_missing_from_xref_are_found():
+    data = text_pdf(["a", "b"])
+    head, sep, rest = data.rpartition(b"\nxref\n")
+    table, trailer_sep, tail = rest.partition(b"trailer")
+    lines = table.split(b"\n")
+    # only objects 0-2 are listed: the pages and the /Info are not
+    table = b"\n".join([b"0 3"] + lines[1:4]) + b"\n"
+    reader = PdfReader(io.BytesIO(head + sep + table + trailer_sep + tail))
+    assert [p.extract_text() for p in reader.pages] == ["a", "b"]
+    assert reader.metadata["/Title"] == "Sample"
+    assert reader.repair_count == len(reader.resolved_objects) - 2
+
+
+def _edited_form(revisions: int, **kwargs) -> bytes:
+    data = text_pdf(["a", "b"], **kwargs)
+    for rev in range(revisions):
+        data = incremental_update(
+            data, {3: b"<< /Title (Rev %d) /Author (AutoPDF) >>" % rev}
+        )
+    return data
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"compressed": [2, 3, 4, 5, 7]}])
+def test_lazy_xref_reads_older_sections_on_demand(kwargs):
+    data = _edited_form(50, **kwargs)
+    # the last revision also replaces the font, which may be in an /ObjStm
+    data = incremental_update(
+        data, {4: b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>"}
+    )
+    eager = PdfReader(io.BytesIO(data))
+    reader = PdfReader(io.BytesIO(data), lazy_xref=True)
+    assert sorted(reader.xref[0]) == [4]
+    assert reader.metadata["/Title"] == "Rev 49"
+    assert reader._xref_prev is not None
+    assert [p.extract_text() for p in reader.pages] == ["a", "b"]
+    assert reader._xref_prev is None
+    assert reader.xref == eager.xref
+    assert reader.xref_objStm == eager.xref_objStm
+    assert reader.get_object(4)["/BaseFont"] == "/Courier"
+
+
+def test_lazy_xref_keeps_reading_until_root():
+    data = _edited_form(3).replace(b" /Root 1 0 R /Info 3 0 R /Prev", b" /Prev")
+    reader = PdfReader(io.BytesIO(data), lazy_xref=True)
+    assert reader.metadata["/Title"] == "Rev 2"
+    assert [p.extract_text() for p in reader.pages] == ["a", "b"]
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"compressed": [2, 3, 4, 5, 7]}])
+def test_lazy_xref_reads_older_trailers_for_info_only(kwargs, monkeypatch):
+    data = _edited_form(50, **kwargs)
+    read_at = []
+    original = PdfReader._read_trailer_at
+    monkeypatch.setattr(
+        PdfReader,
+        "_read_trailer_at",
+        lambda self, stream, pos: read_at.append(pos) or original(self, stream, pos),
+    )
+    reader = PdfReader(io.BytesIO(data), lazy_xref=True)
+    assert reader.metadata["/Title"] == "Rev 49"
+    assert read_at == []  # the newest trailer has /Info
+
+    infos = [m.start() for m in re.finditer(rb" /Info 3 0 R", data)]
+    # same length edit: the two newest trailers have no /Info
+    data = bytearray(data)
+    for start in infos[-2:]:
+        data[start : start + 12] = b" " * 12
+    eager = PdfReader(io.BytesIO(bytes(data)))
+    reader = PdfReader(io.BytesIO(bytes(data)), lazy_xref=True)
+    assert read_at == []  # nothing older is read on open
+    assert sorted(reader.xref[0]) == [3]
+    assert reader.metadata["/Title"] == eager.metadata["/Title"] == "Rev 49"
+    assert len(read_at) == 2  # the older one without /Info, then one with it
+    assert sorted(reader.xref[0]) == [3]  # still no older section read
+
+
+def test_array_backed_xref_maps_behave_like_dicts():
+    offsets, expected = XrefOffsets(), {}
+    rng = random.Random(0)
+    for _ in range(2000):
+        num = rng.choice([rng.randrange(500), rng.randrange(10**9), -1])
+        value = rng.choice([rng.randrange(10**6), -1, 2**64 - 1])
+        if rng.random() < 0.2 and num in expected:
+            del offsets[num], expected[num]
+        else:
+            offsets[num] = expected[num] = value
+    assert offsets == expected
+    assert len(offsets) == len(expected)
+    assert sorted(offsets) == sorted(expected)
+    assert all(offsets[k] == v for k, v in expected.items())
+    assert "5" not in offsets and 10**12 not in offsets
+
+    streams = XrefObjectStreams([(3, (10, 0)), (4, (10, 2**40)), (2**40, (1, 1))])
+    streams[3] = (11, 7)
+    assert dict(streams) == {3: (11, 7), 4: (10, 2**40), 2**40: (1, 1)}
+
+    flags = XrefFreeFlags([(0, True), (1, False)])
+    assert flags[0] is True and flags[1] is False and flags.get(2) is None
+
+
+def test_reader_uses_array_backed_xref():
+    reader = PdfReader(io.BytesIO(text_pdf(["a"], compressed=[2, 3])))
+    assert isinstance(reader.xref[0], XrefOffsets)
+    assert isinstance(reader.xref_objStm, XrefObjectStreams)
+    assert reader.xref_objStm[3] == (7, 1)
+    assert reader.metadata["/Title"] == "Sample"
+
+
+def test_far_xref_subsections_do_not_grow_the_arrays():
+    far = 300_000_000
+    data = incremental_update(text_pdf(["a"]), {far: b"(far away)"})
+    reader = PdfReader(io.BytesIO(data))
+    assert len(reader.xref[0]._values) < 10_000
+    assert len(reader.xref_free_entry[0]._values) < 10_000
+    assert reader.xref[0][far] == data.index(b"%d 0 obj" % far)
+    assert reader.get_object(far) == "far away"
+    assert reader.pages[0].extract_text() == "a"
+
+    # /Index [far 1] and [0 far] of an xref stream, backed by one row each
+    offsets, streams = XrefOffsets(), XrefObjectStreams()
+    add_stream_rows(offsets, streams, far, 1, iter([(2, 7, 0)]))
+    add_stream_rows(offsets, streams, 0, far, iter([(1, 15, 0)]))
+    assert dict(offsets) == {0: 15} and dict(streams) == {far: (7, 0)}
+    assert len(offsets._values) < 10_000 and len(streams._values) < 10_000